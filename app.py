@@ -6,7 +6,9 @@ Thin UI wrapper for Casper_Fusion.
 All simulation, fusion, and governance logic lives in casper/.
 """
 
+import json
 import time
+import weakref
 import streamlit as st
 import pandas as pd
 import pydeck as pdk
@@ -15,7 +17,14 @@ from casper.config import FusionConfig
 from casper.state import EngineState
 from casper.step_engine import StepEngine
 from casper.presets import AO_PRESETS, ENVIRONMENTS, ENVELOPES
-from casper.visualization.terrain import TerrainGenerator
+from casper.replay import JournalRecorder
+from casper.scheduler import TickScheduler
+from casper.visualization.tiles import DEFAULT_TILE_DIR, TerrainPyramid
+
+
+# UI redraw interval while running; the simulation cadence is set by the scheduler.
+UI_REFRESH_S = 0.25
+SPEEDS = [1, 2, 4, 10, 25, 100]
 
 
 # ============================================================
@@ -48,10 +57,60 @@ if "engine_state" not in st.session_state:
 if "running" not in st.session_state:
     st.session_state.running = False
 
+# Shared with the scheduler thread, which cannot touch st.session_state.
+if "runtime" not in st.session_state:
+    st.session_state.runtime = {"journal": JournalRecorder(st.session_state.engine_state)}
+
+
+if "step_engine" not in st.session_state:
+    st.session_state.step_engine = StepEngine(st.session_state.engine_state.config)
+
+
+class _SchedulerHandle:
+    """Held only by st.session_state; its finalizer stops the scheduler."""
+
+
+def _stop_scheduler(scheduler: TickScheduler) -> None:
+    scheduler.stop()
+    scheduler.join(timeout=1.0)
+
+
+def init_scheduler() -> TickScheduler:
+    """
+    Headless tick loop on its own thread. It steps through whichever
+    journal `runtime` holds, so Reset can swap in a fresh recorder.
+
+    The thread keeps the scheduler (and the engine state) alive, so it
+    cannot be tied to them. A handle that only the session state refers
+    to is used instead. When Streamlit drops an ended session, the handle
+    is collected and its finalizer stops and joins the thread. The
+    finalizer also runs at interpreter exit.
+    """
+    runtime = st.session_state.runtime
+    engine = st.session_state.step_engine
+    scheduler = TickScheduler(
+        engine,
+        st.session_state.engine_state,
+        speed=4,
+        step_fn=lambda s: runtime["journal"].step(engine, s),
+    )
+    scheduler.pause()
+    scheduler.run_in_thread()
+
+    handle = _SchedulerHandle()
+    weakref.finalize(handle, _stop_scheduler, scheduler)
+    st.session_state.scheduler_handle = handle
+    return scheduler
+
+
+if "scheduler" not in st.session_state:
+    st.session_state.scheduler = init_scheduler()
+
 
 state: EngineState = st.session_state.engine_state
-step_engine = StepEngine(state.config)
-terrain_gen = TerrainGenerator()
+step_engine: StepEngine = st.session_state.step_engine
+scheduler: TickScheduler = st.session_state.scheduler
+runtime = st.session_state.runtime
 
 
 # ============================================================
@@ -87,52 +146,84 @@ with st.sidebar:
 
     if st.button("▶ Start", use_container_width=True):
         st.session_state.running = True
+        scheduler.resume()
 
     if st.button("⏸ Pause", use_container_width=True):
         st.session_state.running = False
+        scheduler.pause()
 
     if st.button("🔄 Reset", use_container_width=True):
-        st.session_state.engine_state.reset()
+        def _reset(s: EngineState) -> None:
+            s.reset()
+            runtime["journal"] = JournalRecorder(s)
+
+        scheduler.pause()
+        scheduler.apply(_reset)
         st.session_state.running = False
         st.rerun()
 
+    speed = st.select_slider("Speed (× real time)", SPEEDS, value=int(round(state.config.dt_seconds / scheduler.period_s)))
+    if state.config.dt_seconds / speed != scheduler.period_s:
+        scheduler.set_speed(speed)
+
     st.markdown("---")
     st.subheader("Scenario")
 
-    state.env_name = st.selectbox(
-        "Environment",
-        list(ENVIRONMENTS.keys()),
-        index=list(ENVIRONMENTS.keys()).index(state.env_name),
-    )
-
-    state.envelope_name = st.selectbox(
-        "Envelope",
-        list(ENVELOPES.keys()),
-        index=list(ENVELOPES.keys()).index(state.envelope_name),
+    # Scenario edits are applied by the scheduler between ticks.
+    selected = {
+        "env_name": st.selectbox(
+            "Environment",
+            list(ENVIRONMENTS.keys()),
+            index=list(ENVIRONMENTS.keys()).index(state.env_name),
+        ),
+        "envelope_name": st.selectbox(
+            "Envelope",
+            list(ENVELOPES.keys()),
+            index=list(ENVELOPES.keys()).index(state.envelope_name),
+        ),
+        "ao": AO_PRESETS[st.selectbox(
+            "Area of Operations",
+            list(AO_PRESETS.keys()),
+            index=list(AO_PRESETS.keys()).index(next(k for k, v in AO_PRESETS.items() if v == state.ao)),
+        )],
+        "fusion_strategy_name": st.selectbox(
+            "Fusion Strategy",
+            ["weighted", "kalman"],
+            index=["weighted", "kalman"].index(state.fusion_strategy_name),
+        ),
+    }
+    for name, value in selected.items():
+        if getattr(state, name) != value:
+            scheduler.apply(lambda s, name=name, value=value: setattr(s, name, value))
+
+    stats = scheduler.stats
+    st.caption(
+        f"Lag p99 {stats.lag.percentile(99) / 1e6:.1f} ms • "
+        f"deadline misses {stats.deadline_misses} • skipped {stats.skipped_slots}"
     )
 
-    ao_key = st.selectbox(
-        "Area of Operations",
-        list(AO_PRESETS.keys()),
-        index=list(AO_PRESETS.keys()).index(next(k for k, v in AO_PRESETS.items() if v == state.ao)),
+    st.markdown("---")
+    st.download_button(
+        "⬇ Input Journal",
+        data=json.dumps(runtime["journal"].journal.to_dict()),
+        file_name=f"casper_journal_{state.run_id}.json",
+        mime="application/json",
+        use_container_width=True,
     )
-    state.ao = AO_PRESETS[ao_key]
 
 
 # ============================================================
-# STEP EXECUTION
+# LATEST FRAME
 # ============================================================
 
-if st.session_state.running:
-    state = step_engine.step(state)
-    st.session_state.engine_state = state
-
+# The scheduler thread owns the state; the UI only reads published frames.
+frame = scheduler.latest()
 
-if not state.history:
+if frame is None or frame.telemetry is None:
     st.info("Press ▶ Start to begin simulation.")
     st.stop()
 
-tel = state.history[-1]
+tel = frame.telemetry
 
 
 # ============================================================
@@ -160,15 +251,14 @@ left, mid, right = st.columns([1.2, 1.0, 1.2])
 with left:
     st.subheader("Synthetic IR")
 
-    if state.terrain is None:
-        state.terrain = terrain_gen.generate()
+    # One tile pyramid per AO; tiles persist in DEFAULT_TILE_DIR across sessions.
+    pyramids = runtime.setdefault("pyramids", {})
+    if state.ao.label not in pyramids:
+        pyramids[state.ao.label] = TerrainPyramid(state.ao, DEFAULT_TILE_DIR)
+    pyramid = pyramids[state.ao.label]
 
-    ir = terrain_gen.render_ir(
-        state.terrain,
-        tel,
-        state.ao,
-        tel.fusion_conf,
-    )
+    zoom = st.slider("IR zoom", 0, pyramid.max_level, value=pyramid.max_level)
+    ir = pyramid.render_ir(tel, tel.fusion_conf, level=zoom)
 
     st.image(ir, use_container_width=True)
 
@@ -176,9 +266,9 @@ with mid:
     st.subheader("Fusion Summary")
 
     st.write("**Sensor Contributions**")
-    if state.fused and state.fused.sensor_contrib:
+    if frame.fused and frame.fused.sensor_contrib:
         df = pd.DataFrame(
-            state.fused.sensor_contrib.items(),
+            frame.fused.sensor_contrib.items(),
             columns=["Sensor", "Weight"],
         ).sort_values("Weight", ascending=False)
         st.dataframe(df, use_container_width=True)
@@ -186,14 +276,15 @@ with mid:
         st.info("No usable measurements.")
 
     st.write("**Audit Records**")
-    st.metric("Audit Chain Length", len(state.audit_chain))
+    st.metric("Audit Chain Length", frame.audit_length)
 
 with right:
     st.subheader("Track Map")
 
-    df = pd.DataFrame(
-        [{"lat": t.lat, "lon": t.lon} for t in list(state.history)[-100:]]
-    )
+    df = pd.DataFrame({
+        "lat": frame.recent["lat"],
+        "lon": frame.recent["lon"],
+    })
 
     st.pydeck_chart(
         pdk.Deck(
@@ -223,7 +314,7 @@ st.markdown("---")
 # ============================================================
 
 st.subheader("Telemetry (Last 40 Ticks)")
-df_tel = pd.DataFrame([t.model_dump() for t in list(state.history)[-40:]])
+df_tel = frame.recent_frame(40)
 st.dataframe(df_tel, use_container_width=True)
 
 
@@ -231,6 +322,7 @@ st.dataframe(df_tel, use_container_width=True)
 # AUTO-REFRESH
 # ============================================================
 
+# Redraw only: ticks keep running on the scheduler thread between reruns.
 if st.session_state.running:
-    time.sleep(0.25)
+    time.sleep(UI_REFRESH_S)
     st.rerun()
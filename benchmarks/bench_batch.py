@@ -0,0 +1,74 @@
+"""
+benchmarks.bench_batch
+======================
+
+Monte Carlo throughput of BatchStepEngine for both random stream modes
+("keyed" and "sequential"), against a loop of scalar StepEngine runs.
+
+Keyed rows cannot be shared between seeds, so keyed mode depends on
+drawing each tick for all seeds at once (casper.rng.BatchStream); a
+keyed figure far above sequential means that path has regressed.
+
+Usage:
+    python -m benchmarks.bench_batch --seeds 1000 --ticks 100
+"""
+
+import argparse
+import time
+
+from casper.batch_engine import BatchStepEngine
+from casper.config import FusionConfig
+from casper.presets import AO_PRESETS, ENVELOPES, ENVIRONMENTS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+AO = AO_PRESETS["Black Sea (synthetic)"]
+ENV_NAME = next(iter(ENVIRONMENTS))
+ENVELOPE_NAME = next(iter(ENVELOPES))
+
+
+def run_batch(mode: str, seeds: int, ticks: int) -> float:
+    engine = BatchStepEngine(FusionConfig(rng_streams=mode))
+    engine.run(list(range(2)), 2, AO, ENV_NAME, ENVELOPE_NAME)  # warm-up (ziggurat tables)
+
+    start = time.perf_counter()
+    engine.run(list(range(seeds)), ticks, AO, ENV_NAME, ENVELOPE_NAME)
+    return time.perf_counter() - start
+
+
+def run_scalar(mode: str, seeds: int, ticks: int) -> float:
+    config = FusionConfig(rng_streams=mode)
+    start = time.perf_counter()
+    for seed in range(seeds):
+        state = EngineState(config=config)
+        state.ao = AO
+        state.rng_seed = seed
+        state.env_name = ENV_NAME
+        state.envelope_name = ENVELOPE_NAME
+        engine = StepEngine(config)
+        for _ in range(ticks):
+            engine.step(state)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--seeds", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--scalar-seeds", type=int, default=20,
+                        help="seeds for the StepEngine baseline (extrapolated to --seeds)")
+    args = parser.parse_args()
+
+    print(f"{args.seeds} seeds x {args.ticks} ticks")
+    for mode in ("sequential", "keyed"):
+        batch_s = run_batch(mode, args.seeds, args.ticks)
+        scalar_s = run_scalar(mode, args.scalar_seeds, args.ticks) * args.seeds / args.scalar_seeds
+        print(
+            f"{mode:<10}  batch {batch_s:7.2f} s  ({args.seeds * args.ticks / batch_s:9.0f} run-ticks/s)"
+            f"  StepEngine ~{scalar_s:7.1f} s  ({scalar_s / batch_s:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+benchmarks.bench_fusion
+=======================
+
+Per-tick fuse() throughput of WeightedFusion versus KalmanFusion on the
+same recorded measurement sets.
+
+Usage:
+    python -m benchmarks.bench_fusion --ticks 2000
+"""
+
+import argparse
+import time
+
+from casper.config import FusionConfig
+from casper.fusion.strategies import KalmanFusion, WeightedFusion
+from casper.presets import AO_PRESETS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+def record_selections(ticks: int, env_name: str, seed: int = 7) -> list:
+    """Gated measurement sets for `ticks` ticks of a normal run."""
+    config = FusionConfig()
+    state = EngineState(config=config)
+    state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+    state.env_name = env_name
+    state.rng_seed = seed
+    engine = StepEngine(config)
+
+    selections = []
+    for _ in range(ticks):
+        engine.step(state)
+        selections.append(engine.fusion.select_measurements(state.meas_history, state.tick))
+    return selections
+
+
+def run(strategy, selections: list) -> float:
+    strategy.reset()
+    start = time.perf_counter()
+    for selected in selections:
+        strategy.fuse(selected)
+    return (time.perf_counter() - start) / len(selections) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--env", default="Clear Skies / Clean Link")
+    args = parser.parse_args()
+
+    config = FusionConfig()
+    selections = record_selections(args.ticks, args.env)
+
+    weighted_us = run(WeightedFusion(config), selections)
+    kalman_us = run(KalmanFusion(config), selections)
+
+    print(f"WeightedFusion: {weighted_us:8.1f} us/tick  ({1e6 / weighted_us:10.0f} ticks/s)")
+    print(f"KalmanFusion  : {kalman_us:8.1f} us/tick  ({1e6 / kalman_us:10.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+benchmarks.bench_gating
+=======================
+
+Measurement-to-track gating cost: brute force over every (track,
+measurement) pair versus the SpatialGrid candidate search used by
+MultiTrackFusion. Targets are spread at constant density (the area grows
+with the track count), as in a wider surveillance picture.
+
+Reports time per gating call and the log-log scaling exponent between
+consecutive sizes (2.0 = quadratic, 1.0 = linear).
+
+Usage:
+    python -m benchmarks.bench_gating --tracks 500 1000 2000 4000 8000
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from casper.fusion.tracks import _mahalanobis_gate, gate_pairs
+
+
+def make_scene(n: int, seed: int = 0):
+    """n predicted tracks and one report per track, in scaled units."""
+    rng = np.random.default_rng(seed)
+    side = math.sqrt(n) * 5.0  # ~5 units (5 mdeg) between neighbours
+    pos = np.column_stack([rng.uniform(0.0, side, (n, 2)), rng.uniform(100.0, 1200.0, n)])
+    cov = np.broadcast_to(np.diag([0.3, 0.3, 0.5]), (n, 3, 3)).copy()
+    R = np.broadcast_to(np.diag([0.2, 0.2, 0.4]), (n, 3, 3)).copy()
+    z = pos + rng.normal(0.0, 0.5, (n, 3))
+    return pos, cov, z, R
+
+
+def brute_force(pos, cov, z, R, gate_chi2, chunk: int = 256):
+    out = []
+    m = np.arange(z.shape[0])
+    for start in range(0, pos.shape[0], chunk):
+        t = np.arange(start, min(start + chunk, pos.shape[0]))
+        ti, mi = np.repeat(t, m.size), np.tile(m, t.size)
+        out.append(_mahalanobis_gate(ti, mi, pos, cov, z, R, gate_chi2)[0].size)
+    return sum(out)
+
+
+def scaling_exponent(n0: int, t0: float, n1: int, t1: float) -> float:
+    """Slope of log(time) against log(size); nan when either time is missing."""
+    if not (t0 > 0 and t1 > 0):
+        return float("nan")
+    return math.log(t1 / t0) / math.log(n1 / n0)
+
+
+def timed(fn, repeats: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--tracks", type=int, nargs="+", default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument("--brute-max", type=int, default=2000, help="skip brute force above this size")
+    parser.add_argument("--gate", type=float, default=16.27)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'tracks':>7} {'pairs':>7} {'brute ms':>9} {'exp':>5} {'grid ms':>8} {'exp':>5}")
+    prev = None
+    for n in args.tracks:
+        pos, cov, z, R = make_scene(n)
+        pairs = gate_pairs(pos, cov, z, R, args.gate)[0].size
+        grid_ms = timed(lambda: gate_pairs(pos, cov, z, R, args.gate), args.repeats)
+        brute_ms = timed(lambda: brute_force(pos, cov, z, R, args.gate), 1) if n <= args.brute_max else float("nan")
+
+        b_exp = scaling_exponent(prev[0], prev[1], n, brute_ms) if prev else float("nan")
+        g_exp = scaling_exponent(prev[0], prev[2], n, grid_ms) if prev else float("nan")
+        print(f"{n:>7} {pairs:>7} {brute_ms:>9.1f} {b_exp:>5.2f} {grid_ms:>8.2f} {g_exp:>5.2f}")
+        prev = (n, brute_ms, grid_ms)
+
+
+if __name__ == "__main__":
+    main()
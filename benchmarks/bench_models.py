@@ -0,0 +1,64 @@
+"""
+benchmarks.bench_models
+=======================
+
+Per-tick StepEngine cost with validated pydantic models (strict_models=True)
+versus the __slots__ fast path (strict_models=False).
+
+The two modes are timed alternately over --repeats rounds and the
+median is reported; single runs on a shared host vary by more than the
+difference being measured.
+
+Usage:
+    python -m benchmarks.bench_models --ticks 2000 --repeats 7
+"""
+
+import argparse
+import statistics
+import time
+
+from casper.config import FusionConfig
+from casper.presets import AO_PRESETS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+def run(strict: bool, ticks: int, seed: int = 7) -> tuple:
+    config = FusionConfig(strict_models=strict)
+    state = EngineState(config=config)
+    state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+    state.rng_seed = seed
+    engine = StepEngine(config)
+
+    for _ in range(50):  # warm-up
+        engine.step(state)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.step(state)
+    elapsed = time.perf_counter() - start
+    return elapsed / ticks * 1e6, state.audit_head
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    strict_runs, fast_runs = [], []
+    for _ in range(args.repeats):
+        strict_us, strict_head = run(True, args.ticks)
+        fast_us, fast_head = run(False, args.ticks)
+        strict_runs.append(strict_us)
+        fast_runs.append(fast_us)
+    strict_us = statistics.median(strict_runs)
+    fast_us = statistics.median(fast_runs)
+
+    print(f"strict_models=True : {strict_us:8.1f} us/tick (median of {args.repeats})")
+    print(f"strict_models=False: {fast_us:8.1f} us/tick  ({(1 - fast_us / strict_us) * 100:.1f}% less)")
+    print(f"audit heads match  : {strict_head == fast_head}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+benchmarks.bench_pipeline
+=========================
+
+Tick-rate benchmark suite for the full StepEngine pipeline.
+
+For every environment preset it measures:
+- end-to-end ticks/s of StepEngine.step (and, with --pipelined, of
+  PipelinedStepEngine, which hashes / exports audit records on worker threads)
+- per-stage cost, timing each stage function in isolation on inputs
+  recorded from a real run (truth, sensors, gating, fusion, audit,
+  governance)
+- memory per tick via tracemalloc: peak transient bytes and net retained
+  bytes (history buffers are warmed to capacity first, so net growth
+  signals a leak)
+
+Results are written as JSON (--out) so successive versions can be
+compared (--compare BASELINE.json prints relative changes).
+
+Usage:
+    python -m benchmarks.bench_pipeline --ticks 2000 --out results.json
+    python -m benchmarks.bench_pipeline --compare results.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from casper.audit.chain import build_audit_record
+from casper.config import FusionConfig
+from casper.pipeline import PipelinedStepEngine
+from casper.presets import AO_PRESETS, ENVIRONMENTS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def _fresh(env_name: str, seed: int, engine_cls=StepEngine):
+    config = FusionConfig()
+    state = EngineState(config=config)
+    state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+    state.env_name = env_name
+    state.rng_seed = seed
+    return state, engine_cls(config)
+
+
+def _per_call_us(fn: Callable[[Any], Any], inputs: List[Any]) -> float:
+    start = time.perf_counter()
+    for item in inputs:
+        fn(item)
+    return (time.perf_counter() - start) / max(len(inputs), 1) * 1e6
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ============================================================
+# MEASUREMENTS
+# ============================================================
+
+def end_to_end(env_name: str, ticks: int, warmup: int, seed: int) -> Dict[str, float]:
+    state, engine = _fresh(env_name, seed)
+    for _ in range(warmup):
+        engine.step(state)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.step(state)
+    elapsed = time.perf_counter() - start
+    return {"ticks_per_s": ticks / elapsed, "us_per_tick": elapsed / ticks * 1e6}
+
+
+def pipelined(env_name: str, ticks: int, warmup: int, seed: int) -> Dict[str, float]:
+    """End-to-end rate with audit hashing on a worker thread (drained before the clock stops)."""
+    state, engine = _fresh(env_name, seed, PipelinedStepEngine)
+    with engine:
+        for _ in range(warmup):
+            engine.step(state)
+        engine.flush()
+
+        start = time.perf_counter()
+        for _ in range(ticks):
+            engine.step(state)
+        engine.flush()
+        elapsed = time.perf_counter() - start
+    return {"pipelined_ticks_per_s": ticks / elapsed, "pipelined_us_per_tick": elapsed / ticks * 1e6}
+
+
+def stages(env_name: str, ticks: int, warmup: int, seed: int) -> Dict[str, float]:
+    """Time each stage in isolation on inputs captured from a real run."""
+    state, engine = _fresh(env_name, seed)
+    env = ENVIRONMENTS[env_name]
+    for _ in range(warmup):
+        engine.step(state)
+
+    captured = []
+    for _ in range(ticks):
+        engine.step(state)
+        tel = state.history[-1]
+        selected = engine.fusion.select_measurements(state.meas_history, state.tick)
+        captured.append({
+            "tick": state.tick,
+            "selected": selected,
+            "fused": state.fused,
+            "audit": state.audit_chain[-1],
+            "physical": {
+                "q_kpa": tel.q_kpa,
+                "thermal_index": tel.thermal_index,
+                "threat_index": tel.threat_index,
+            },
+        })
+
+    # Truth + sensors run against the final state (their cost does not
+    # depend on history contents). Each call re-keys the engine's own
+    # TickStreams for the captured tick, as step() does, so stream setup is
+    # part of the stage. (In "sequential" mode the sensors' shared stream
+    # starts at the tick's first draw rather than after truth's.)
+    streams = engine.streams
+
+    def truth(c):
+        return engine._generate_truth(state, env, streams.begin(state.rng_seed, c["tick"]).get("truth"))
+
+    truths = [(truth(c), c["tick"]) for c in captured]
+
+    def sensors(item):
+        return engine.sensor_sim.simulate_blocks(state, item[0], env, streams.begin(state.rng_seed, item[1]))
+
+    strategy = engine.fusion.strategy
+    strategy.reset()
+
+    return {
+        "truth": _per_call_us(truth, captured),
+        "sensors": _per_call_us(sensors, truths),
+        "gating": _per_call_us(lambda c: engine.fusion.select_measurements(state.meas_history, state.tick), captured),
+        "fusion": _per_call_us(lambda c: strategy.fuse(c["selected"]), captured),
+        "audit": _per_call_us(
+            lambda c: build_audit_record(
+                tick=c["audit"].tick,
+                utc=c["audit"].utc,
+                used_measurements=c["selected"],
+                fused=c["fused"],
+                prev_sha256=c["audit"].prev_sha256,
+            ),
+            captured,
+        ),
+        "governance": _per_call_us(lambda c: engine.clarity_calc.compute(state, c["physical"], c["fused"]), captured),
+    }
+
+
+def allocations(env_name: str, ticks: int, warmup: int, seed: int) -> Dict[str, float]:
+    state, engine = _fresh(env_name, seed)
+    peaks, nets = [], []
+
+    # Trace from the start: objects evicted from full history buffers
+    # must have been traced when allocated, or their frees go unseen.
+    tracemalloc.start()
+    try:
+        for _ in range(warmup):
+            engine.step(state)
+        for _ in range(ticks):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            engine.step(state)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            nets.append(current - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "peak_bytes_per_tick": float(np.mean(peaks)),
+        "net_bytes_per_tick": float(np.mean(nets)),
+    }
+
+
+def run_suite(env_names: List[str], ticks: int, warmup: int, seed: int, with_pipelined: bool = False) -> Dict[str, Any]:
+    results = []
+    for env_name in env_names:
+        results.append({
+            "env": env_name,
+            **end_to_end(env_name, ticks, warmup, seed),
+            **(pipelined(env_name, ticks, warmup, seed) if with_pipelined else {}),
+            "stages_us": stages(env_name, ticks, warmup, seed),
+            "alloc": allocations(env_name, max(ticks // 4, 1), warmup, seed),
+        })
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git": _git_revision(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "ticks": ticks,
+            "warmup": warmup,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+# ============================================================
+# REPORTING
+# ============================================================
+
+def _flatten(result: Dict[str, Any]) -> Dict[str, float]:
+    flat = {"us_per_tick": result["us_per_tick"]}
+    if "pipelined_us_per_tick" in result:
+        flat["pipelined_us_per_tick"] = result["pipelined_us_per_tick"]
+    flat.update({f"stage.{k}": v for k, v in result["stages_us"].items()})
+    flat.update({f"alloc.{k}": v for k, v in result["alloc"].items()})
+    return flat
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    base = {r["env"]: _flatten(r) for r in baseline["results"]} if baseline else {}
+    for result in report["results"]:
+        print(f"\n{result['env']}: {result['ticks_per_s']:.0f} ticks/s")
+        old = base.get(result["env"], {})
+        for key, value in _flatten(result).items():
+            line = f"  {key:<28} {value:12.1f}"
+            if key in old and old[key]:
+                line += f"  ({(value / old[key] - 1.0) * 100:+.1f}% vs baseline)"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=1000, help="ticks to fill history buffers first")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--env", action="append", help="environment preset (repeatable; default all)")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--pipelined", action="store_true", help="also time PipelinedStepEngine")
+    args = parser.parse_args()
+
+    report = run_suite(args.env or list(ENVIRONMENTS.keys()), args.ticks, args.warmup, args.seed, args.pipelined)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
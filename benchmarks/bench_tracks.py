@@ -0,0 +1,75 @@
+"""
+benchmarks.bench_tracks
+=======================
+
+Multi-target throughput: MultiTargetEngine ticks at 10 Hz cadence
+(dt_seconds=0.1) for increasing target counts, plus track quality
+(confirmed tracks and median position error against the truth).
+
+Usage:
+    python -m benchmarks.bench_tracks --targets 100 1000 --ticks 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from casper.config import FusionConfig
+from casper.presets import AO_PRESETS
+from casper.track_engine import MultiTargetEngine
+
+
+def position_error_m(engine: MultiTargetEngine) -> float:
+    """Median distance (m) from each confirmed track to its nearest target."""
+    est = engine.fusion.estimates()
+    truth = engine.swarm.positions
+    if est["lat"].size == 0:
+        return float("nan")
+    m_per_deg_lon = 111_320.0 * np.cos(np.radians(truth[:, 0].mean()))
+    errors = []
+    for lat, lon in zip(est["lat"], est["lon"]):
+        d = np.hypot((truth[:, 0] - lat) * 111_320.0, (truth[:, 1] - lon) * m_per_deg_lon)
+        errors.append(d.min())
+    return float(np.median(errors))
+
+
+def run(n_targets: int, ticks: int, env_name: str) -> dict:
+    engine = MultiTargetEngine(
+        FusionConfig(dt_seconds=0.1),
+        n_targets,
+        AO_PRESETS["Kharkiv (synthetic)"],
+        env_name=env_name,
+    )
+    engine.run(10)  # warm-up: tracks initiated and confirmed
+
+    start = time.perf_counter()
+    frames = engine.run(ticks)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "targets": n_targets,
+        "ms_per_tick": elapsed / ticks * 1e3,
+        "confirmed": frames[-1].confirmed,
+        "median_err_m": position_error_m(engine),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--targets", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--env", default="Clear Skies / Clean Link")
+    args = parser.parse_args()
+
+    print(f"{'targets':>8} {'ms/tick':>9} {'ticks/s':>9} {'confirmed':>10} {'median err m':>13}")
+    for n in args.targets:
+        r = run(n, args.ticks, args.env)
+        print(
+            f"{r['targets']:>8} {r['ms_per_tick']:>9.2f} {1e3 / r['ms_per_tick']:>9.1f} "
+            f"{r['confirmed']:>10} {r['median_err_m']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
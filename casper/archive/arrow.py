@@ -0,0 +1,469 @@
+"""
+casper.archive.arrow
+====================
+
+Columnar run export for Casper_Fusion (Apache Arrow IPC / Parquet).
+
+A run directory holds one file per record kind:
+    <directory>/telemetry.arrow      (or .parquet)
+    <directory>/measurements.arrow
+    <directory>/audit.arrow
+
+Tables are built straight from the engine's columnar buffers
+(TelemetryBuffer, MeasurementBuffer) rather than from per-record objects:
+- telemetry    : one column per Telemetry field, state as dictionary<int8>
+- measurements : z as fixed_size_list<float64>[3], R as
+                 fixed_size_list<float64>[9] (row-major 3x3), meta as JSON
+- audit        : tick, utc, hashes, and the hashed payload parts as
+                 canonical JSON (so records re-hash to the same sha256)
+
+RunExporter streams: call write_tick(state) after every step and it
+flushes the rows still held in the ring buffers as record batches before
+they are evicted, so a run of any length is exported in bounded memory.
+export_state() writes whatever the buffers currently hold in one go.
+
+load_run() opens a run directory (IPC files are memory-mapped, so columns
+are not read until touched); iter_batches() streams one table batch by
+batch; telemetry_records() / measurement_records() / audit_records()
+turn tables back into engine records.
+
+pyarrow is optional and imported on first use. No UI dependencies.
+"""
+
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from casper.audit.chain import AuditRecord, canonical_json
+from casper.buffers import MeasurementBuffer, SENSOR_TYPES, SYSTEM_STATES, TelemetryBuffer, TELEMETRY_FIELDS
+from casper.models import MeasurementRecord, Telemetry, TelemetryRecord
+from casper.state import EngineState
+
+
+FORMATS = {"ipc": ".arrow", "parquet": ".parquet"}
+TABLES = ("telemetry", "measurements", "audit")
+
+# Parquet row groups are accumulated up to this many rows before writing.
+PARQUET_ROW_GROUP = 65_536
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ImportError("pyarrow is required for Arrow/Parquet export (pip install pyarrow)") from exc
+    return pa
+
+
+# ============================================================
+# SCHEMAS
+# ============================================================
+
+def _telemetry_type(pa, name: str):
+    if name == "state":
+        return pa.dictionary(pa.int8(), pa.string())
+    annotation = Telemetry.model_fields[name].annotation
+    if annotation is float:
+        return pa.float64()
+    if annotation is int:
+        return pa.int64()
+    return pa.string()
+
+
+def telemetry_schema(metadata: Optional[Dict[str, str]] = None):
+    pa = _pyarrow()
+    return pa.schema([(name, _telemetry_type(pa, name)) for name in TELEMETRY_FIELDS], metadata=metadata)
+
+
+def measurement_schema(metadata: Optional[Dict[str, str]] = None):
+    pa = _pyarrow()
+    return pa.schema(
+        [
+            ("tick", pa.int64()),
+            ("utc_timestamp", pa.string()),
+            ("sensor_id", pa.string()),
+            ("sensor_type", pa.dictionary(pa.int8(), pa.string())),
+            ("z", pa.list_(pa.float64(), 3)),
+            ("R", pa.list_(pa.float64(), 9)),
+            ("quality", pa.float64()),
+            ("latency_ms", pa.float64()),
+            ("dropped", pa.bool_()),
+            ("meta", pa.string()),
+        ],
+        metadata=metadata,
+    )
+
+
+def audit_schema(metadata: Optional[Dict[str, str]] = None):
+    pa = _pyarrow()
+    return pa.schema(
+        [
+            ("tick", pa.int64()),
+            ("utc", pa.string()),
+            ("prev_sha256", pa.string()),
+            ("sha256", pa.string()),
+            ("used_measurements", pa.string()),
+            ("fused_output", pa.string()),
+        ],
+        metadata=metadata,
+    )
+
+
+_SCHEMAS = {"telemetry": telemetry_schema, "measurements": measurement_schema, "audit": audit_schema}
+
+
+def run_metadata(state: EngineState) -> Dict[str, str]:
+    """Schema metadata identifying the run a file came from."""
+    return {
+        "casper.run_id": str(state.run_id),
+        "casper.rng_seed": str(state.rng_seed),
+        "casper.env_name": state.env_name,
+        "casper.config": json.dumps(state.config.to_dict(), sort_keys=True, default=str),
+    }
+
+
+# ============================================================
+# BATCH BUILDERS
+# ============================================================
+
+def _labels(pa, codes: np.ndarray, labels: List[str]):
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int8()), pa.array(labels, type=pa.string()))
+
+
+def telemetry_batch(buffer: TelemetryBuffer, n: Optional[int] = None, schema=None):
+    """Record batch of the newest `n` telemetry rows (all if None)."""
+    pa = _pyarrow()
+    schema = schema or telemetry_schema()
+    columns = buffer.window(n)
+    arrays = []
+    for name in TELEMETRY_FIELDS:
+        values = columns[name]
+        if name == "state":
+            # Contiguous, so Arrow would alias the ring buffer; batches may
+            # outlive the next append (Parquet row groups), so copy.
+            arrays.append(_labels(pa, values.copy(), [s.value for s in SYSTEM_STATES]))
+        else:
+            arrays.append(pa.array(values, type=schema.field(name).type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def measurement_batch(buffer: MeasurementBuffer, n: Optional[int] = None, schema=None):
+    """Record batch of the newest `n` measurement rows (all if None)."""
+    pa = _pyarrow()
+    schema = schema or measurement_schema()
+    slots = buffer.slots(n)
+    sensor_ids = np.array(buffer.sensor_ids, dtype=object)
+
+    arrays = [
+        pa.array(buffer.tick[slots]),
+        pa.array(buffer.utc_timestamp[slots], type=pa.string()),
+        pa.array(sensor_ids[buffer.sensor_code[slots]] if slots.size else [], type=pa.string()),
+        _labels(pa, buffer.type_code[slots], [t.value for t in SENSOR_TYPES]),
+        pa.FixedSizeListArray.from_arrays(pa.array(buffer.z[slots].ravel()), 3),
+        pa.FixedSizeListArray.from_arrays(pa.array(buffer.R[slots].ravel()), 9),
+        pa.array(buffer.quality[slots]),
+        pa.array(buffer.latency_ms[slots]),
+        pa.array(buffer.dropped[slots]),
+        pa.array([json.dumps(m or {}, sort_keys=True) for m in buffer.meta[slots]], type=pa.string()),
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def audit_batch(records: List[AuditRecord], schema=None):
+    """Record batch of audit records, payload parts as canonical JSON."""
+    pa = _pyarrow()
+    schema = schema or audit_schema()
+    arrays = [
+        pa.array([r.tick for r in records], type=pa.int64()),
+        pa.array([r.utc for r in records], type=pa.string()),
+        pa.array([r.prev_sha256 for r in records], type=pa.string()),
+        pa.array([r.sha256 for r in records], type=pa.string()),
+        pa.array([canonical_json(r.used_measurements).decode("utf-8") for r in records], type=pa.string()),
+        pa.array([canonical_json(r.fused_output).decode("utf-8") for r in records], type=pa.string()),
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _newest(records, n: int) -> List[Any]:
+    """The newest `n` entries of a deque, oldest first."""
+    return list(islice(reversed(records), n))[::-1]
+
+
+# ============================================================
+# WRITERS
+# ============================================================
+
+class _TableWriter:
+    """One output file: IPC batches go straight out, Parquet batches are grouped."""
+
+    def __init__(self, path: Path, fmt: str, schema, compression: Optional[str]):
+        pa = _pyarrow()
+        self.fmt = fmt
+        self.schema = schema
+        self.rows = 0
+        self._pending: List[Any] = []
+        self._pending_rows = 0
+        if fmt == "ipc":
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(str(path), schema, options=options)
+        else:
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(str(path), schema, compression=compression or "zstd")
+
+    def write(self, batch) -> None:
+        if batch.num_rows == 0:
+            return
+        self.rows += batch.num_rows
+        if self.fmt == "ipc":
+            self._writer.write_batch(batch)
+            return
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= PARQUET_ROW_GROUP:
+            self._write_row_group()
+
+    def _write_row_group(self) -> None:
+        if self._pending:
+            pa = _pyarrow()
+            self._writer.write_table(pa.Table.from_batches(self._pending, schema=self.schema))
+        self._pending = []
+        self._pending_rows = 0
+
+    def close(self) -> None:
+        if self.fmt == "parquet":
+            self._write_row_group()
+        self._writer.close()
+
+
+class RunExporter:
+    """
+    Streaming exporter for one run.
+
+    Call write_tick(state) after every StepEngine.step(). Rows are taken
+    from the state's history buffers in batches of up to `batch_ticks`
+    ticks, always before the ring buffers could evict them. Audit rows
+    come from state.audit_chain, so flush() a PipelinedStepEngine before
+    each call.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fmt: str = "ipc",
+        batch_ticks: int = 4096,
+        compression: Optional[str] = None,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {tuple(FORMATS)}, got {fmt!r}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.batch_ticks = max(1, int(batch_ticks))
+        self.compression = compression
+
+        self.last_tick: Optional[int] = None
+        self._writers: Dict[str, _TableWriter] = {}
+        self._state: Optional[EngineState] = None
+        self._pending_ticks = 0
+        self._pending_meas = 0
+        self._max_meas_per_tick = 0
+
+    def path(self, table: str) -> Path:
+        return self.directory / f"{table}{FORMATS[self.fmt]}"
+
+    @property
+    def rows_written(self) -> Dict[str, int]:
+        return {name: w.rows for name, w in self._writers.items()}
+
+    def _open(self, state: EngineState) -> None:
+        metadata = run_metadata(state)
+        for table in TABLES:
+            schema = _SCHEMAS[table](metadata)
+            self._writers[table] = _TableWriter(self.path(table), self.fmt, schema, self.compression)
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def write_tick(self, state: EngineState) -> None:
+        """Register the tick just stepped; flushes when a batch is due."""
+        if self.last_tick is not None and state.tick != self.last_tick + 1:
+            raise ValueError(f"RunExporter expects consecutive ticks: got {state.tick} after {self.last_tick}")
+        state.require_audit_current("RunExporter")
+        if not self._writers:
+            self._open(state)
+
+        self._state = state
+        self.last_tick = state.tick
+        rows = state.meas_history.trailing_count(state.tick)
+        self._pending_ticks += 1
+        self._pending_meas += rows
+        self._max_meas_per_tick = max(self._max_meas_per_tick, rows)
+
+        # Flush while every pending row is still buffered after the *next* tick's appends.
+        audit_room = state.audit_chain.maxlen if state.audit_chain.maxlen is not None else self.batch_ticks
+        tick_room = min(state.history.maxlen, audit_room)
+        if (
+            self._pending_ticks >= self.batch_ticks
+            or self._pending_ticks >= tick_room
+            or self._pending_meas + self._max_meas_per_tick > state.meas_history.maxlen
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending rows as one record batch per table."""
+        if self._state is None or not self._pending_ticks:
+            return
+        self._write(self._state, self._pending_ticks, self._pending_meas, self._pending_ticks)
+        self._pending_ticks = 0
+        self._pending_meas = 0
+
+    def _write(self, state: EngineState, n_tel: int, n_meas: int, n_audit: int) -> None:
+        w = self._writers
+        w["telemetry"].write(telemetry_batch(state.history, n_tel, w["telemetry"].schema))
+        w["measurements"].write(measurement_batch(state.meas_history, n_meas, w["measurements"].schema))
+        w["audit"].write(audit_batch(_newest(state.audit_chain, n_audit), w["audit"].schema))
+
+    def close(self) -> None:
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def __enter__(self) -> "RunExporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def export_state(state: EngineState, directory: str, fmt: str = "ipc", compression: Optional[str] = None) -> Dict[str, int]:
+    """Write everything the state's buffers currently hold; returns rows per table."""
+    exporter = RunExporter(directory, fmt=fmt, compression=compression)
+    exporter._open(state)
+    exporter._write(state, len(state.history), len(state.meas_history), len(state.audit_chain))
+    rows = exporter.rows_written
+    exporter.close()
+    return rows
+
+
+# ============================================================
+# LOADER
+# ============================================================
+
+def _table_path(directory: str, table: str) -> Path:
+    for suffix in FORMATS.values():
+        path = Path(directory) / f"{table}{suffix}"
+        if path.exists():
+            return path
+    raise FileNotFoundError(f"No {table} table in {directory}")
+
+
+def load_table(directory: str, table: str, columns: Optional[List[str]] = None):
+    """
+    One table of an exported run as a pyarrow.Table.
+
+    IPC files are memory-mapped: only the columns that are accessed are
+    paged in.
+    """
+    pa = _pyarrow()
+    path = _table_path(directory, table)
+    if path.suffix == FORMATS["ipc"]:
+        result = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        return result.select(columns) if columns else result
+    import pyarrow.parquet as pq
+    return pq.read_table(str(path), columns=columns, memory_map=True)
+
+
+def load_run(directory: str) -> Dict[str, Any]:
+    """All tables of an exported run, keyed by name."""
+    return {table: load_table(directory, table) for table in TABLES}
+
+
+def iter_batches(directory: str, table: str, columns: Optional[List[str]] = None) -> Iterator[Any]:
+    """Stream one table as record batches (never loads the whole file)."""
+    pa = _pyarrow()
+    path = _table_path(directory, table)
+    if path.suffix == FORMATS["ipc"]:
+        reader = pa.ipc.open_file(pa.memory_map(str(path), "r"))
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            yield batch.select(columns) if columns else batch
+        return
+    import pyarrow.parquet as pq
+    yield from pq.ParquetFile(str(path)).iter_batches(columns=columns)
+
+
+def run_info(directory: str) -> Dict[str, Any]:
+    """Run metadata (run id, seed, environment, config) stored with the tables."""
+    pa = _pyarrow()
+    path = _table_path(directory, "telemetry")
+    if path.suffix == FORMATS["ipc"]:
+        schema = pa.ipc.open_file(pa.memory_map(str(path), "r")).schema
+    else:
+        import pyarrow.parquet as pq
+        schema = pq.read_schema(str(path))
+    meta = {k.decode(): v.decode() for k, v in (schema.metadata or {}).items()}
+    return {
+        "run_id": int(meta.get("casper.run_id", 0)),
+        "rng_seed": int(meta.get("casper.rng_seed", 0)),
+        "env_name": meta.get("casper.env_name"),
+        "config": json.loads(meta.get("casper.config", "{}")),
+    }
+
+
+# ============================================================
+# RECORD CONVERSION
+# ============================================================
+
+def _batches(table) -> Iterator[Any]:
+    return iter(table.to_batches()) if hasattr(table, "to_batches") else iter([table])
+
+
+def telemetry_records(table) -> Iterator[TelemetryRecord]:
+    """TelemetryRecords from a telemetry table or batch."""
+    states = {s.value: s for s in SYSTEM_STATES}
+    for batch in _batches(table):
+        data = batch.to_pydict()
+        data["state"] = [states[v] for v in data["state"]]
+        for row in zip(*(data[name] for name in TELEMETRY_FIELDS)):
+            yield TelemetryRecord(**dict(zip(TELEMETRY_FIELDS, row)))
+
+
+def measurement_records(table) -> Iterator[MeasurementRecord]:
+    """MeasurementRecords (z / R as NumPy arrays) from a measurement table or batch."""
+    types = {t.value: t for t in SENSOR_TYPES}
+    for batch in _batches(table):
+        z = batch.column("z").flatten().to_numpy().reshape(-1, 3)
+        R = batch.column("R").flatten().to_numpy().reshape(-1, 3, 3)
+        data = batch.to_pydict()
+        for i in range(batch.num_rows):
+            yield MeasurementRecord(
+                tick=data["tick"][i],
+                utc_timestamp=data["utc_timestamp"][i],
+                sensor_id=data["sensor_id"][i],
+                sensor_type=types[data["sensor_type"][i]],
+                z=z[i].copy(),
+                R=R[i].copy(),
+                quality=data["quality"][i],
+                latency_ms=data["latency_ms"][i],
+                dropped=data["dropped"][i],
+                meta=json.loads(data["meta"][i]),
+            )
+
+
+def audit_records(table) -> Iterator[AuditRecord]:
+    """AuditRecords from an audit table or batch (hashes as stored)."""
+    for batch in _batches(table):
+        data = batch.to_pydict()
+        for i in range(batch.num_rows):
+            yield AuditRecord.model_construct(
+                tick=data["tick"][i],
+                utc=data["utc"][i],
+                used_measurements=json.loads(data["used_measurements"][i]),
+                fused_output=json.loads(data["fused_output"][i]),
+                sha256=data["sha256"][i],
+                prev_sha256=data["prev_sha256"][i],
+            )
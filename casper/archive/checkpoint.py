@@ -0,0 +1,340 @@
+"""
+casper.archive.checkpoint
+=========================
+
+Checkpoint / restore of a running simulation.
+
+A checkpoint holds everything tick N+1 depends on:
+- EngineState scalars: clock position, mission stage, scenario selection,
+  seed, audit head, clarity_ema, fused estimate, last_seen_tick
+- bounded buffers: telemetry history, measurement history, audit tail
+- StepEngine component state: ClarityRiskCalculator EMA and every fusion
+  strategy's filter state (KalmanFusion x / P)
+
+There is no RNG position to store: every tick draws from a generator
+seeded from (rng_seed, tick), so restoring the tick restores the stream.
+
+Checkpoints are single compressed .npz files (arrays plus a JSON header),
+written atomically (tmp file, fsync, os.replace). Checkpointer captures a
+snapshot on the stepping thread (array copies plus references to
+immutable records) and serializes / compresses / writes it on a
+background thread, keeping the newest `keep` files.
+
+capture() flushes the engine first, so a PipelinedStepEngine's queued
+audit records are chained before the audit head and tail are copied; a
+chain that still lags state.tick is rejected rather than checkpointed
+(restoring it would fork the chain).
+
+A durable AuditLogWriter is not part of a checkpoint; reopen it on resume.
+It may hold records past the checkpoint tick if the run crashed after
+checkpointing, and its chain check will then reject the replayed ticks.
+
+No UI dependencies.
+"""
+
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from casper.audit.chain import AuditRecord, decode_record, encode_record
+from casper.buffers import SENSOR_TYPES, SYSTEM_STATES, TELEMETRY_FIELDS
+from casper.clock import Clock, WallClock, clock_from_dict
+from casper.config import FusionConfig
+from casper.instrumentation import NullInstrumentation
+from casper.models import FusedEstimate, MeasurementRecord, TelemetryRecord
+from casper.presets import AOConfig
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_PATTERN = "checkpoint-*.npz"
+
+# EngineState fields stored as plain JSON values.
+_STATE_SCALARS = (
+    "tick",
+    "mission_time_s",
+    "mission_stage_index",
+    "mission_stage_tick",
+    "tick_utc",
+    "run_id",
+    "rng_seed",
+    "env_name",
+    "envelope_name",
+    "threshold_name",
+    "clarity_ema",
+    "audit_head",
+    "fusion_strategy_name",
+)
+
+_MEAS_COLUMNS = ("tick", "sensor_code", "type_code", "z", "R", "quality", "latency_ms", "dropped")
+
+
+@dataclass
+class Snapshot:
+    """
+    Captured state, ready to serialize. Arrays are private copies; records
+    and meta dicts are shared references (never mutated after creation).
+    """
+    tick: int
+    header: Dict[str, Any]
+    arrays: Dict[str, np.ndarray] = field(default_factory=dict)
+    audit: List[AuditRecord] = field(default_factory=list)
+    meas_meta: List[Any] = field(default_factory=list)
+
+
+# ============================================================
+# NESTED ARRAYS
+# ============================================================
+
+def _split_arrays(obj: Any, prefix: str, arrays: Dict[str, np.ndarray]) -> Any:
+    """Replace ndarray leaves with {"__array__": key}, collecting them in `arrays`."""
+    if isinstance(obj, np.ndarray):
+        arrays[prefix] = obj.copy()
+        return {"__array__": prefix}
+    if isinstance(obj, dict):
+        return {k: _split_arrays(v, f"{prefix}.{k}", arrays) for k, v in obj.items()}
+    return obj
+
+
+def _join_arrays(obj: Any, arrays: Dict[str, np.ndarray]) -> Any:
+    if isinstance(obj, dict):
+        if set(obj) == {"__array__"}:
+            return arrays[obj["__array__"]]
+        return {k: _join_arrays(v, arrays) for k, v in obj.items()}
+    return obj
+
+
+# ============================================================
+# CAPTURE / WRITE
+# ============================================================
+
+def capture(state: EngineState, engine: StepEngine) -> Snapshot:
+    """Copy everything needed to resume after state.tick (cheap; no I/O)."""
+    engine.flush()
+    state.require_audit_current("checkpoint")
+    arrays: Dict[str, np.ndarray] = {}
+
+    header: Dict[str, Any] = {name: getattr(state, name) for name in _STATE_SCALARS}
+    header.update(
+        version=CHECKPOINT_VERSION,
+        config=state.config.to_dict(),
+        clock=state.clock.to_dict(),
+        ao=state.ao.model_dump() if state.ao is not None else None,
+        fused=state.fused.model_dump() if state.fused is not None else None,
+        last_seen_tick=dict(state.last_seen_tick),
+        engine=_split_arrays(engine.snapshot(), "engine", arrays),
+    )
+
+    for name, values in state.history.window().items():
+        arrays[f"tel.{name}"] = values.copy()
+
+    buf = state.meas_history
+    slots = buf.slots()
+    for name in _MEAS_COLUMNS:
+        arrays[f"meas.{name}"] = getattr(buf, name)[slots]
+    arrays["meas.utc_timestamp"] = buf.utc_timestamp[slots]
+    header["sensor_ids"] = list(buf.sensor_ids)
+
+    return Snapshot(
+        tick=int(state.tick),
+        header=header,
+        arrays=arrays,
+        audit=list(state.audit_chain),
+        meas_meta=buf.meta[slots].tolist(),
+    )
+
+
+def _bytes_array(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype=np.uint8)
+
+
+def write_snapshot(snapshot: Snapshot, path: str) -> Path:
+    """Serialize and atomically write one checkpoint file."""
+    arrays = {}
+    for key, values in snapshot.arrays.items():
+        # Object columns (strings) are stored as fixed-width unicode.
+        arrays[key] = values.astype(str) if values.dtype == object else values
+
+    lines = [encode_record(r) for r in snapshot.audit]
+    arrays["audit.lines"] = _bytes_array(b"".join(lines))
+    arrays["audit.lengths"] = np.array([len(line) for line in lines], dtype=np.int64)
+    arrays["meas.meta"] = _bytes_array(json.dumps(snapshot.meas_meta, sort_keys=True).encode("utf-8"))
+    arrays["header"] = _bytes_array(json.dumps(snapshot.header, sort_keys=True).encode("utf-8"))
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+def save_checkpoint(state: EngineState, engine: StepEngine, path: str) -> Path:
+    """Capture and write a checkpoint synchronously."""
+    return write_snapshot(capture(state, engine), path)
+
+
+# ============================================================
+# RESTORE
+# ============================================================
+
+def _restore_clock(data: Dict[str, Any]) -> Clock:
+    clock = clock_from_dict(data)
+    if clock is not None:
+        return clock
+    if data.get("kind") == "wall":
+        return WallClock()
+    raise ValueError(f"Cannot rebuild a {data.get('kind')!r} clock from a checkpoint; pass clock=")
+
+
+def load_checkpoint(
+    path: str,
+    clock: Optional[Clock] = None,
+    instrumentation: Optional[NullInstrumentation] = None,
+) -> Tuple[EngineState, StepEngine]:
+    """
+    Rebuild (state, engine) from a checkpoint. Stepping them continues the
+    run exactly where it was captured.
+    """
+    with np.load(path, allow_pickle=False) as npz:
+        arrays = {key: npz[key] for key in npz.files}
+
+    header = json.loads(arrays.pop("header").tobytes())
+    if header.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {header.get('version')!r}")
+
+    config = FusionConfig.from_dict(header["config"])
+    state = EngineState(config=config, clock=clock or _restore_clock(header["clock"]))
+    for name in _STATE_SCALARS:
+        setattr(state, name, header[name])
+    state.ao = AOConfig(**header["ao"]) if header["ao"] is not None else None
+    state.fused = FusedEstimate(**header["fused"]) if header["fused"] is not None else None
+    state.last_seen_tick = {k: int(v) for k, v in header["last_seen_tick"].items()}
+
+    # Telemetry history
+    tel = {name: arrays[f"tel.{name}"].tolist() for name in TELEMETRY_FIELDS}
+    for row in zip(*(tel[name] for name in TELEMETRY_FIELDS)):
+        values = dict(zip(TELEMETRY_FIELDS, row))
+        values["state"] = SYSTEM_STATES[values["state"]]
+        state.history.append(TelemetryRecord(**values))
+
+    # Measurement history (sensor codes registered in their original order)
+    buf = state.meas_history
+    for sensor_id in header["sensor_ids"]:
+        buf.sensor_code_for(sensor_id)
+    meta = json.loads(arrays["meas.meta"].tobytes())
+    m = {name: arrays[f"meas.{name}"] for name in _MEAS_COLUMNS + ("utc_timestamp",)}
+    for i in range(m["tick"].shape[0]):
+        buf.append(MeasurementRecord(
+            tick=int(m["tick"][i]),
+            utc_timestamp=str(m["utc_timestamp"][i]),
+            sensor_id=header["sensor_ids"][m["sensor_code"][i]],
+            sensor_type=SENSOR_TYPES[m["type_code"][i]],
+            z=m["z"][i],
+            R=m["R"][i],
+            quality=float(m["quality"][i]),
+            latency_ms=float(m["latency_ms"][i]),
+            dropped=bool(m["dropped"][i]),
+            meta=meta[i],
+        ))
+
+    # Audit tail
+    raw = arrays["audit.lines"].tobytes()
+    offset = 0
+    for length in arrays["audit.lengths"].tolist():
+        state.audit_chain.append(decode_record(raw[offset:offset + length]))
+        offset += length
+
+    engine = StepEngine(config, instrumentation=instrumentation)
+    engine.restore(_join_arrays(header["engine"], arrays))
+    return state, engine
+
+
+def checkpoint_paths(directory: str) -> List[Path]:
+    """Checkpoints in a directory, oldest first."""
+    return sorted(Path(directory).glob(CHECKPOINT_PATTERN))
+
+
+def latest_checkpoint(directory: str) -> Optional[Path]:
+    paths = checkpoint_paths(directory)
+    return paths[-1] if paths else None
+
+
+def resume(directory: str, clock: Optional[Clock] = None) -> Optional[Tuple[EngineState, StepEngine]]:
+    """(state, engine) from the newest checkpoint in `directory`, or None."""
+    path = latest_checkpoint(directory)
+    return load_checkpoint(str(path), clock=clock) if path is not None else None
+
+
+# ============================================================
+# PERIODIC CHECKPOINTS
+# ============================================================
+
+class Checkpointer:
+    """
+    Takes a checkpoint every `every` ticks.
+
+    Call maybe_checkpoint(state, engine) after every step. The snapshot is
+    captured immediately; serialization and I/O run on a background thread
+    (at most one write in flight: the next checkpoint waits for it).
+    Write errors are re-raised on the next call or on close().
+    """
+
+    def __init__(self, directory: str, every: int = 1000, keep: int = 3, background: bool = True):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.every = max(1, int(every))
+        self.keep = max(1, int(keep))
+        self.last_tick: Optional[int] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="casper-checkpoint") if background else None
+        self._pending: Optional[Future] = None
+
+    def path_for(self, tick: int) -> Path:
+        return self.directory / f"checkpoint-{int(tick):012d}.npz"
+
+    def maybe_checkpoint(self, state: EngineState, engine: StepEngine) -> bool:
+        if state.tick % self.every:
+            return False
+        self.checkpoint(state, engine)
+        return True
+
+    def checkpoint(self, state: EngineState, engine: StepEngine) -> None:
+        snapshot = capture(state, engine)
+        self.wait()
+        self.last_tick = snapshot.tick
+        if self._executor is None:
+            self._write(snapshot)
+        else:
+            self._pending = self._executor.submit(self._write, snapshot)
+
+    def _write(self, snapshot: Snapshot) -> None:
+        write_snapshot(snapshot, str(self.path_for(snapshot.tick)))
+        for old in checkpoint_paths(str(self.directory))[:-self.keep]:
+            old.unlink(missing_ok=True)
+
+    def wait(self) -> None:
+        """Block until the in-flight write (if any) has finished."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending.result()
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "Checkpointer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,418 @@
+"""
+casper.archive.memmap
+=====================
+
+Memory-mapped run archive for Casper_Fusion.
+
+Layout:
+    <directory>/archive.json       header (run info, sensor ids, dtypes)
+    <directory>/telemetry.bin      one TELEMETRY_DTYPE record per tick
+    <directory>/index.bin          one INDEX_DTYPE record per tick
+    <directory>/measurements.bin   MEASUREMENT_DTYPE records, in tick order
+    <directory>/meta.jsonl         per-tick JSON list of measurement meta dicts
+    <directory>/audit.jsonl        audit records, encode_record() lines
+
+Telemetry and measurements are fixed-width NumPy structured records, so
+RunArchive opens every .bin file with np.memmap: opening costs the same
+for any run length, and reading ticks [a, b) touches only the pages
+holding those rows. The per-tick index gives the measurement row range
+plus the (offset, length) of its meta and audit lines; ticks are
+consecutive, so a tick's row is tick - first_tick.
+
+Round-trips Telemetry / TelemetryRecord, SensorMeasurement /
+MeasurementRecord (z[3], R[3x3]) and AuditRecord (re-hashes to the
+stored sha256).
+
+No UI dependencies.
+"""
+
+import json
+import mmap
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from casper.audit.chain import AuditRecord, decode_record, encode_record
+from casper.buffers import SENSOR_TYPES, SYSTEM_STATES, TELEMETRY_FIELDS
+from casper.models import Measurement, MeasurementRecord, Telemetry, TelemetryRecord
+from casper.state import EngineState
+
+
+ARCHIVE_VERSION = 1
+HEADER_FILE = "archive.json"
+
+# Fixed widths (bytes) of the string fields stored inline.
+UTC_WIDTH = 40
+LABEL_WIDTH = 32
+
+
+# ============================================================
+# RECORD LAYOUTS
+# ============================================================
+
+def _telemetry_dtype() -> np.dtype:
+    fields = []
+    for name in TELEMETRY_FIELDS:
+        annotation = Telemetry.model_fields[name].annotation
+        if name == "state":
+            fields.append((name, np.int8))
+        elif annotation is float:
+            fields.append((name, np.float64))
+        elif annotation is int:
+            fields.append((name, np.int64))
+        else:
+            fields.append((name, f"S{UTC_WIDTH if name == 'utc_timestamp' else LABEL_WIDTH}"))
+    return np.dtype(fields)
+
+
+TELEMETRY_DTYPE = _telemetry_dtype()
+_TELEMETRY_STRINGS = [n for n in TELEMETRY_FIELDS if TELEMETRY_DTYPE[n].kind == "S"]
+
+MEASUREMENT_DTYPE = np.dtype([
+    ("tick", np.int64),
+    ("utc_timestamp", f"S{UTC_WIDTH}"),
+    ("sensor_code", np.int32),
+    ("type_code", np.int8),
+    ("dropped", np.bool_),
+    ("z", np.float64, (3,)),
+    ("R", np.float64, (3, 3)),
+    ("quality", np.float64),
+    ("latency_ms", np.float64),
+])
+
+INDEX_DTYPE = np.dtype([
+    ("tick", np.int64),
+    ("meas_start", np.int64),
+    ("meas_count", np.int32),
+    ("meta_offset", np.int64),
+    ("meta_length", np.int32),
+    ("audit_offset", np.int64),
+    ("audit_length", np.int32),
+])
+
+_STATE_CODES = {s: i for i, s in enumerate(SYSTEM_STATES)}
+_TYPE_CODES = {t: i for i, t in enumerate(SENSOR_TYPES)}
+
+
+def _fixed(value: str, width: int, name: str) -> bytes:
+    raw = value.encode("utf-8")
+    if len(raw) > width:
+        raise ValueError(f"{name} is {len(raw)} bytes, archive field holds {width}: {value!r}")
+    return raw
+
+
+def _text(raw: bytes) -> str:
+    return raw.decode("utf-8")
+
+
+def _telemetry_row(telemetry: Union[Telemetry, TelemetryRecord]) -> np.ndarray:
+    values = []
+    for name in TELEMETRY_FIELDS:
+        value = getattr(telemetry, name)
+        if name == "state":
+            value = _STATE_CODES[value]
+        elif name in _TELEMETRY_STRINGS:
+            value = _fixed(value, TELEMETRY_DTYPE[name].itemsize, name)
+        values.append(value)
+    return np.array([tuple(values)], dtype=TELEMETRY_DTYPE)
+
+
+# ============================================================
+# WRITER
+# ============================================================
+
+class RunArchiveWriter:
+    """
+    Appends ticks to a run archive.
+
+    Call write_tick(state) after every StepEngine.step(), or append_tick()
+    with records from any source. Ticks must be consecutive. The header is
+    rewritten on flush() / close(); an existing archive is replaced.
+    write_tick() needs the tick's audit record chained: flush() a
+    PipelinedStepEngine before each call.
+    """
+
+    def __init__(self, directory: str, buffer_bytes: int = 1 << 20):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.first_tick: Optional[int] = None
+        self.last_tick: Optional[int] = None
+        self.ticks_written = 0
+        self.sensor_ids: List[str] = []
+        self._sensor_codes: Dict[str, int] = {}
+        self._code_map = np.zeros(0, dtype=np.int32)  # MeasurementBuffer code -> archive code
+        self._run: Dict[str, Any] = {}
+
+        self._meas_rows = 0
+        self._meta_offset = 0
+        self._audit_offset = 0
+
+        self._files: Dict[str, BinaryIO] = {
+            name: open(self.directory / name, "wb", buffering=buffer_bytes)
+            for name in ("telemetry.bin", "index.bin", "measurements.bin", "meta.jsonl", "audit.jsonl")
+        }
+
+    def _sensor_code(self, sensor_id: str) -> int:
+        code = self._sensor_codes.get(sensor_id)
+        if code is None:
+            code = len(self.sensor_ids)
+            self.sensor_ids.append(sensor_id)
+            self._sensor_codes[sensor_id] = code
+        return code
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def append_tick(
+        self,
+        telemetry: Union[Telemetry, TelemetryRecord],
+        measurements: Iterable[Measurement] = (),
+        audit: Optional[AuditRecord] = None,
+    ) -> None:
+        """Archive one tick from record objects."""
+        measurements = list(measurements)
+        meas = np.zeros(len(measurements), dtype=MEASUREMENT_DTYPE)
+        for i, m in enumerate(measurements):
+            meas[i] = (
+                m.tick,
+                _fixed(m.utc_timestamp, UTC_WIDTH, "utc_timestamp"),
+                self._sensor_code(m.sensor_id),
+                _TYPE_CODES[m.sensor_type],
+                m.dropped,
+                m.z,
+                m.R,
+                m.quality,
+                m.latency_ms,
+            )
+        self._write(_telemetry_row(telemetry), meas, [m.meta for m in measurements], audit)
+
+    def write_tick(self, state: EngineState) -> None:
+        """Archive the tick just stepped, copied column-wise from the state's buffers."""
+        if not self._run:
+            self._run = {
+                "run_id": state.run_id,
+                "rng_seed": state.rng_seed,
+                "env_name": state.env_name,
+                "config": state.config.to_dict(),
+            }
+
+        buf = state.meas_history
+        slots = buf.slots(buf.trailing_count(state.tick))
+        if len(self._code_map) != len(buf.sensor_ids):
+            self._code_map = np.array([self._sensor_code(s) for s in buf.sensor_ids], dtype=np.int32)
+
+        meas = np.zeros(slots.size, dtype=MEASUREMENT_DTYPE)
+        meas["tick"] = buf.tick[slots]
+        meas["utc_timestamp"] = [_fixed(u, UTC_WIDTH, "utc_timestamp") for u in buf.utc_timestamp[slots]]
+        meas["sensor_code"] = self._code_map[buf.sensor_code[slots]]
+        meas["type_code"] = buf.type_code[slots]
+        meas["dropped"] = buf.dropped[slots]
+        meas["z"] = buf.z[slots]
+        meas["R"] = buf.R[slots]
+        meas["quality"] = buf.quality[slots]
+        meas["latency_ms"] = buf.latency_ms[slots]
+
+        state.require_audit_current("RunArchiveWriter")
+        audit = state.audit_chain[-1] if state.audit_chain else None
+        self._write(_telemetry_row(state.history[-1]), meas, buf.meta[slots].tolist(), audit)
+
+    def _write(self, tel: np.ndarray, meas: np.ndarray, metas: List[Dict[str, Any]], audit: Optional[AuditRecord]) -> None:
+        tick = int(tel["tick"][0])
+        if self.last_tick is not None and tick != self.last_tick + 1:
+            raise ValueError(f"RunArchiveWriter expects consecutive ticks: got {tick} after {self.last_tick}")
+        if self.first_tick is None:
+            self.first_tick = tick
+
+        meta = json.dumps([m or {} for m in metas], sort_keys=True).encode("utf-8") + b"\n"
+        line = encode_record(audit) if audit is not None else b""
+        index = np.array(
+            [(tick, self._meas_rows, meas.shape[0], self._meta_offset, len(meta), self._audit_offset, len(line))],
+            dtype=INDEX_DTYPE,
+        )
+
+        f = self._files
+        f["telemetry.bin"].write(tel.tobytes())
+        f["measurements.bin"].write(meas.tobytes())
+        f["meta.jsonl"].write(meta)
+        f["audit.jsonl"].write(line)
+        f["index.bin"].write(index.tobytes())
+
+        self._meas_rows += meas.shape[0]
+        self._meta_offset += len(meta)
+        self._audit_offset += len(line)
+        self.last_tick = tick
+        self.ticks_written += 1
+
+    def header(self) -> Dict[str, Any]:
+        return {
+            "version": ARCHIVE_VERSION,
+            "first_tick": self.first_tick,
+            "ticks": self.ticks_written,
+            "measurements": self._meas_rows,
+            "sensor_ids": self.sensor_ids,
+            "telemetry_dtype": TELEMETRY_DTYPE.descr,
+            "run": self._run,
+        }
+
+    def flush(self) -> None:
+        for f in self._files.values():
+            f.flush()
+        tmp = self.directory / f"{HEADER_FILE}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.header(), f, default=str)
+        tmp.replace(self.directory / HEADER_FILE)
+
+    def close(self) -> None:
+        if not self._files:
+            return
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self) -> "RunArchiveWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ============================================================
+# READER
+# ============================================================
+
+def _map(path: Path, dtype: np.dtype, rows: int) -> np.ndarray:
+    if rows <= 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+
+class _Heap:
+    """Read-only memory map over a line heap (meta / audit JSON)."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        size = path.stat().st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def read(self, offset: int, length: int) -> bytes:
+        return self._map[offset:offset + length]
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+
+class RunArchive:
+    """
+    Read-only view of a run archive. Tick ranges are half-open [start, stop)
+    in absolute ticks; slices are zero-copy views into the memory maps.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        with open(self.directory / HEADER_FILE, "r") as f:
+            self.header: Dict[str, Any] = json.load(f)
+        if self.header.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported run archive version {self.header.get('version')!r}")
+
+        self.first_tick = int(self.header["first_tick"] or 0)
+        self.sensor_ids: List[str] = list(self.header["sensor_ids"])
+        ticks = int(self.header["ticks"])
+
+        self.telemetry = _map(self.directory / "telemetry.bin", TELEMETRY_DTYPE, ticks)
+        self.index = _map(self.directory / "index.bin", INDEX_DTYPE, ticks)
+        self.measurements = _map(self.directory / "measurements.bin", MEASUREMENT_DTYPE, int(self.header["measurements"]))
+        self._meta = _Heap(self.directory / "meta.jsonl")
+        self._audit = _Heap(self.directory / "audit.jsonl")
+
+    def __len__(self) -> int:
+        return int(self.telemetry.shape[0])
+
+    @property
+    def last_tick(self) -> int:
+        return self.first_tick + len(self) - 1
+
+    @property
+    def run(self) -> Dict[str, Any]:
+        return self.header.get("run", {})
+
+    def _rows(self, start: Optional[int], stop: Optional[int]) -> slice:
+        lo = 0 if start is None else max(int(start) - self.first_tick, 0)
+        hi = len(self) if stop is None else min(int(stop) - self.first_tick, len(self))
+        return slice(lo, max(lo, hi))
+
+    # --------------------------------------------------
+    # Columnar access (views)
+    # --------------------------------------------------
+    def telemetry_slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """Structured telemetry rows for ticks [start, stop)."""
+        return self.telemetry[self._rows(start, stop)]
+
+    def column(self, name: str, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """One telemetry field for ticks [start, stop) ("state" as SYSTEM_STATES codes)."""
+        return self.telemetry[name][self._rows(start, stop)]
+
+    def measurement_slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        """Structured measurement rows recorded during ticks [start, stop)."""
+        index = self.index[self._rows(start, stop)]
+        if index.shape[0] == 0:
+            return self.measurements[0:0]
+        lo = int(index["meas_start"][0])
+        hi = int(index["meas_start"][-1] + index["meas_count"][-1])
+        return self.measurements[lo:hi]
+
+    # --------------------------------------------------
+    # Record access
+    # --------------------------------------------------
+    def telemetry_records(self, start: Optional[int] = None, stop: Optional[int] = None) -> List[TelemetryRecord]:
+        rows = self.telemetry_slice(start, stop)
+        records = []
+        for row in rows.tolist():
+            values = dict(zip(TELEMETRY_FIELDS, row))
+            for name in _TELEMETRY_STRINGS:
+                values[name] = _text(values[name])
+            values["state"] = SYSTEM_STATES[values["state"]]
+            records.append(TelemetryRecord(**values))
+        return records
+
+    def measurement_records(self, start: Optional[int] = None, stop: Optional[int] = None) -> List[MeasurementRecord]:
+        records = []
+        for entry in self.index[self._rows(start, stop)]:
+            metas = json.loads(self._meta.read(int(entry["meta_offset"]), int(entry["meta_length"])))
+            first = int(entry["meas_start"])
+            for row, meta in zip(self.measurements[first:first + int(entry["meas_count"])], metas):
+                records.append(MeasurementRecord(
+                    tick=int(row["tick"]),
+                    utc_timestamp=_text(row["utc_timestamp"]),
+                    sensor_id=self.sensor_ids[row["sensor_code"]],
+                    sensor_type=SENSOR_TYPES[row["type_code"]],
+                    z=np.array(row["z"]),
+                    R=np.array(row["R"]),
+                    quality=float(row["quality"]),
+                    latency_ms=float(row["latency_ms"]),
+                    dropped=bool(row["dropped"]),
+                    meta=meta,
+                ))
+        return records
+
+    def audit_records(self, start: Optional[int] = None, stop: Optional[int] = None) -> List[AuditRecord]:
+        index = self.index[self._rows(start, stop)]
+        return [
+            decode_record(self._audit.read(int(offset), int(length)))
+            for offset, length in zip(index["audit_offset"], index["audit_length"])
+            if length
+        ]
+
+    def close(self) -> None:
+        self._meta.close()
+        self._audit.close()
+
+    def __enter__(self) -> "RunArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
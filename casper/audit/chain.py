@@ -7,6 +7,8 @@ Audit trail utilities for Casper_Fusion.
 Provides:
 - AuditRecord model
 - build_audit_record() helper that emits a deterministic SHA256 hash
+- hash chaining: each record's payload carries the previous record's hash
+- canonical line encoding shared by the on-disk log and verifiers
 """
 
 import json
@@ -14,11 +16,15 @@ import hashlib
 from typing import Any, Dict, List
 
 import numpy as np
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 
 from casper.models import SensorMeasurement, FusedEstimate
 
 
+# prev_sha256 of the first record in a chain
+GENESIS_SHA256 = "0" * 64
+
+
 class AuditRecord(BaseModel):
     """
     One audit entry capturing which measurements were used and the fused output.
@@ -30,6 +36,10 @@ class AuditRecord(BaseModel):
     used_measurements: List[Dict[str, Any]]
     fused_output: Dict[str, Any]
     sha256: str
+    prev_sha256: str = GENESIS_SHA256
+
+    # Canonical payload bytes the hash was computed from (not serialized).
+    _canonical: bytes = PrivateAttr(default=b"")
 
 
 def _safe_float(x: Any) -> float:
@@ -39,11 +49,57 @@ def _safe_float(x: Any) -> float:
         return float("nan")
 
 
+def canonical_json(payload: Dict[str, Any]) -> bytes:
+    """Stable JSON serialization (sorted keys, compact separators)."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def audit_payload(record: AuditRecord) -> Dict[str, Any]:
+    """The hashed payload of a record (everything except sha256)."""
+    return {
+        "tick": int(record.tick),
+        "utc": str(record.utc),
+        "prev": record.prev_sha256,
+        "used": record.used_measurements,
+        "fused": record.fused_output,
+    }
+
+
+def compute_sha256(record: AuditRecord) -> str:
+    """Recompute a record's hash from its payload."""
+    return hashlib.sha256(canonical_json(audit_payload(record))).hexdigest()
+
+
+def encode_record(record: AuditRecord) -> bytes:
+    """
+    One JSON line for the on-disk log: the canonical payload plus sha256.
+
+    Reuses the bytes hashed by build_audit_record when available, so
+    logging does not serialize the payload a second time.
+    """
+    raw = record._canonical or canonical_json(audit_payload(record))
+    return raw[:-1] + b',"sha256":"' + record.sha256.encode("ascii") + b'"}\n'
+
+
+def decode_record(line: bytes) -> AuditRecord:
+    """Inverse of encode_record()."""
+    data = json.loads(line)
+    return AuditRecord.model_construct(
+        tick=int(data["tick"]),
+        utc=data["utc"],
+        used_measurements=data["used"],
+        fused_output=data["fused"],
+        sha256=data["sha256"],
+        prev_sha256=data["prev"],
+    )
+
+
 def build_audit_record(
     tick: int,
     utc: str,
     used_measurements: List[SensorMeasurement],
     fused: FusedEstimate,
+    prev_sha256: str = GENESIS_SHA256,
 ) -> AuditRecord:
     """
     Build a deterministic audit record + SHA256.
@@ -52,6 +108,8 @@ def build_audit_record(
     - We intentionally store compact measurement summaries (not full matrices)
       to keep exports readable.
     - Hash is computed from a stable JSON serialization (sorted keys).
+    - The payload includes prev_sha256, chaining each record to the one
+      before it; the first record of a run chains to GENESIS_SHA256.
     """
     used_payload: List[Dict[str, Any]] = []
     for m in used_measurements:
@@ -88,17 +146,22 @@ def build_audit_record(
     payload = {
         "tick": int(tick),
         "utc": str(utc),
+        "prev": str(prev_sha256),
         "used": used_payload,
         "fused": fused_payload,
     }
 
-    raw = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    raw = canonical_json(payload)
     sha = hashlib.sha256(raw).hexdigest()
 
-    return AuditRecord(
+    # Every field is produced above from validated inputs; skip re-validation.
+    record = AuditRecord.model_construct(
         tick=int(tick),
         utc=str(utc),
         used_measurements=used_payload,
         fused_output=fused_payload,
         sha256=sha,
+        prev_sha256=str(prev_sha256),
     )
+    record._canonical = raw
+    return record
@@ -0,0 +1,330 @@
+"""
+casper.audit.log
+================
+
+Append-only, segmented on-disk audit log for Casper_Fusion.
+
+Layout:
+    <directory>/audit-000000.jsonl
+    <directory>/audit-000001.jsonl
+    ...
+    <directory>/checkpoints.jsonl
+
+Each segment line is encode_record(): the canonical hashed payload plus
+sha256. Records must arrive as an unbroken hash chain (prev_sha256 == head).
+
+Every `checkpoint_block` records the writer appends a Checkpoint carrying
+the Merkle root of that block and where its first record lives, so blocks
+can be verified independently (see casper.audit.verify).
+
+A crash can leave the last line of a segment (or of checkpoints.jsonl)
+cut short. Such a torn line has no trailing newline: readers skip it,
+AuditLogWriter truncates it away on reopen, and verify_log reports it.
+
+fsync policy:
+- "never"    : rely on the OS page cache
+- "segment"  : fsync when a segment is closed (default)
+- "interval" : fsync every `fsync_interval` records
+- "always"   : fsync after every record (slow; strongest durability)
+"""
+
+import json
+import os
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from casper.audit.chain import AuditRecord, GENESIS_SHA256, decode_record, encode_record
+from casper.audit.merkle import leaf_hash, merkle_root_of_leaves
+
+
+FSYNC_POLICIES = ("never", "segment", "interval", "always")
+SEGMENT_PATTERN = "audit-*.jsonl"
+CHECKPOINT_FILE = "checkpoints.jsonl"
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Merkle checkpoint over one block of consecutive audit records."""
+    block: int
+    segment: str
+    offset: int
+    count: int
+    first_tick: int
+    last_tick: int
+    prev_sha256: str
+    last_sha256: str
+    root: str
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def segment_paths(directory: str) -> List[Path]:
+    """Existing segments in write order."""
+    return sorted(Path(directory).glob(SEGMENT_PATTERN))
+
+
+def torn_tail(path: Path) -> Optional[Tuple[int, int]]:
+    """(offset, length) of a final line without trailing newline, or None."""
+    size = path.stat().st_size if path.exists() else 0
+    if size == 0:
+        return None
+    with open(path, "rb") as f:
+        end = size
+        while end > 0:
+            start = max(0, end - (1 << 16))
+            f.seek(start)
+            chunk = f.read(end - start)
+            if end == size and chunk.endswith(b"\n"):
+                return None
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                offset = start + newline + 1
+                return offset, size - offset
+            end = start
+    return 0, size
+
+
+def _complete_lines(f: BinaryIO) -> Iterator[bytes]:
+    for line in f:
+        if line.endswith(b"\n"):
+            yield line
+
+
+def read_checkpoints(directory: str) -> List[Checkpoint]:
+    path = Path(directory) / CHECKPOINT_FILE
+    if not path.exists():
+        return []
+    with open(path, "rb") as f:
+        return [Checkpoint(**json.loads(line)) for line in _complete_lines(f) if line.strip()]
+
+
+def iter_log_positions(directory: str) -> Iterator[Tuple[str, int, AuditRecord]]:
+    """Stream (segment name, byte offset, record) for every record, oldest first."""
+    for path in segment_paths(directory):
+        offset = 0
+        with open(path, "rb") as f:
+            for line in _complete_lines(f):
+                if line.strip():
+                    yield path.name, offset, decode_record(line)
+                offset += len(line)
+
+
+def iter_log(directory: str) -> Iterator[AuditRecord]:
+    """Stream every record of a log, oldest first."""
+    for _, _, record in iter_log_positions(directory):
+        yield record
+
+
+def iter_records_from(directory: str, segment: str, offset: int, count: int) -> Iterator[AuditRecord]:
+    """
+    Stream `count` records starting at (segment, offset), continuing into
+    later segments if needed.
+    """
+    remaining = count
+    for path in segment_paths(directory):
+        if path.name < segment:
+            continue
+        with open(path, "rb") as f:
+            if path.name == segment:
+                f.seek(offset)
+            for line in _complete_lines(f):
+                if not line.strip():
+                    continue
+                if remaining <= 0:
+                    return
+                yield decode_record(line)
+                remaining -= 1
+        if remaining <= 0:
+            return
+
+
+class AuditLogWriter:
+    """
+    Buffered writer for a hash-chained audit log.
+
+    Reopening an existing directory resumes the chain from its last record
+    and starts a fresh segment; existing segments are never rewritten,
+    except that a torn final line left by a crash is truncated away.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_records: int = 100_000,
+        fsync: str = "segment",
+        fsync_interval: int = 1000,
+        buffer_bytes: int = 1 << 20,
+        checkpoint_block: int = 1024,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        if segment_records <= 0:
+            raise ValueError("segment_records must be positive")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_records = int(segment_records)
+        self.fsync = fsync
+        self.fsync_interval = max(1, int(fsync_interval))
+        self.buffer_bytes = int(buffer_bytes)
+        self.checkpoint_block = max(0, int(checkpoint_block))
+
+        self.head = GENESIS_SHA256
+        self.last_tick: Optional[int] = None
+        self.records_written = 0
+        self.bytes_written = 0
+
+        self._file: Optional[BinaryIO] = None
+        self._segment_index = 0
+        self._segment_count = 0
+        self._segment_offset = 0
+        self._since_fsync = 0
+
+        # Current (unfinished) checkpoint block
+        self._block_index = 0
+        self._block_leaves: List[bytes] = []
+        self._block_start: Optional[Tuple[str, int, int, str]] = None
+
+        self._resume()
+
+    # --------------------------------------------------
+    # Resume
+    # --------------------------------------------------
+    def _resume(self) -> None:
+        existing = segment_paths(str(self.directory))
+        if not existing:
+            return
+        for path in existing + [self.directory / CHECKPOINT_FILE]:
+            torn = torn_tail(path)
+            if torn is not None:
+                os.truncate(path, torn[0])
+        self._segment_index = int(existing[-1].stem.split("-")[1]) + 1
+
+        checkpoints = read_checkpoints(str(self.directory))
+        after = checkpoints[-1].last_sha256 if checkpoints else GENESIS_SHA256
+        self._block_index = checkpoints[-1].block + 1 if checkpoints else 0
+
+        # Records past the last checkpoint (e.g. after a crash) rejoin the open block.
+        pending = not checkpoints
+        for segment, offset, record in iter_log_positions(str(self.directory)):
+            self.head = record.sha256
+            self.last_tick = record.tick
+            if pending:
+                self._add_to_block(segment, offset, record)
+            elif record.sha256 == after:
+                pending = True
+
+    # --------------------------------------------------
+    # Segments
+    # --------------------------------------------------
+    @property
+    def segment_path(self) -> Path:
+        return self.directory / f"audit-{self._segment_index:06d}.jsonl"
+
+    def _open_segment(self) -> None:
+        self._file = open(self.segment_path, "ab", buffering=self.buffer_bytes)
+        self._segment_count = 0
+        self._segment_offset = 0
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        self._segment_index += 1
+
+    # --------------------------------------------------
+    # Checkpoints
+    # --------------------------------------------------
+    def _add_to_block(self, segment: str, offset: int, record: AuditRecord) -> None:
+        if not self.checkpoint_block:
+            return
+        if not self._block_leaves:
+            self._block_start = (segment, offset, record.tick, record.prev_sha256)
+        self._block_leaves.append(leaf_hash(record.sha256))
+        if len(self._block_leaves) >= self.checkpoint_block:
+            self._emit_checkpoint()
+
+    def _emit_checkpoint(self) -> None:
+        if not self._block_leaves:
+            return
+        segment, offset, first_tick, prev = self._block_start
+        cp = Checkpoint(
+            block=self._block_index,
+            segment=segment,
+            offset=offset,
+            count=len(self._block_leaves),
+            first_tick=first_tick,
+            last_tick=int(self.last_tick),
+            prev_sha256=prev,
+            last_sha256=self.head,
+            root=merkle_root_of_leaves(self._block_leaves).hex(),
+        )
+        # Segment data must reach disk no later than the checkpoint that covers it.
+        self.flush(sync=self.fsync != "never")
+        with open(self.directory / CHECKPOINT_FILE, "a") as f:
+            f.write(json.dumps(cp.to_dict(), sort_keys=True) + "\n")
+            f.flush()
+            if self.fsync != "never":
+                os.fsync(f.fileno())
+
+        self._block_index += 1
+        self._block_leaves = []
+        self._block_start = None
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def append(self, record: AuditRecord) -> None:
+        if record.prev_sha256 != self.head:
+            raise ValueError(
+                f"Audit chain break at tick {record.tick}: "
+                f"prev_sha256 {record.prev_sha256[:12]}… != head {self.head[:12]}…"
+            )
+
+        if self._file is None:
+            self._open_segment()
+
+        line = encode_record(record)
+        offset = self._segment_offset
+        self._file.write(line)
+
+        self.head = record.sha256
+        self.last_tick = record.tick
+        self.records_written += 1
+        self.bytes_written += len(line)
+        self._segment_offset += len(line)
+        self._segment_count += 1
+        self._since_fsync += 1
+
+        self._add_to_block(self.segment_path.name, offset, record)
+
+        if self.fsync == "always" or (self.fsync == "interval" and self._since_fsync >= self.fsync_interval):
+            self.flush(sync=True)
+
+        if self._segment_count >= self.segment_records:
+            self._close_segment()
+
+    def flush(self, sync: bool = False) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+            self._since_fsync = 0
+
+    def close(self) -> None:
+        """Checkpoint the open block (if any) and close the segment."""
+        self._emit_checkpoint()
+        self._close_segment()
+
+    def __enter__(self) -> "AuditLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,79 @@
+"""
+casper.audit.merkle
+===================
+
+Merkle trees over audit record hashes.
+
+Conventions (RFC 6962 style domain separation):
+- leaf  = SHA256(0x00 || record_sha256_bytes)
+- node  = SHA256(0x01 || left || right)
+- an odd node at the end of a level is promoted unchanged
+
+Proofs are lists of (side, sibling_hex) pairs from leaf to root, where
+side is "L" when the sibling sits on the left.
+"""
+
+import hashlib
+from typing import List, Sequence, Tuple
+
+ProofStep = Tuple[str, str]
+
+
+def leaf_hash(record_sha256: str) -> bytes:
+    return hashlib.sha256(b"\x00" + bytes.fromhex(record_sha256)).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _next_level(level: Sequence[bytes]) -> List[bytes]:
+    nxt = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        nxt.append(level[-1])
+    return nxt
+
+
+def merkle_root_of_leaves(leaves: Sequence[bytes]) -> bytes:
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    level = list(leaves)
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+def merkle_root(record_hashes: Sequence[str]) -> str:
+    """Hex Merkle root over record sha256 hex strings."""
+    return merkle_root_of_leaves([leaf_hash(h) for h in record_hashes]).hex()
+
+
+def merkle_proof_from_leaves(leaves: Sequence[bytes], index: int) -> List[ProofStep]:
+    if not 0 <= index < len(leaves):
+        raise IndexError("Merkle proof index out of range")
+    proof: List[ProofStep] = []
+    level = list(leaves)
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(("L" if sibling < index else "R", level[sibling].hex()))
+        level = _next_level(level)
+        index //= 2
+    return proof
+
+
+def merkle_proof(record_hashes: Sequence[str], index: int) -> List[ProofStep]:
+    """Inclusion proof for record_hashes[index]; O(log n) steps."""
+    return merkle_proof_from_leaves([leaf_hash(h) for h in record_hashes], index)
+
+
+def root_from_proof(leaf: bytes, proof: Sequence[ProofStep]) -> bytes:
+    node = leaf
+    for side, sibling_hex in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = node_hash(sibling, node) if side == "L" else node_hash(node, sibling)
+    return node
+
+
+def verify_proof(record_sha256: str, proof: Sequence[ProofStep], root_hex: str) -> bool:
+    return root_from_proof(leaf_hash(record_sha256), proof).hex() == root_hex
@@ -0,0 +1,229 @@
+"""
+casper.audit.verify
+===================
+
+Audit log verification for Casper_Fusion.
+
+- verify_log(): recompute every record hash, check chain links and Merkle
+  checkpoint roots; checkpoint blocks are verified in parallel processes
+- prove_inclusion() / verify_inclusion(): O(log n) proof that a single
+  tick's record is part of the log, without replaying the run
+
+A log root is the Merkle root over all checkpoint block roots, so a
+proof is a block-level path plus a checkpoint-level path.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from casper.audit.chain import GENESIS_SHA256, compute_sha256
+from casper.audit.log import (
+    CHECKPOINT_FILE,
+    Checkpoint,
+    iter_log_positions,
+    iter_records_from,
+    read_checkpoints,
+    segment_paths,
+    torn_tail,
+)
+from casper.audit.merkle import (
+    ProofStep,
+    leaf_hash,
+    merkle_proof_from_leaves,
+    merkle_root_of_leaves,
+    root_from_proof,
+)
+
+
+# ============================================================
+# RESULT MODELS
+# ============================================================
+
+@dataclass
+class BlockResult:
+    block: int
+    ok: bool
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class VerificationReport:
+    ok: bool
+    records: int
+    blocks: int
+    unchecked_records: int
+    log_root: str
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class InclusionProof:
+    tick: int
+    record_sha256: str
+    block: int
+    block_root: str
+    block_proof: List[ProofStep]
+    log_root: str
+    log_proof: List[ProofStep]
+
+
+# ============================================================
+# BLOCK VERIFICATION (runs in worker processes)
+# ============================================================
+
+def verify_block(directory: str, cp: Checkpoint) -> BlockResult:
+    """Verify one checkpoint block: hashes, internal chain links, Merkle root."""
+    errors: List[str] = []
+    prev = cp.prev_sha256
+    leaves = []
+    last_tick = None
+
+    for record in iter_records_from(directory, cp.segment, cp.offset, cp.count):
+        if compute_sha256(record) != record.sha256:
+            errors.append(f"tick {record.tick}: sha256 mismatch")
+        if record.prev_sha256 != prev:
+            errors.append(f"tick {record.tick}: chain break")
+        prev = record.sha256
+        last_tick = record.tick
+        leaves.append(leaf_hash(record.sha256))
+
+    if len(leaves) != cp.count:
+        errors.append(f"expected {cp.count} records, found {len(leaves)}")
+    if prev != cp.last_sha256 or last_tick != cp.last_tick:
+        errors.append("last record does not match checkpoint")
+    if merkle_root_of_leaves(leaves).hex() != cp.root:
+        errors.append("Merkle root mismatch")
+
+    return BlockResult(block=cp.block, ok=not errors, errors=[f"block {cp.block}: {e}" for e in errors])
+
+
+def _verify_block_args(args) -> BlockResult:
+    return verify_block(*args)
+
+
+def log_root(checkpoints: List[Checkpoint]) -> str:
+    return merkle_root_of_leaves([bytes.fromhex(cp.root) for cp in checkpoints]).hex()
+
+
+# ============================================================
+# LOG VERIFICATION
+# ============================================================
+
+def verify_log(directory: str, max_workers: Optional[int] = None) -> VerificationReport:
+    """
+    Verify a full audit log.
+
+    Blocks covered by checkpoints are checked in parallel; the checkpoint
+    sequence itself is checked for chain continuity, and any records after
+    the last checkpoint (e.g. after a crash) are checked serially.
+    Torn final lines (crash mid-write) are reported as errors and counted
+    in unchecked_records.
+    """
+    checkpoints = read_checkpoints(directory)
+    errors: List[str] = []
+
+    torn = 0
+    for path in segment_paths(directory) + [Path(directory) / CHECKPOINT_FILE]:
+        tail = torn_tail(path)
+        if tail is not None:
+            errors.append(f"{path.name}: torn final line at byte {tail[0]} ({tail[1]} bytes) ignored")
+            if path.name != CHECKPOINT_FILE:
+                torn += 1
+
+    prev = GENESIS_SHA256
+    for cp in checkpoints:
+        if cp.prev_sha256 != prev:
+            errors.append(f"block {cp.block}: does not chain to previous block")
+        prev = cp.last_sha256
+
+    workers = max_workers or os.cpu_count() or 1
+    jobs = [(directory, cp) for cp in checkpoints]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_verify_block_args, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    else:
+        results = [verify_block(*job) for job in jobs]
+
+    for res in results:
+        errors.extend(res.errors)
+
+    # Uncheckpointed tail
+    checked = sum(cp.count for cp in checkpoints)
+    tail_after = checkpoints[-1].last_sha256 if checkpoints else GENESIS_SHA256
+    in_tail = not checkpoints
+    tail = 0
+    total = 0
+    for _, _, record in iter_log_positions(directory):
+        total += 1
+        if in_tail:
+            tail += 1
+            if compute_sha256(record) != record.sha256:
+                errors.append(f"tick {record.tick}: sha256 mismatch")
+            if record.prev_sha256 != tail_after:
+                errors.append(f"tick {record.tick}: chain break")
+            tail_after = record.sha256
+        elif record.sha256 == tail_after:
+            in_tail = True
+
+    if total != checked + tail:
+        errors.append(f"log holds {total} records, checkpoints cover {checked} (+{tail} tail)")
+
+    return VerificationReport(
+        ok=not errors,
+        records=total,
+        blocks=len(checkpoints),
+        unchecked_records=tail + torn,
+        log_root=log_root(checkpoints),
+        errors=errors,
+    )
+
+
+# ============================================================
+# INCLUSION PROOFS
+# ============================================================
+
+def prove_inclusion(directory: str, tick: int) -> InclusionProof:
+    """
+    Build an inclusion proof for the record at `tick`.
+
+    Reads only the checkpoint file and the one block holding the tick.
+    """
+    checkpoints = read_checkpoints(directory)
+    cp = next((c for c in checkpoints if c.first_tick <= tick <= c.last_tick), None)
+    if cp is None:
+        raise KeyError(f"tick {tick} is not covered by a checkpoint")
+
+    records = list(iter_records_from(directory, cp.segment, cp.offset, cp.count))
+    index = next((i for i, r in enumerate(records) if r.tick == tick), None)
+    if index is None:
+        raise KeyError(f"tick {tick} not found in block {cp.block}")
+
+    leaves = [leaf_hash(r.sha256) for r in records]
+    block_roots = [bytes.fromhex(c.root) for c in checkpoints]
+    position = checkpoints.index(cp)
+
+    return InclusionProof(
+        tick=tick,
+        record_sha256=records[index].sha256,
+        block=cp.block,
+        block_root=cp.root,
+        block_proof=merkle_proof_from_leaves(leaves, index),
+        log_root=merkle_root_of_leaves(block_roots).hex(),
+        log_proof=merkle_proof_from_leaves(block_roots, position),
+    )
+
+
+def verify_inclusion(proof: InclusionProof, trusted_log_root: Optional[str] = None) -> bool:
+    """
+    Check a proof in O(log n). Pass `trusted_log_root` from an independent
+    source (e.g. a published run summary) to anchor it.
+    """
+    block_root = root_from_proof(leaf_hash(proof.record_sha256), proof.block_proof)
+    if block_root.hex() != proof.block_root:
+        return False
+    root = root_from_proof(block_root, proof.log_proof).hex()
+    expected = trusted_log_root if trusted_log_root is not None else proof.log_root
+    return root == expected
@@ -0,0 +1,665 @@
+"""
+casper.batch_engine
+===================
+
+Vectorized Monte Carlo execution for Casper_Fusion.
+
+BatchStepEngine advances N independent runs (one per seed) per tick,
+holding them as struct-of-arrays instead of N EngineState objects.
+
+Responsibilities:
+- draw per-run noise exactly as StepEngine does (same seeds, same order)
+- vectorized truth generation, sensor simulation, weighted fusion
+  and clarity/risk governance across all runs
+- record telemetry columns as (ticks, runs) arrays
+
+Results are bit-identical per seed to a fresh StepEngine driving a fresh
+EngineState with the "weighted" fusion strategy and the default sensor
+suite. Audit records are not produced; use StepEngine when hashes are
+required.
+
+No UI dependencies.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from casper.config import DEFAULT_SENSOR_SUITE, FusionConfig
+from casper.models import SystemState
+from casper.presets import AOConfig, EnvProfile, ENVELOPES, ENVIRONMENTS
+from casper.rng import BatchStream, TickStreams
+from casper.sensors.registry import build_suite
+
+
+SYSTEM_STATES: List[SystemState] = list(SystemState)
+
+# Telemetry columns recorded by BatchStepEngine ("state" holds SYSTEM_STATES codes).
+TELEMETRY_COLUMNS: List[str] = [
+    "mission_time_s",
+    "mach",
+    "velocity_mps",
+    "altitude_m",
+    "q_kpa",
+    "thermal_index",
+    "g_load",
+    "link_latency_ms",
+    "imu_drift_deg_s",
+    "lat",
+    "lon",
+    "threat_index",
+    "civ_density",
+    "nav_drift",
+    "comms_loss",
+    "vision_hot_ratio",
+    "clarity",
+    "risk",
+    "predicted_risk",
+    "state",
+    "envelope_pressure",
+    "cc_combined",
+    "cc_nav_conf",
+    "cc_comms_conf",
+    "cc_vision_conf",
+    "cc_clarity_factor",
+    "cc_threat_factor",
+    "fusion_conf",
+    "fusion_surprise",
+]
+
+
+# ============================================================
+# NOISE DRAW LAYOUT
+# ============================================================
+# One row of raw draws per (run, tick). Values are stored exactly as the
+# scalar simulator receives them from the generator, so every downstream
+# float operation can be replayed on arrays without changing a bit.
+
+_D_MACH, _D_ALT, _D_THERMAL, _D_LAT, _D_LON, _D_THREAT, _D_CIV, _D_HOT = range(8)
+_D_LINK_N, _D_LINK_U = 8, 9
+_D_IMU_N = 10
+_D_GNSS_U, _D_GNSS_Z, _D_GNSS_SPOOF, _D_GNSS_LAT = 11, 12, 15, 18
+_D_EOIR_U, _D_EOIR_Z, _D_EOIR_LAT = 19, 20, 23
+_D_RADAR_U, _D_RADAR_Z, _D_RADAR_LAT = 24, 25, 28
+_N_DRAWS = 29
+
+_GNSS_BASE_STD = np.array([0.00025, 0.00025, 3.5], dtype=float)
+_GNSS_JAM_STD = np.array([0.0012, 0.0012, 15.0], dtype=float)
+_EOIR_BASE_STD = np.array([0.0006, 0.0006, 8.0], dtype=float)
+_EOIR_DEGRADE_STD = np.array([0.0013, 0.0013, 20.0], dtype=float)
+_RADAR_STD = np.array([0.00045, 0.00045, 6.5], dtype=float)
+_SPOOF_STD = np.array([0.002, 0.002, 10.0], dtype=float)
+
+# Stream of each default-suite sensor, by type
+_STREAMS = {m.sensor_type.value: m.stream for m in build_suite(DEFAULT_SENSOR_SUITE)}
+
+# Fusion slot order matches FusionEngine.select_measurements (newest first).
+_SLOT_TYPES = ("RADAR", "EOIR", "GNSS")
+
+
+def _draw_tick(streams: TickStreams, env: EnvProfile, ao: AOConfig) -> np.ndarray:
+    """
+    Replay the generator calls of one StepEngine tick.
+
+    Must mirror StepEngine._generate_truth + the default sensor suite
+    (casper.sensors.registry) call for call, stream for stream. The
+    sequence depends only on (seed, tick, env, ao), never on prior
+    telemetry, which is what allows sharing rows between runs.
+    """
+    d = np.zeros(_N_DRAWS, dtype=float)
+
+    # Truth
+    rng = streams.get("truth")
+    d[_D_MACH] = rng.uniform(0.01, 0.05)
+    d[_D_ALT] = rng.uniform(50.0, 150.0)
+    d[_D_THERMAL] = rng.normal(0, 0.02)
+    d[_D_LAT] = rng.uniform(-ao.lat_delta, ao.lat_delta)
+    d[_D_LON] = rng.uniform(-ao.lon_delta, ao.lon_delta)
+    d[_D_THREAT] = rng.uniform(-5.0, 5.0)
+    d[_D_CIV] = rng.uniform(-0.05, 0.05)
+    d[_D_HOT] = rng.normal(0, 0.03)
+
+    # LINK
+    rng = streams.get(_STREAMS["LINK"])
+    d[_D_LINK_N] = rng.normal(0, env.latency_jitter)
+    d[_D_LINK_U] = rng.random()
+    link_latency = float(np.clip(env.latency_base + d[_D_LINK_N], 40, 800))
+    comms_loss = 1.0 if d[_D_LINK_U] < (0.02 + 0.08 * (link_latency / 600.0)) else 0.0
+
+    # IMU (drift, latency), BARO (altitude, latency)
+    rng = streams.get(_STREAMS["IMU"])
+    d[_D_IMU_N] = rng.normal(0, 0.01)
+    rng.normal(0, 8)
+    rng = streams.get(_STREAMS["BARO"])
+    rng.normal(0, 7.0)
+    rng.normal(0, 10)
+
+    # GNSS
+    rng = streams.get(_STREAMS["GNSS"])
+    d[_D_GNSS_U] = rng.random()
+    if d[_D_GNSS_U] < (0.02 + env.gnss_jam_factor * 0.25):
+        d[_D_GNSS_LAT] = rng.normal(0, 35)
+    else:
+        std = _GNSS_BASE_STD + _GNSS_JAM_STD * float(env.gnss_jam_factor)
+        d[_D_GNSS_Z:_D_GNSS_Z + 3] = rng.normal(0, std)
+        if rng.random() < float(env.gnss_jam_factor) * 0.15:
+            d[_D_GNSS_SPOOF:_D_GNSS_SPOOF + 3] = rng.normal(0, _SPOOF_STD)
+        d[_D_GNSS_LAT] = rng.normal(0, 25)
+
+    # EOIR
+    rng = streams.get(_STREAMS["EOIR"])
+    d[_D_EOIR_U] = rng.random()
+    if d[_D_EOIR_U] < (0.03 + float(env.eoir_degrade) * 0.22 + comms_loss * 0.15):
+        d[_D_EOIR_LAT] = rng.normal(0, 55)
+    else:
+        std = _EOIR_BASE_STD + _EOIR_DEGRADE_STD * float(env.eoir_degrade)
+        d[_D_EOIR_Z:_D_EOIR_Z + 3] = rng.normal(0, std)
+        rng.normal(0, 0.03)
+        d[_D_EOIR_LAT] = rng.normal(0, 45)
+
+    # RADAR (intermittent)
+    rng = streams.get(_STREAMS["RADAR"])
+    d[_D_RADAR_U] = rng.random()
+    if d[_D_RADAR_U] < 0.55:
+        d[_D_RADAR_Z:_D_RADAR_Z + 3] = rng.normal(0, _RADAR_STD)
+        d[_D_RADAR_LAT] = rng.normal(0, 35)
+
+    return d
+
+
+def _draw_ticks_keyed(seeds: np.ndarray, tick: int, env: EnvProfile, ao: AOConfig) -> np.ndarray:
+    """
+    _draw_tick for every seed at once under keyed streams: (n, _N_DRAWS).
+
+    Each stream is a BatchStream over all seeds, and every branch of the
+    scalar code becomes the set of rows that take it. Draws the scalar
+    code discards at the end of a stream (IMU latency, all of BARO) are
+    skipped; keyed streams make them unobservable. Rows that outrun a
+    stream's precomputed blocks are redrawn with _draw_tick.
+    """
+    n = len(seeds)
+    keys = np.asarray(seeds, dtype=np.int64).astype(np.uint64)
+    rows = np.arange(n)
+    d = np.zeros((n, _N_DRAWS), dtype=float)
+
+    # Truth
+    s = truth = BatchStream(keys, "truth", tick)
+    d[:, _D_MACH] = s.uniform(rows, 0.01, 0.05)
+    d[:, _D_ALT] = s.uniform(rows, 50.0, 150.0)
+    d[:, _D_THERMAL] = s.normal(rows, 0, 0.02)
+    d[:, _D_LAT] = s.uniform(rows, -ao.lat_delta, ao.lat_delta)
+    d[:, _D_LON] = s.uniform(rows, -ao.lon_delta, ao.lon_delta)
+    d[:, _D_THREAT] = s.uniform(rows, -5.0, 5.0)
+    d[:, _D_CIV] = s.uniform(rows, -0.05, 0.05)
+    d[:, _D_HOT] = s.normal(rows, 0, 0.03)
+
+    # LINK
+    s = link = BatchStream(keys, _STREAMS["LINK"], tick, blocks=1)
+    d[:, _D_LINK_N] = s.normal(rows, 0, env.latency_jitter)
+    d[:, _D_LINK_U] = s.random(rows)
+    link_latency = np.clip(env.latency_base + d[:, _D_LINK_N], 40, 800)
+    comms_loss = np.where(d[:, _D_LINK_U] < (0.02 + 0.08 * (link_latency / 600.0)), 1.0, 0.0)
+
+    # IMU drift (its latency draw and BARO are never read)
+    s = imu = BatchStream(keys, _STREAMS["IMU"], tick, blocks=1)
+    d[:, _D_IMU_N] = s.normal(rows, 0, 0.01)
+
+    # GNSS
+    s = gnss = BatchStream(keys, _STREAMS["GNSS"], tick, blocks=4)
+    d[:, _D_GNSS_U] = s.random(rows)
+    drop = d[:, _D_GNSS_U] < (0.02 + env.gnss_jam_factor * 0.25)
+    r = rows[drop]
+    d[r, _D_GNSS_LAT] = s.normal(r, 0, 35)
+    r = rows[~drop]
+    d[r, _D_GNSS_Z:_D_GNSS_Z + 3] = s.normal_vector(r, 0, _GNSS_BASE_STD + _GNSS_JAM_STD * float(env.gnss_jam_factor))
+    spoof = r[s.random(r) < float(env.gnss_jam_factor) * 0.15]
+    d[spoof, _D_GNSS_SPOOF:_D_GNSS_SPOOF + 3] = s.normal_vector(spoof, 0, _SPOOF_STD)
+    d[r, _D_GNSS_LAT] = s.normal(r, 0, 25)
+
+    # EOIR
+    s = eoir = BatchStream(keys, _STREAMS["EOIR"], tick)
+    d[:, _D_EOIR_U] = s.random(rows)
+    drop = d[:, _D_EOIR_U] < (0.03 + float(env.eoir_degrade) * 0.22 + comms_loss * 0.15)
+    r = rows[drop]
+    d[r, _D_EOIR_LAT] = s.normal(r, 0, 55)
+    r = rows[~drop]
+    d[r, _D_EOIR_Z:_D_EOIR_Z + 3] = s.normal_vector(r, 0, _EOIR_BASE_STD + _EOIR_DEGRADE_STD * float(env.eoir_degrade))
+    s.normal(r, 0, 0.03)
+    d[r, _D_EOIR_LAT] = s.normal(r, 0, 45)
+
+    # RADAR (intermittent)
+    s = radar = BatchStream(keys, _STREAMS["RADAR"], tick, blocks=2)
+    d[:, _D_RADAR_U] = s.random(rows)
+    r = rows[d[:, _D_RADAR_U] < 0.55]
+    d[r, _D_RADAR_Z:_D_RADAR_Z + 3] = s.normal_vector(r, 0, _RADAR_STD)
+    d[r, _D_RADAR_LAT] = s.normal(r, 0, 35)
+
+    overflow = truth.overflow | link.overflow | imu.overflow | gnss.overflow | eoir.overflow | radar.overflow
+    if overflow.any():
+        streams = TickStreams("keyed")
+        for i in np.flatnonzero(overflow):
+            d[i] = _draw_tick(streams.begin(int(seeds[i]), tick), env, ao)
+    return d
+
+
+def _cov_trace(std: np.ndarray) -> float:
+    """np.trace of the diagonal covariance the simulator emits."""
+    return float(np.trace(np.diag(std**2).astype(float)))
+
+
+# ============================================================
+# BATCH STATE / RESULT
+# ============================================================
+
+@dataclass
+class BatchState:
+    """
+    Struct-of-arrays runtime state for N runs sharing one scenario.
+    """
+    seeds: np.ndarray
+    ao: AOConfig
+    env_name: str = "Clear Skies / Clean Link"
+    envelope_name: str = "Nominal Demo Flight"
+
+    tick: int = 0
+    mission_time_s: Optional[np.ndarray] = None
+    clarity_ema: Optional[np.ndarray] = None
+
+    # Previous-tick telemetry consumed by truth generation
+    last_mach: Optional[np.ndarray] = None
+    last_altitude_m: Optional[np.ndarray] = None
+    last_threat_index: Optional[np.ndarray] = None
+    last_civ_density: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        self.seeds = np.asarray(self.seeds, dtype=np.int64)
+        n = len(self.seeds)
+        defaults = {
+            "mission_time_s": 0.0,
+            "clarity_ema": 0.9,
+            "last_mach": 0.0,
+            "last_altitude_m": 0.0,
+            "last_threat_index": 40.0,
+            "last_civ_density": 0.3,
+        }
+        for name, value in defaults.items():
+            if getattr(self, name) is None:
+                setattr(self, name, np.full(n, value, dtype=float))
+
+    @property
+    def size(self) -> int:
+        return int(len(self.seeds))
+
+
+@dataclass
+class BatchResult:
+    """
+    Recorded telemetry columns, each shaped (ticks, runs).
+    """
+    seeds: np.ndarray
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def run(self, index: int) -> Dict[str, np.ndarray]:
+        """All recorded columns for one run, shaped (ticks,)."""
+        return {k: v[:, index] for k, v in self.columns.items()}
+
+    def states(self) -> np.ndarray:
+        """SystemState labels (ticks, runs) as an object array."""
+        return np.array(SYSTEM_STATES, dtype=object)[self.columns["state"]]
+
+
+# ============================================================
+# BATCH ENGINE
+# ============================================================
+
+class BatchStepEngine:
+    """
+    Advance many seeded runs per tick with array operations.
+
+    With "sequential" streams StepEngine seeds tick t of seed s with
+    (s + t + 1), so draw rows are generated per key by the scalar
+    generator, cached and reused by every run that reaches it (contiguous
+    seed ranges share almost all of them). Keyed streams never collide
+    across runs, so each tick's rows are drawn for all seeds at once
+    with casper.rng.BatchStream; only ziggurat rejections and the rare
+    row that outruns its precomputed Philox blocks fall back to numpy.
+    Keyed mode is still about 3-4x slower than sequential.
+    """
+
+    def __init__(self, config: FusionConfig):
+        if config.dt_seconds * 1000.0 <= config.fusion_time_gate_ms:
+            raise ValueError(
+                "BatchStepEngine requires dt_seconds * 1000 > fusion_time_gate_ms "
+                "(fusion must only see the current tick's measurements)."
+            )
+        if config.sensor_suite != DEFAULT_SENSOR_SUITE:
+            raise ValueError("BatchStepEngine only replays the default sensor suite; use StepEngine for custom suites.")
+        self.config = config
+        self._draw_cache: Dict[int, np.ndarray] = {}
+        self._streams = TickStreams(config.rng_streams)
+
+    # --------------------------------------------------
+    # Draws
+    # --------------------------------------------------
+    def _draws(self, batch: BatchState, env: EnvProfile) -> np.ndarray:
+        streams, tick = self._streams, batch.tick + 1
+        if streams.mode == "keyed":
+            return _draw_ticks_keyed(batch.seeds, tick, env, batch.ao)
+
+        keys = (batch.seeds + tick).tolist()
+        cache = self._draw_cache
+        rows = []
+        for key in keys:
+            row = cache.get(key)
+            if row is None:
+                row = _draw_tick(streams.begin(key, 0), env, batch.ao)
+                cache[key] = row
+            rows.append(row)
+
+        # Keys only grow with the tick; drop the ones no run can reach again.
+        floor = min(keys)
+        for key in [k for k in cache if k < floor]:
+            del cache[key]
+
+        return np.stack(rows, axis=0)
+
+    # --------------------------------------------------
+    # Truth generation (vectorized _generate_truth)
+    # --------------------------------------------------
+    def _generate_truth(self, batch: BatchState, env: EnvProfile, d: np.ndarray) -> Dict[str, np.ndarray]:
+        envelope = ENVELOPES[batch.envelope_name]
+
+        mach = np.clip(batch.last_mach + d[:, _D_MACH], 0.0, envelope.max_mach)
+        alt = np.clip(batch.last_altitude_m + d[:, _D_ALT], 0.0, 18000.0)
+        vel = mach * 295.0
+
+        # exp and **2 stay on Python floats: numpy's SIMD exp and square
+        # differ from libm in the last ulp.
+        q = np.array(
+            [
+                0.5 * (1.225 * math.exp(-a / 8000.0)) * v**2 / 1000.0
+                for a, v in zip(alt.tolist(), vel.tolist())
+            ],
+            dtype=float,
+        )
+        q = np.clip(q, 0.0, 900.0)
+
+        thermal = np.clip(
+            0.2 + 0.5 * (mach / envelope.max_mach) + env.thermal_bias + d[:, _D_THERMAL],
+            0.0,
+            1.0,
+        )
+
+        return {
+            "mach": mach,
+            "velocity_mps": vel,
+            "altitude_m": alt,
+            "q_kpa": q,
+            "thermal_index": thermal,
+            "lat": batch.ao.base_lat + d[:, _D_LAT],
+            "lon": batch.ao.base_lon + d[:, _D_LON],
+            "threat_index": np.clip(batch.last_threat_index + d[:, _D_THREAT], 0.0, 100.0),
+            "civ_density": np.clip(batch.last_civ_density + d[:, _D_CIV], 0.0, 1.0),
+            "vision_hot_ratio": np.clip(0.10 + d[:, _D_HOT], 0.0, 1.0),
+        }
+
+    # --------------------------------------------------
+    # Sensors (vectorized simulate_all)
+    # --------------------------------------------------
+    def _simulate_sensors(self, env: EnvProfile, truth: Dict[str, np.ndarray], d: np.ndarray) -> Dict[str, np.ndarray]:
+        n = d.shape[0]
+
+        link_latency = np.clip(env.latency_base + d[:, _D_LINK_N], 40, 800)
+        comms_loss = np.where(d[:, _D_LINK_U] < (0.02 + 0.08 * (link_latency / 600.0)), 1.0, 0.0)
+        link_quality = np.clip(1.0 - link_latency / 900.0, 0.1, 1.0)
+
+        imu_drift = np.clip(0.02 + env.imu_drift_bias + np.abs(d[:, _D_IMU_N]), 0.005, 0.12)
+
+        z_true = np.stack([truth["lat"], truth["lon"], truth["altitude_m"]], axis=1)
+
+        gnss_ok = ~(d[:, _D_GNSS_U] < (0.02 + env.gnss_jam_factor * 0.25))
+        gnss_z = z_true + d[:, _D_GNSS_Z:_D_GNSS_Z + 3] + d[:, _D_GNSS_SPOOF:_D_GNSS_SPOOF + 3]
+        gnss_quality = float(np.clip(0.95 - float(env.gnss_jam_factor) * 0.6, 0.15, 0.95))
+        gnss_latency = np.clip(90 + d[:, _D_GNSS_LAT], 40, 220)
+
+        eoir_ok = ~(d[:, _D_EOIR_U] < (0.03 + float(env.eoir_degrade) * 0.22 + comms_loss * 0.15))
+        eoir_z = z_true + d[:, _D_EOIR_Z:_D_EOIR_Z + 3]
+        eoir_quality = np.where(
+            eoir_ok,
+            np.clip(0.82 - float(env.eoir_degrade) * 0.55 - comms_loss * 0.2, 0.1, 0.85),
+            0.0,
+        )
+        eoir_latency = np.clip(140 + d[:, _D_EOIR_LAT], 60, 320)
+
+        radar_ok = d[:, _D_RADAR_U] < 0.55
+        radar_z = z_true + d[:, _D_RADAR_Z:_D_RADAR_Z + 3]
+        radar_latency = np.clip(110 + d[:, _D_RADAR_LAT], 50, 280)
+
+        # Fusion slots: (runs, 3 slots, ...)
+        gnss_std = _GNSS_BASE_STD + _GNSS_JAM_STD * float(env.gnss_jam_factor)
+        eoir_std = _EOIR_BASE_STD + _EOIR_DEGRADE_STD * float(env.eoir_degrade)
+
+        return {
+            "link_latency_ms": link_latency,
+            "comms_loss": comms_loss,
+            "link_quality": link_quality,
+            "imu_drift_deg_s": imu_drift,
+            "eoir_quality": eoir_quality,
+            "present": np.stack([radar_ok, eoir_ok, gnss_ok], axis=1),
+            "z": np.stack([radar_z, eoir_z, gnss_z], axis=1),
+            "latency_ms": np.stack([radar_latency, eoir_latency, gnss_latency], axis=1),
+            "quality": np.stack(
+                [np.full(n, 0.75), np.clip(eoir_quality, 0.0, 1.0), np.full(n, gnss_quality)],
+                axis=1,
+            ),
+            "cov_trace": np.array([_cov_trace(_RADAR_STD), _cov_trace(eoir_std), _cov_trace(gnss_std)]),
+        }
+
+    # --------------------------------------------------
+    # Fusion (vectorized WeightedFusion.fuse)
+    # --------------------------------------------------
+    def _fuse(self, sensors: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        # Fusion time gate (FusionEngine.select_measurements): the history
+        # is walked newest first (RADAR, EOIR, GNSS) and the walk ends at the
+        # first live measurement outside the gate. Current-tick age is the
+        # latency itself; older ticks are outside the gate (see __init__).
+        gate_ms = float(self.config.fusion_time_gate_ms)
+        outside = sensors["present"] & ~(sensors["latency_ms"] <= gate_ms)
+        present = sensors["present"] & ~(np.cumsum(outside, axis=1) > 0)
+        Z = sensors["z"]
+        n = present.shape[0]
+        count = present.sum(axis=1)
+
+        cov_term = 1.0 / np.maximum(sensors["cov_trace"], 1e-9)
+        type_weight = np.array(
+            [self.config.position_fusion_weight.get(t, 0.5) for t in _SLOT_TYPES]
+        )
+        latency_term = 1.0 / (1.0 + (sensors["latency_ms"] / 200.0))
+        w = np.maximum(0.0, cov_term[None, :] * latency_term * sensors["quality"] * type_weight[None, :])
+        w = np.where(present, w, 0.0)
+
+        # Slot-ordered sequential sums (absent slots add an exact 0.0).
+        w_sum = (w[:, 0] + w[:, 1]) + w[:, 2]
+        degenerate = w_sum <= 1e-12
+        safe_count = np.maximum(count, 1)
+        w = np.where(
+            degenerate[:, None],
+            np.where(present, 1.0 / safe_count[:, None], 0.0),
+            w / np.where(degenerate, 1.0, w_sum)[:, None],
+        )
+
+        Zw = np.where(present[:, :, None], Z * w[:, :, None], 0.0)
+        fused = (Zw[:, 0] + Zw[:, 1]) + Zw[:, 2]
+
+        # Confidence: compact present slots to the front, then reproduce
+        # numpy's reduction order for 6 (sequential) or 9 (pairwise) terms.
+        order = np.argsort(~present, axis=1, kind="stable")
+        Zc = np.take_along_axis(Z, order[:, :, None], axis=1)
+        wc = np.take_along_axis(w, order, axis=1)
+        scale = np.array([1e-3, 1e-3, 10.0], dtype=float)
+        terms = (wc[:, :, None] * ((Zc - fused[:, None, :]) / scale[None, None, :]) ** 2).reshape(n, 9)
+
+        seq6 = terms[:, 0]
+        for i in range(1, 6):
+            seq6 = seq6 + terms[:, i]
+        t = terms
+        pair9 = (((t[:, 0] + t[:, 1]) + (t[:, 2] + t[:, 3])) + ((t[:, 4] + t[:, 5]) + (t[:, 6] + t[:, 7]))) + t[:, 8]
+
+        dispersion = np.sqrt(np.where(count == 3, pair9, np.where(count == 2, seq6, 0.0)))
+        surprise = np.clip(dispersion / 2.0, 0.0, 1.0)
+        fusion_conf = np.clip(1.0 - surprise, 0.0, 1.0)
+
+        single = count < 2
+        fusion_conf = np.where(single, 0.5, fusion_conf)
+        surprise = np.where(single, 0.5, surprise)
+
+        # Fallback when no position sensor survived
+        none = count == 0
+        return {
+            "lat": np.where(none, 0.0, fused[:, 0]),
+            "lon": np.where(none, 0.0, fused[:, 1]),
+            "altitude_m": np.where(none, 0.0, fused[:, 2]),
+            "fusion_conf": np.where(none, 0.1, fusion_conf),
+            "surprise": np.where(none, 1.0, surprise),
+        }
+
+    # --------------------------------------------------
+    # Governance (vectorized ClarityRiskCalculator.compute)
+    # --------------------------------------------------
+    def _govern(self, batch: BatchState, truth: Dict[str, np.ndarray], fused: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        envp = ENVELOPES[batch.envelope_name]
+
+        q_u = np.clip(truth["q_kpa"] / envp.max_q_kpa, 0, 1.6)
+        t_u = np.clip(truth["thermal_index"] / envp.max_thermal_index, 0, 1.8)
+        threat_u = np.clip(truth["threat_index"] / 100.0, 0, 1.0)
+
+        pressure = 0.6 * q_u + 0.4 * t_u
+        fusion_conf = fused["fusion_conf"]
+        surprise = fused["surprise"]
+
+        raw = np.clip(1.0 - pressure - 0.3 * threat_u, 0.55, 1.0)
+        raw = raw * np.clip(0.70 + 0.30 * fusion_conf, 0.0, 1.0)
+        raw = raw * np.clip(1.0 - 0.30 * surprise, 0.0, 1.0)
+
+        batch.clarity_ema = 0.15 * raw + 0.85 * batch.clarity_ema
+        clarity = batch.clarity_ema * 100.0
+
+        risk = np.clip(
+            pressure * 60.0
+            + (100.0 - clarity) * 0.45
+            + (1.0 - fusion_conf) * 18.0
+            + surprise * 14.0,
+            0.0,
+            100.0,
+        )
+        pred = np.clip(risk + 8.0 * (pressure - 0.8), 0.0, 100.0)
+
+        codes = np.full(batch.size, SYSTEM_STATES.index(SystemState.CRITICAL), dtype=np.int8)
+        codes[clarity >= 65] = SYSTEM_STATES.index(SystemState.HIGH_RISK)
+        codes[clarity >= 80] = SYSTEM_STATES.index(SystemState.TENSE)
+        codes[(clarity >= 90) & (risk < 30)] = SYSTEM_STATES.index(SystemState.STABLE)
+
+        return {
+            "clarity": clarity,
+            "risk": risk,
+            "predicted_risk": pred,
+            "state": codes,
+            "envelope_pressure": pressure,
+        }
+
+    # --------------------------------------------------
+    # Main step
+    # --------------------------------------------------
+    def step(self, batch: BatchState) -> Dict[str, np.ndarray]:
+        """
+        Advance every run by one tick and return its telemetry columns.
+        """
+        env = ENVIRONMENTS[batch.env_name]
+        d = self._draws(batch, env)
+
+        truth = self._generate_truth(batch, env, d)
+        sensors = self._simulate_sensors(env, truth, d)
+        fused = self._fuse(sensors)
+        gov = self._govern(batch, truth, fused)
+
+        n = batch.size
+        clarity = gov["clarity"]
+        tel = {
+            "mission_time_s": batch.mission_time_s + self.config.dt_seconds,
+            "mach": truth["mach"],
+            "velocity_mps": truth["velocity_mps"],
+            "altitude_m": fused["altitude_m"],
+            "q_kpa": truth["q_kpa"],
+            "thermal_index": truth["thermal_index"],
+            "g_load": np.full(n, 1.0),
+            "link_latency_ms": sensors["link_latency_ms"],
+            "imu_drift_deg_s": sensors["imu_drift_deg_s"],
+            "lat": fused["lat"],
+            "lon": fused["lon"],
+            "threat_index": truth["threat_index"],
+            "civ_density": truth["civ_density"],
+            "nav_drift": np.full(n, 5.0),
+            "comms_loss": sensors["comms_loss"],
+            "vision_hot_ratio": truth["vision_hot_ratio"],
+            "clarity": clarity,
+            "risk": gov["risk"],
+            "predicted_risk": gov["predicted_risk"],
+            "state": gov["state"],
+            "envelope_pressure": gov["envelope_pressure"],
+            "cc_combined": clarity / 100.0,
+            "cc_nav_conf": fused["fusion_conf"],
+            "cc_comms_conf": sensors["link_quality"],
+            "cc_vision_conf": sensors["eoir_quality"],
+            "cc_clarity_factor": clarity / 100.0,
+            "cc_threat_factor": np.maximum(0.2, 1.0 - truth["threat_index"] / 150.0),
+            "fusion_conf": fused["fusion_conf"],
+            "fusion_surprise": fused["surprise"],
+        }
+
+        batch.tick += 1
+        batch.mission_time_s = tel["mission_time_s"]
+        batch.last_mach = truth["mach"]
+        batch.last_altitude_m = fused["altitude_m"]
+        batch.last_threat_index = truth["threat_index"]
+        batch.last_civ_density = truth["civ_density"]
+
+        return tel
+
+    def run(
+        self,
+        seeds: Sequence[int],
+        ticks: int,
+        ao: AOConfig,
+        env_name: str = "Clear Skies / Clean Link",
+        envelope_name: str = "Nominal Demo Flight",
+        fields: Optional[Sequence[str]] = None,
+    ) -> BatchResult:
+        """
+        Run all seeds for `ticks` ticks and record the requested columns.
+
+        Pass a subset of TELEMETRY_COLUMNS as `fields` to bound memory on
+        large sweeps (ticks * runs * 8 bytes per column).
+        """
+        names = list(fields) if fields is not None else list(TELEMETRY_COLUMNS)
+        unknown = set(names) - set(TELEMETRY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown telemetry columns: {sorted(unknown)}")
+
+        batch = BatchState(seeds=np.asarray(seeds), ao=ao, env_name=env_name, envelope_name=envelope_name)
+        self._draw_cache.clear()
+
+        columns = {
+            name: np.empty((ticks, batch.size), dtype=np.int8 if name == "state" else float)
+            for name in names
+        }
+        for t in range(ticks):
+            tel = self.step(batch)
+            for name in names:
+                columns[name][t] = tel[name]
+
+        return BatchResult(seeds=batch.seeds.copy(), columns=columns)
@@ -0,0 +1,420 @@
+"""
+casper.buffers
+==============
+
+Preallocated columnar ring buffers for Casper_Fusion history.
+
+MeasurementBuffer stores SensorMeasurement fields as NumPy columns:
+- tick, sensor id code, sensor type code
+- z[3], R[3x3]
+- quality, latency_ms, dropped
+- utc_timestamp / meta as object references
+
+It is a drop-in for the former Deque[SensorMeasurement]: append/extend,
+len, iteration and indexing still work, yielding MeasurementRecord views
+materialized on demand (view.to_model() gives a validated SensorMeasurement).
+
+TelemetryBuffer stores every Telemetry field as a NumPy column (enums as
+small-int codes, strings as object references). Each row is written twice,
+at slot i and i + maxlen, so the newest k rows are always one contiguous
+slice: window(k) / column(name, k) return views, not copies. Indexing and
+iteration yield TelemetryRecord views like the former Deque[Telemetry].
+
+No UI dependencies.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from casper.models import (
+    Measurement,
+    MeasurementRecord,
+    SensorType,
+    SystemState,
+    Telemetry,
+    TelemetryRecord,
+)
+
+
+SENSOR_TYPES: List[SensorType] = list(SensorType)
+_TYPE_CODES: Dict[SensorType, int] = {t: i for i, t in enumerate(SENSOR_TYPES)}
+
+
+class MeasurementBuffer:
+    """
+    Fixed-capacity ring buffer of sensor measurements (oldest evicted first).
+    """
+
+    # Rows scanned per chunk when walking back from the newest entry.
+    _SCAN_CHUNK = 64
+
+    def __init__(self, maxlen: int, measurements: Optional[Iterable[Measurement]] = None):
+        self.maxlen = int(maxlen)
+        cap = max(self.maxlen, 1)
+
+        self.tick = np.zeros(cap, dtype=np.int64)
+        self.sensor_code = np.zeros(cap, dtype=np.int32)
+        self.type_code = np.zeros(cap, dtype=np.int8)
+        self.z = np.zeros((cap, 3), dtype=np.float64)
+        self.R = np.zeros((cap, 3, 3), dtype=np.float64)
+        self.quality = np.zeros(cap, dtype=np.float64)
+        self.latency_ms = np.zeros(cap, dtype=np.float64)
+        self.dropped = np.zeros(cap, dtype=bool)
+        self.utc_timestamp = np.empty(cap, dtype=object)
+        self.meta = np.empty(cap, dtype=object)
+
+        self.sensor_ids: List[str] = []
+        self._sensor_codes: Dict[str, int] = {}
+
+        self._head = 0  # next write slot
+        self._size = 0
+
+        if measurements is not None:
+            self.extend(measurements)
+
+    # --------------------------------------------------
+    # Container protocol
+    # --------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[MeasurementRecord]:
+        for slot in self.slots():
+            yield self.view(int(slot))
+
+    def __reversed__(self) -> Iterator[MeasurementRecord]:
+        for slot in self.slots()[::-1]:
+            yield self.view(int(slot))
+
+    def __getitem__(self, index: int) -> MeasurementRecord:
+        return self.view(self._slot(index))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the preallocated columns (excluding referenced objects)."""
+        return sum(
+            a.nbytes for a in (
+                self.tick, self.sensor_code, self.type_code, self.z, self.R,
+                self.quality, self.latency_ms, self.dropped, self.utc_timestamp, self.meta,
+            )
+        )
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def sensor_code_for(self, sensor_id: str) -> int:
+        code = self._sensor_codes.get(sensor_id)
+        if code is None:
+            code = len(self.sensor_ids)
+            self.sensor_ids.append(sensor_id)
+            self._sensor_codes[sensor_id] = code
+        return code
+
+    def append(self, m: Measurement) -> None:
+        if self.maxlen <= 0:
+            return
+
+        z = np.asarray(m.z, dtype=np.float64)
+        R = np.asarray(m.R, dtype=np.float64)
+        if z.shape != (3,) or R.shape != (3, 3):
+            raise ValueError(
+                f"MeasurementBuffer expects z[3] and R[3x3], got {z.shape} and {R.shape}"
+            )
+
+        i = self._head
+        self.tick[i] = m.tick
+        self.sensor_code[i] = self.sensor_code_for(m.sensor_id)
+        self.type_code[i] = _TYPE_CODES[m.sensor_type]
+        self.z[i] = z
+        self.R[i] = R
+        self.quality[i] = m.quality
+        self.latency_ms[i] = m.latency_ms
+        self.dropped[i] = m.dropped
+        self.utc_timestamp[i] = m.utc_timestamp
+        self.meta[i] = m.meta
+
+        self._head = (i + 1) % self.maxlen
+        self._size = min(self._size + 1, self.maxlen)
+
+    def extend(self, measurements: Iterable[Measurement]) -> None:
+        for m in measurements:
+            self.append(m)
+
+    def append_columns(
+        self,
+        tick: int,
+        utc_timestamp: str,
+        sensor_ids: List[str],
+        sensor_type: SensorType,
+        z: np.ndarray,
+        R: np.ndarray,
+        quality: np.ndarray,
+        latency_ms: np.ndarray,
+        dropped: np.ndarray,
+        meta: List[Dict[str, Any]],
+    ) -> None:
+        """Append n measurements of one tick and sensor type with one write per column."""
+        n = len(sensor_ids)
+        if self.maxlen <= 0 or n == 0:
+            return
+        if n > self.maxlen:
+            keep = slice(n - self.maxlen, n)
+            sensor_ids, z, R, quality, latency_ms, dropped, meta = (
+                sensor_ids[keep], z[keep], R[keep], quality[keep], latency_ms[keep], dropped[keep], meta[keep]
+            )
+            n = self.maxlen
+
+        i = self._head
+        slots = slice(i, i + n) if i + n <= self.maxlen else (i + np.arange(n)) % self.maxlen
+        self.tick[slots] = tick
+        self.sensor_code[slots] = [self.sensor_code_for(s) for s in sensor_ids]
+        self.type_code[slots] = _TYPE_CODES[sensor_type]
+        self.z[slots] = z
+        self.R[slots] = R
+        self.quality[slots] = quality
+        self.latency_ms[slots] = latency_ms
+        self.dropped[slots] = dropped
+        self.utc_timestamp[slots] = utc_timestamp
+        self.meta[slots] = meta
+
+        self._head = (i + n) % self.maxlen
+        self._size = min(self._size + n, self.maxlen)
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+        self.utc_timestamp[:] = None
+        self.meta[:] = None
+
+    # --------------------------------------------------
+    # Reads
+    # --------------------------------------------------
+    def slots(self, n: Optional[int] = None) -> np.ndarray:
+        """Storage slots of the newest `n` rows (all if None), oldest first."""
+        k = self._size if n is None else max(0, min(int(n), self._size))
+        start = (self._head - k) % max(self.maxlen, 1)
+        return (start + np.arange(k)) % max(self.maxlen, 1)
+
+    def trailing_count(self, tick: int) -> int:
+        """Number of newest rows stamped with `tick` (rows of the latest step)."""
+        count = 0
+        while count < self._size and self.tick[(self._head - 1 - count) % self.maxlen] == tick:
+            count += 1
+        return count
+
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("MeasurementBuffer index out of range")
+        return (self._head - self._size + index) % self.maxlen
+
+    def view(self, slot: int) -> MeasurementRecord:
+        """
+        Materialize one storage slot as a MeasurementRecord.
+
+        Arrays are copied; the slot may be overwritten later.
+        """
+        return MeasurementRecord(
+            tick=int(self.tick[slot]),
+            utc_timestamp=self.utc_timestamp[slot],
+            sensor_id=self.sensor_ids[self.sensor_code[slot]],
+            sensor_type=SENSOR_TYPES[self.type_code[slot]],
+            z=self.z[slot].copy(),
+            R=self.R[slot].copy(),
+            quality=float(self.quality[slot]),
+            latency_ms=float(self.latency_ms[slot]),
+            dropped=bool(self.dropped[slot]),
+            meta=self.meta[slot],
+        )
+
+    def materialize(self, slots: Iterable[int]) -> List[MeasurementRecord]:
+        return [self.view(int(s)) for s in slots]
+
+    def select_recent(self, current_tick: int, dt_seconds: float, gate_ms: float) -> np.ndarray:
+        """
+        Storage slots passing the fusion time gate, most recent first.
+
+        Same semantics as walking the history newest-to-oldest: dropped
+        entries are skipped, and the walk stops at the first non-dropped
+        entry whose age exceeds the gate. Scans in chunks so the cost
+        tracks the number of selected rows, not the buffer size.
+        """
+        if self._size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        selected = []
+
+        for start in range(0, self._size, self._SCAN_CHUNK):
+            offsets = np.arange(start, min(start + self._SCAN_CHUNK, self._size))
+            slots = (self._head - 1 - offsets) % self.maxlen
+            live = slots[~self.dropped[slots]]
+            if live.size == 0:
+                continue
+
+            tick_delta = current_tick - self.tick[live]
+            age_ms = np.abs((tick_delta * dt_seconds * 1000.0) + self.latency_ms[live])
+            outside = np.flatnonzero(~(age_ms <= gate_ms))
+
+            if outside.size:
+                selected.append(live[:outside[0]])
+                break
+            selected.append(live)
+
+        if not selected:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(selected)
+
+
+# ============================================================
+# TELEMETRY
+# ============================================================
+
+SYSTEM_STATES: List[SystemState] = list(SystemState)
+_STATE_CODES: Dict[SystemState, int] = {t: i for i, t in enumerate(SYSTEM_STATES)}
+
+# Telemetry fields grouped by storage: each group is one 2-D block so a
+# row is written / read with a single NumPy call.
+TELEMETRY_FIELDS: List[str] = list(Telemetry.model_fields)
+_FLOAT_FIELDS = [n for n, f in Telemetry.model_fields.items() if f.annotation is float]
+_INT_FIELDS = [n for n, f in Telemetry.model_fields.items() if f.annotation is int]
+_OBJECT_FIELDS = [n for n in TELEMETRY_FIELDS if n not in _FLOAT_FIELDS and n not in _INT_FIELDS and n != "state"]
+
+
+class TelemetryBuffer:
+    """
+    Fixed-capacity ring buffer of per-tick telemetry (oldest evicted first).
+    """
+
+    def __init__(self, maxlen: int, items: Optional[Iterable[Union[Telemetry, TelemetryRecord]]] = None):
+        self.maxlen = int(maxlen)
+        rows = 2 * max(self.maxlen, 1)  # mirror layout: row i stored at i and i + maxlen
+
+        self.floats = np.zeros((rows, len(_FLOAT_FIELDS)), dtype=np.float64)
+        self.ints = np.zeros((rows, len(_INT_FIELDS)), dtype=np.int64)
+        self.state_code = np.zeros(rows, dtype=np.int8)
+        self.objects = np.empty((rows, len(_OBJECT_FIELDS)), dtype=object)
+
+        self._columns: Dict[str, np.ndarray] = {"state": self.state_code}
+        for block, names in ((self.floats, _FLOAT_FIELDS), (self.ints, _INT_FIELDS), (self.objects, _OBJECT_FIELDS)):
+            for k, name in enumerate(names):
+                self._columns[name] = block[:, k]
+
+        self._head = 0  # next write slot, in [0, maxlen)
+        self._size = 0
+
+        if items is not None:
+            self.extend(items)
+
+    # --------------------------------------------------
+    # Container protocol
+    # --------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[TelemetryRecord]:
+        for index in range(self._size):
+            yield self.view(self._slot(index))
+
+    def __reversed__(self) -> Iterator[TelemetryRecord]:
+        for index in range(self._size - 1, -1, -1):
+            yield self.view(self._slot(index))
+
+    def __getitem__(self, index: int) -> TelemetryRecord:
+        return self.view(self._slot(index))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the preallocated columns (excluding referenced objects)."""
+        return self.floats.nbytes + self.ints.nbytes + self.state_code.nbytes + self.objects.nbytes
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def append(self, tel: Union[Telemetry, TelemetryRecord]) -> None:
+        if self.maxlen <= 0:
+            return
+
+        floats = [getattr(tel, n) for n in _FLOAT_FIELDS]
+        ints = [getattr(tel, n) for n in _INT_FIELDS]
+        objects = [getattr(tel, n) for n in _OBJECT_FIELDS]
+        code = _STATE_CODES[tel.state]
+
+        for i in (self._head, self._head + self.maxlen):
+            self.floats[i] = floats
+            self.ints[i] = ints
+            self.objects[i] = objects
+            self.state_code[i] = code
+
+        self._head = (self._head + 1) % self.maxlen
+        self._size = min(self._size + 1, self.maxlen)
+
+    def extend(self, items: Iterable[Union[Telemetry, TelemetryRecord]]) -> None:
+        for tel in items:
+            self.append(tel)
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+        self.objects[:] = None
+
+    # --------------------------------------------------
+    # Reads
+    # --------------------------------------------------
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("TelemetryBuffer index out of range")
+        return (self._head - self._size + index) % self.maxlen
+
+    def _window_slice(self, n: Optional[int]) -> slice:
+        k = self._size if n is None else max(0, min(int(n), self._size))
+        end = self._head + self.maxlen if self.maxlen > 0 else 0
+        return slice(end - k, end)
+
+    def view(self, slot: int) -> TelemetryRecord:
+        """Materialize one storage slot as a TelemetryRecord (values copied)."""
+        values: Dict[str, Any] = dict(zip(_FLOAT_FIELDS, self.floats[slot].tolist()))
+        values.update(zip(_INT_FIELDS, self.ints[slot].tolist()))
+        values.update(zip(_OBJECT_FIELDS, self.objects[slot].tolist()))
+        values["state"] = SYSTEM_STATES[self.state_code[slot]]
+        return TelemetryRecord(**values)
+
+    def last(self, name: str) -> Any:
+        """Newest value of one field (no record materialization)."""
+        if not self._size:
+            raise IndexError("TelemetryBuffer is empty")
+        value = self._columns[name][(self._head - 1) % self.maxlen]
+        if name == "state":
+            return SYSTEM_STATES[value]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Newest `n` values (all if None) of one field, oldest first.
+
+        Zero-copy view into the buffer: valid until the next append.
+        "state" returns SystemState codes (see SYSTEM_STATES).
+        """
+        return self._columns[name][self._window_slice(n)]
+
+    def window(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Zero-copy views of every column for the newest `n` rows, in Telemetry field order."""
+        sl = self._window_slice(n)
+        return {name: self._columns[name][sl] for name in TELEMETRY_FIELDS}
+
+    def to_frame(self, n: Optional[int] = None):
+        """pandas DataFrame of the newest `n` rows, with state as its label."""
+        import pandas as pd
+
+        data = self.window(n)
+        data["state"] = np.array([s.value for s in SYSTEM_STATES], dtype=object)[data["state"]]
+        return pd.DataFrame(data, copy=False)
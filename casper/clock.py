@@ -0,0 +1,88 @@
+"""
+casper.clock
+============
+
+Timestamp sources for Casper_Fusion.
+
+EngineState samples its clock once per tick (EngineState.begin_tick) and
+every consumer of that tick (sensor measurements, audit record, telemetry)
+shares the same ISO8601 string.
+
+- SimClock      : epoch + mission_time_s; reproducible across replays (default)
+- WallClock     : UTC wall time, sampled once per tick
+- RecordedClock : timestamps captured from an earlier run, keyed by tick
+
+No runtime state beyond the clock's own configuration.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Mapping, Optional
+
+# Fixed epoch for simulated time (naive UTC).
+DEFAULT_EPOCH = "2025-01-01T00:00:00"
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat() + "Z"
+
+
+class Clock:
+    """
+    Base clock interface.
+    """
+
+    def timestamp(self, tick: int, mission_time_s: float) -> str:
+        """ISO8601 UTC timestamp for `tick`, ending at `mission_time_s`."""
+        raise NotImplementedError
+
+    def to_dict(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class SimClock(Clock):
+    """Simulated time: epoch + mission_time_s."""
+
+    def __init__(self, epoch: str = DEFAULT_EPOCH):
+        self.epoch = epoch
+        self._epoch_dt = datetime.fromisoformat(epoch)
+
+    def timestamp(self, tick: int, mission_time_s: float) -> str:
+        return _iso(self._epoch_dt + timedelta(seconds=float(mission_time_s)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": "sim", "epoch": self.epoch}
+
+
+class WallClock(Clock):
+    """UTC wall time. Not reproducible; replays need a RecordedClock."""
+
+    def timestamp(self, tick: int, mission_time_s: float) -> str:
+        return _iso(datetime.now(timezone.utc).replace(tzinfo=None))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": "wall"}
+
+
+class RecordedClock(Clock):
+    """Replays recorded timestamps; falls back to `fallback` for unknown ticks."""
+
+    def __init__(self, stamps: Mapping[int, str], fallback: Optional[Clock] = None):
+        self.stamps = dict(stamps)
+        self.fallback = fallback or SimClock()
+
+    def timestamp(self, tick: int, mission_time_s: float) -> str:
+        stamp = self.stamps.get(tick)
+        return stamp if stamp is not None else self.fallback.timestamp(tick, mission_time_s)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": "recorded"}
+
+
+def clock_from_dict(data: Mapping[str, Any]) -> Optional[Clock]:
+    """
+    Rebuild a reproducible clock from Clock.to_dict(); None when the
+    clock (wall/recorded) cannot be reconstructed from configuration alone.
+    """
+    if data.get("kind") == "sim":
+        return SimClock(data.get("epoch", DEFAULT_EPOCH))
+    return None
@@ -6,15 +6,20 @@ Fusion engine orchestration:
 - selects measurements within a fusion time gate
 - filters dropped measurements
 - calls the selected fusion strategy
-- returns a fused estimate
+- returns a fused estimate (and, via fuse_selected, the measurements used)
+
+Intended to live as long as the run: strategies are built once and
+switched in place.
 
 No UI dependencies. No sensor simulation.
 """
 
-from typing import Deque, List
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 
+from casper.buffers import MeasurementBuffer
 from casper.config import FusionConfig
-from casper.models import SensorMeasurement, FusedEstimate
+from casper.models import Measurement, FusedEstimate
+from casper.presets import AOConfig
 from casper.fusion.strategies import WeightedFusion, KalmanFusion, FusionStrategy
 
 
@@ -31,28 +36,76 @@ class FusionEngine:
         }
         self.strategy_name = strategy_name if strategy_name in self._strategies else "weighted"
         self.strategy: FusionStrategy = self._strategies[self.strategy_name]
+        self.area: Optional[AOConfig] = None
 
     def set_strategy(self, strategy_name: str) -> None:
-        """Switch fusion strategy safely."""
+        """
+        Switch fusion strategy safely. The strategy switched to starts
+        clean: a filter left from an earlier stint would gate against a
+        stale track.
+        """
         if strategy_name not in self._strategies:
             strategy_name = "weighted"
+        if strategy_name != self.strategy_name:
+            self._strategies[strategy_name].reset()
         self.strategy_name = strategy_name
         self.strategy = self._strategies[strategy_name]
 
+    def set_area(self, ao: Optional[AOConfig]) -> None:
+        """
+        Pass the operating area to every strategy (process noise sizing).
+        Moving from one known area to another also resets per-run state,
+        since filters still hold positions in the old area.
+        """
+        moved = self.area is not None
+        self.area = ao
+        for strategy in self._strategies.values():
+            strategy.set_area(ao)
+        if moved:
+            self.reset()
+
+    def reset(self) -> None:
+        """Clear per-run strategy state (start of a new run)."""
+        for strategy in self._strategies.values():
+            strategy.reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Active strategy plus every strategy's per-run state."""
+        return {
+            "strategy_name": self.strategy_name,
+            "strategies": {name: s.snapshot() for name, s in self._strategies.items()},
+        }
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        self.set_strategy(snapshot["strategy_name"])
+        for name, strategy in self._strategies.items():
+            strategy.restore(snapshot["strategies"].get(name, {}))
+        # The restored state's AO is picked up on the next tick without a
+        # reset, so the restored filters survive.
+        self.area = None
+
     def select_measurements(
         self,
-        history: Deque[SensorMeasurement],
+        history: Union[MeasurementBuffer, Deque[Measurement]],
         current_tick: int
-    ) -> List[SensorMeasurement]:
+    ) -> List[Measurement]:
         """
         Select usable measurements within the fusion time gate.
 
         Gate logic:
         age_ms = |(tick_delta * dt_seconds * 1000) + latency_ms|
+
+        A MeasurementBuffer is gated with a vectorized mask; only the
+        selected rows are materialized as MeasurementRecord views.
         """
-        selected: List[SensorMeasurement] = []
         gate_ms = float(self.config.fusion_time_gate_ms)
 
+        if isinstance(history, MeasurementBuffer):
+            slots = history.select_recent(current_tick, self.config.dt_seconds, gate_ms)
+            return history.materialize(slots)
+
+        selected: List[Measurement] = []
+
         # Iterate most-recent-first for efficiency
         for m in reversed(history):
             if m.dropped:
@@ -69,13 +122,26 @@ class FusionEngine:
 
         return selected
 
+    def fuse_selected(
+        self,
+        history: Union[MeasurementBuffer, Deque[Measurement]],
+        current_tick: int
+    ) -> Tuple[FusedEstimate, List[Measurement]]:
+        """
+        Run fusion for the current tick.
+
+        Returns the fused estimate together with the gated measurement set,
+        so callers (e.g. the audit record) do not re-run selection.
+        """
+        selected = self.select_measurements(history, current_tick)
+        return self.strategy.fuse(selected), selected
+
     def fuse(
         self,
-        history: Deque[SensorMeasurement],
+        history: Union[MeasurementBuffer, Deque[Measurement]],
         current_tick: int
     ) -> FusedEstimate:
         """
         Run fusion for the current tick.
         """
-        selected = self.select_measurements(history, current_tick)
-        return self.strategy.fuse(selected)
+        return self.fuse_selected(history, current_tick)[0]
@@ -0,0 +1,113 @@
+"""
+casper.fusion.spatial
+=====================
+
+Uniform-grid spatial index for measurement-to-track gating.
+
+Each item (a track prediction) is entered into every cell its gate box
+overlaps on the horizontal plane; a query point then only looks at the
+items registered in its own cell. With gates sized from the predicted
+covariance, candidate generation is O(items + points + candidates) instead
+of O(items x points).
+
+Storage is a flat (cell key, item) table sorted by key, so lookups are
+np.searchsorted calls and inserts are a concatenate + stable re-sort.
+
+No UI dependencies.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+# Cell keys pack (row, col) into one int64: row * 2^32 + (col + 2^31).
+_COL_OFFSET = np.int64(1 << 31)
+_ROW_STRIDE = np.int64(1 << 32)
+
+
+def _expand_ranges(lo: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(owner index, value) for the concatenated ranges [lo_k, lo_k + counts_k)."""
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(counts.size), counts)
+    start = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+    return owner, np.arange(total) + start
+
+
+class SpatialGrid:
+    """
+    Grid index over axis-aligned gate boxes in a 2-D plane.
+
+    cell_size : (2,) cell edge per axis, in the same units as the boxes
+    """
+
+    def __init__(self, cell_size: np.ndarray):
+        self.cell_size = np.maximum(np.asarray(cell_size, dtype=float).reshape(2), 1e-12)
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.items = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def for_boxes(cls, half: np.ndarray, min_cell: float = 1e-9) -> "SpatialGrid":
+        """Cell edge = median gate width, so a typical box covers ~4 cells."""
+        if half.shape[0] == 0:
+            return cls(np.ones(2))
+        return cls(np.maximum(2.0 * np.median(half[:, 0:2], axis=0), min_cell))
+
+    def __len__(self) -> int:
+        return int(self.items.size)
+
+    def _cell(self, coords: np.ndarray) -> np.ndarray:
+        return np.floor(coords / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _key(row: np.ndarray, col: np.ndarray) -> np.ndarray:
+        return row * _ROW_STRIDE + (col + _COL_OFFSET)
+
+    # --------------------------------------------------
+    # Updates
+    # --------------------------------------------------
+    def clear(self) -> None:
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.items = np.zeros(0, dtype=np.int64)
+
+    def build(self, centers: np.ndarray, half: np.ndarray) -> "SpatialGrid":
+        """Index items 0..N-1 with boxes centers +/- half ((N, 2) each)."""
+        self.clear()
+        self.insert(np.arange(centers.shape[0]), centers, half)
+        return self
+
+    def insert(self, items: np.ndarray, centers: np.ndarray, half: np.ndarray) -> None:
+        """Add items (e.g. tracks born mid-tick) without rebuilding."""
+        if items.size == 0:
+            return
+        c0 = self._cell(centers[:, 0:2] - half[:, 0:2])
+        c1 = self._cell(centers[:, 0:2] + half[:, 0:2])
+        span = c1 - c0 + 1
+        owner, offset = _expand_ranges(np.zeros(items.size, dtype=np.int64), span[:, 0] * span[:, 1])
+
+        row = c0[owner, 0] + offset // span[owner, 1]
+        col = c0[owner, 1] + offset % span[owner, 1]
+
+        keys = np.concatenate([self.keys, self._key(row, col)])
+        values = np.concatenate([self.items, np.asarray(items, dtype=np.int64)[owner]])
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.items = values[order]
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def query(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidate (item, point) pairs: items whose box overlaps the cell of
+        each point. Callers apply the exact gate to the candidates.
+        """
+        empty = np.zeros(0, dtype=np.int64)
+        if points.shape[0] == 0 or self.keys.size == 0:
+            return empty, empty
+        cell = self._cell(points[:, 0:2])
+        key = self._key(cell[:, 0], cell[:, 1])
+        lo = np.searchsorted(self.keys, key, side="left")
+        hi = np.searchsorted(self.keys, key, side="right")
+        point, slot = _expand_ranges(lo, hi - lo)
+        return self.items[slot], point
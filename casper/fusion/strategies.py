@@ -5,19 +5,25 @@ casper.fusion.strategies
 Fusion strategies for Casper_Fusion.
 
 Each strategy:
-- accepts validated SensorMeasurement objects
+- accepts measurements (SensorMeasurement or MeasurementRecord)
 - returns a FusedEstimate
 - exposes epistemic confidence + surprise
 
-No state mutation. No UI dependencies.
+WeightedFusion is stateless. KalmanFusion keeps its filter state across
+ticks (cleared by reset()); its predict/update core is written over a
+leading batch axis so it can run many filters in one array computation.
+
+No UI dependencies.
 """
 
-from typing import List, Tuple
+import math
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from casper.config import FusionConfig
 from casper.models import SensorMeasurement, FusedEstimate, SensorType
+from casper.presets import AOConfig
 
 
 # ============================================================
@@ -32,6 +38,19 @@ class FusionStrategy:
     def fuse(self, measurements: List[SensorMeasurement]) -> FusedEstimate:
         raise NotImplementedError
 
+    def reset(self) -> None:
+        """Clear any per-run state. Stateless strategies need not override."""
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-run state needed to resume mid-run (see casper.archive.checkpoint)."""
+        return {}
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """Inverse of snapshot()."""
+
+    def set_area(self, ao: Optional[AOConfig]) -> None:
+        """Adapt to the operating area. Area-independent strategies need not override."""
+
     def calculate_confidence(
         self,
         measurements: List[SensorMeasurement],
@@ -40,6 +59,24 @@ class FusionStrategy:
     ) -> Tuple[float, float]:
         raise NotImplementedError
 
+    # --------------------------------------------------
+    # Fallback
+    # --------------------------------------------------
+    def _fallback(self) -> FusedEstimate:
+        return FusedEstimate(
+            lat=0.0,
+            lon=0.0,
+            altitude_m=0.0,
+            velocity_mps=0.0,
+            heading_deg=0.0,
+            threat_index=0.0,
+            civ_density=0.0,
+            fusion_conf=0.1,
+            surprise=1.0,
+            sensor_contrib={},
+            used_meas_count=0,
+        )
+
 
 # ============================================================
 # WEIGHTED FUSION (DEFAULT)
@@ -154,44 +191,287 @@ class WeightedFusion(FusionStrategy):
 
         return fusion_conf, surprise
 
-    # --------------------------------------------------
-    # Fallback
-    # --------------------------------------------------
-    def _fallback(self) -> FusedEstimate:
-        return FusedEstimate(
-            lat=0.0,
-            lon=0.0,
-            altitude_m=0.0,
-            velocity_mps=0.0,
-            heading_deg=0.0,
-            threat_index=0.0,
-            civ_density=0.0,
-            fusion_conf=0.1,
-            surprise=1.0,
-            sensor_contrib={},
-            used_meas_count=0,
-        )
+
+# ============================================================
+# KALMAN CORE (batched, constant velocity)
+# ============================================================
+# State per filter: [p_lat, p_lon, p_alt, v_lat, v_lon, v_alt] in scaled
+# units (position / POSITION_SCALE), which keeps lat/lon and altitude
+# covariances within a few orders of magnitude of each other.
+
+POSITION_SCALE = np.array([1e-3, 1e-3, 10.0], dtype=float)
+POSITION_TYPES = (SensorType.GNSS, SensorType.EOIR, SensorType.RADAR)
+
+# Broad prior for a fresh track (scaled units squared)
+INITIAL_VARIANCE = 1e2
+
+# Per-tick position diffusion before any AO is known: wider than the
+# jitter of every preset AO [lat deg, lon deg, alt m]
+BROAD_POSITION_STD = np.array([0.25, 0.25, 30.0])
+
+def cv_transition(dt: float) -> np.ndarray:
+    F = np.eye(6)
+    F[0:3, 3:6] = np.eye(3) * dt
+    return F
+
+
+def cv_process_noise(dt: float, accel_std: np.ndarray, position_std: np.ndarray) -> np.ndarray:
+    """
+    Discrete white-acceleration noise for a constant-velocity model, plus
+    a per-tick position diffusion term for targets that wander around a
+    point (the synthetic AO jitter) rather than moving kinematically.
+    """
+    q = np.asarray(accel_std, dtype=float) ** 2
+    r = np.asarray(position_std, dtype=float) ** 2
+    Q = np.zeros((6, 6))
+    for a in range(3):
+        Q[a, a] = q[a] * dt**4 / 4.0 + r[a]
+        Q[a, a + 3] = Q[a + 3, a] = q[a] * dt**3 / 2.0
+        Q[a + 3, a + 3] = q[a] * dt**2
+    return Q
+
+
+def area_position_std(ao: AOConfig) -> np.ndarray:
+    """
+    Per-tick position change std of the synthetic truth over `ao`
+    [lat deg, lon deg, alt m]. Lat/lon are redrawn uniformly within
+    +/-delta every tick, so successive positions differ with std
+    delta * sqrt(2/3); altitude climbs U(50, 150) m a tick, whose mean the
+    velocity state carries and whose spread is 100 / sqrt(12).
+    """
+    jitter = math.sqrt(2.0 / 3.0)
+    return np.array([ao.lat_delta * jitter, ao.lon_delta * jitter, 100.0 / math.sqrt(12.0)])
+
+
+def kalman_predict(x: np.ndarray, P: np.ndarray, F: np.ndarray, Q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """x: (..., 6), P: (..., 6, 6)."""
+    return x @ F.T, F @ P @ F.T + Q
+
+
+def information_update(
+    x: np.ndarray,
+    P: np.ndarray,
+    info_matrix: np.ndarray,
+    info_vector: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched information-form update with all measurements at once.
+
+    info_matrix = sum_i R_i^-1          (..., 3, 3)
+    info_vector = sum_i R_i^-1 z_i      (..., 3)
+
+    Y = P^-1 + H^T I H,  y = P^-1 x + H^T i,  P' = Y^-1,  x' = P' y
+    """
+    P_inv = np.linalg.inv(P)
+    Y = P_inv.copy()
+    Y[..., 0:3, 0:3] += info_matrix
+    y = (P_inv @ x[..., None])[..., 0]
+    y[..., 0:3] += info_vector
+    P_new = np.linalg.inv(Y)
+    x_new = (P_new @ y[..., None])[..., 0]
+    return x_new, 0.5 * (P_new + np.swapaxes(P_new, -1, -2))
+
+
+def innovation_nis(
+    x_pred: np.ndarray,
+    P_pred: np.ndarray,
+    z: np.ndarray,
+    R: np.ndarray,
+) -> np.ndarray:
+    """
+    Normalized innovation squared per measurement.
+
+    x_pred (..., 6), P_pred (..., 6, 6) broadcast against z (..., 3), R (..., 3, 3).
+    """
+    nu = z - x_pred[..., 0:3]
+    S = P_pred[..., 0:3, 0:3] + R
+    return np.einsum("...i,...i->...", nu, np.linalg.solve(S, nu[..., None])[..., 0])
+
+
+def noise_inflation(quality: np.ndarray, latency_ms: np.ndarray, type_weight: np.ndarray) -> np.ndarray:
+    """R multiplier from the WeightedFusion policy factors (vectorized)."""
+    trust = np.maximum(np.clip(quality, 0.0, 1.0) * type_weight, 1e-3)
+    return (1.0 + np.asarray(latency_ms, dtype=float) / 200.0) / trust
+
+
+def cv_kinematics(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scaled CV states (..., 6) -> (position (..., 3) in lat/lon/m,
+    ground+vertical speed (...) in m/s, heading (...) in degrees).
+    """
+    pos = x[..., 0:3] * POSITION_SCALE
+    vel = x[..., 3:6] * POSITION_SCALE
+    north = vel[..., 0] * 111_320.0
+    east = vel[..., 1] * 111_320.0 * np.cos(np.radians(pos[..., 0]))
+    speed = np.sqrt(north**2 + east**2 + vel[..., 2] ** 2)
+    heading = np.degrees(np.arctan2(east, north)) % 360.0
+    return pos, speed, heading
+
+
+def position_precision(P: np.ndarray) -> np.ndarray:
+    """
+    1 / (1 + mean posterior position variance) in scaled units, for P
+    (..., 6, 6): near 1 when the fused position is known well inside
+    1e-3 deg / 10 m (the scale WeightedFusion measures dispersion in),
+    0.5 when its std is about that scale.
+    """
+    var = np.diagonal(P[..., 0:3, 0:3], axis1=-2, axis2=-1)
+    return 1.0 / (1.0 + var.mean(axis=-1))
+
+
+def nis_surprise(nis_per_dof: np.ndarray) -> np.ndarray:
+    """
+    Map mean NIS per degree of freedom to [0, 1]: 0 when innovations match
+    their predicted covariance (~1), 1 at nine times the expected spread.
+    """
+    return np.clip((nis_per_dof - 1.0) / 8.0, 0.0, 1.0)
 
 
 # ============================================================
-# KALMAN FUSION (STUB — SAFE)
+# KALMAN FUSION
 # ============================================================
 
 class KalmanFusion(FusionStrategy):
     """
-    Placeholder for future Kalman-based fusion.
-
-    Explicitly not implemented to avoid
-    accidental use without validation.
+    Constant-velocity Kalman filter over position-capable sensors.
+
+    - one batched information-form update per tick (all gated measurements)
+    - R is inflated by the same policy factors WeightedFusion uses
+      (quality, latency, sensor-type weight) for weighting only
+    - surprise comes from normalized innovation statistics against the
+      sensors' reported R: the mean NIS against the prediction and the
+      chi-square of residuals against the fused posterior (sensor
+      disagreement), whichever is worse. Inflated R would shrink both
+      exactly when quality drops.
+    - fusion_conf is (1 - surprise) scaled by position_precision(P), so
+      honest but noisier sensors also lower confidence
+    - position process noise follows the AO's truth jitter (set_area)
+      unless kalman_position_std is configured
     """
 
     def __init__(self, config: FusionConfig):
         self.config = config
+        self.F = cv_transition(float(config.dt_seconds))
+        self.Q = self._process_noise(None)
+        self.x: Optional[np.ndarray] = None
+        self.P: Optional[np.ndarray] = None
+
+    def _process_noise(self, ao: Optional[AOConfig]) -> np.ndarray:
+        if self.config.kalman_position_std is not None:
+            position_std = np.asarray(self.config.kalman_position_std, dtype=float)
+        elif ao is not None:
+            position_std = area_position_std(ao)
+        else:
+            position_std = BROAD_POSITION_STD
+        return cv_process_noise(
+            float(self.config.dt_seconds),
+            np.asarray(self.config.kalman_accel_std, dtype=float) / POSITION_SCALE,
+            position_std / POSITION_SCALE,
+        )
 
-    def fuse(self, measurements: List[SensorMeasurement]) -> FusedEstimate:
-        raise NotImplementedError(
-            "KalmanFusion is a stub and must be explicitly implemented."
+    def set_area(self, ao: Optional[AOConfig]) -> None:
+        self.Q = self._process_noise(ao)
+
+    def reset(self) -> None:
+        self.x = None
+        self.P = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self.x is None:
+            return {}
+        return {"x": self.x.copy(), "P": self.P.copy()}
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        self.reset()
+        if "x" in snapshot:
+            self.x = np.array(snapshot["x"], dtype=float)
+            self.P = np.array(snapshot["P"], dtype=float)
+
+    # --------------------------------------------------
+    # Measurement preparation
+    # --------------------------------------------------
+    def _prepare(self, measurements: List[SensorMeasurement]):
+        pos_meas = [m for m in measurements if m.sensor_type in POSITION_TYPES and not m.dropped]
+        if not pos_meas:
+            return pos_meas, None, None, None
+
+        Z = np.stack([np.asarray(m.z[:3], dtype=float) for m in pos_meas]) / POSITION_SCALE
+        R = np.stack([np.asarray(m.R, dtype=float)[:3, :3] for m in pos_meas])
+        R = R / np.outer(POSITION_SCALE, POSITION_SCALE)[None, :, :]
+
+        inflation = noise_inflation(
+            np.array([m.quality for m in pos_meas], dtype=float),
+            np.array([m.latency_ms for m in pos_meas], dtype=float),
+            np.array([self.config.position_fusion_weight.get(m.sensor_type.value, 0.5) for m in pos_meas]),
         )
+        return pos_meas, Z, R, R * inflation[:, None, None]
 
-    def calculate_confidence(self, *args, **kwargs):
-        raise NotImplementedError
+    # --------------------------------------------------
+    # Fusion
+    # --------------------------------------------------
+    def fuse(self, measurements: List[SensorMeasurement]) -> FusedEstimate:
+        pos_meas, Z, R_reported, R = self._prepare(measurements)
+
+        if self.x is None:
+            if not pos_meas:
+                return self._fallback()
+            self.x = np.zeros(6)
+            self.x[0:3] = Z.mean(axis=0)
+            self.P = np.eye(6) * INITIAL_VARIANCE
+            first = True
+        else:
+            self.x, self.P = kalman_predict(self.x, self.P, self.F, self.Q)
+            first = False
+
+        if not pos_meas:
+            return self._estimate(fusion_conf=0.1, surprise=1.0, contrib={}, used=0)
+
+        R_inv = np.linalg.inv(R)
+        info_matrix = R_inv.sum(axis=0)
+        info_vector = np.einsum("nij,nj->i", R_inv, Z)
+
+        # Normalized innovation statistics, per degree of freedom:
+        # - against the prediction (is the target where the model expected?)
+        # - against the fused posterior (do the sensors agree with each other?)
+        stats = []
+        if not first:
+            stats.append(float(innovation_nis(self.x, self.P, Z, R_reported).mean()) / 3.0)
+
+        self.x, self.P = information_update(self.x, self.P, info_matrix, info_vector)
+
+        if len(pos_meas) >= 2:
+            resid = Z - self.x[None, 0:3]
+            chi2 = float(np.einsum("ni,nij,nj->", resid, np.linalg.inv(R_reported), resid))
+            stats.append(chi2 / (3.0 * (len(pos_meas) - 1)))
+
+        if stats:
+            surprise = float(nis_surprise(max(stats)))
+            fusion_conf = float(np.clip((1.0 - surprise) * position_precision(self.P), 0.0, 1.0))
+        else:
+            fusion_conf, surprise = 0.5, 0.5
+
+        info_share = np.trace(R_inv, axis1=1, axis2=2)
+        info_share = info_share / max(float(info_share.sum()), 1e-12)
+        contrib = {m.sensor_id: float(w) for m, w in zip(pos_meas, info_share)}
+
+        return self._estimate(fusion_conf, surprise, contrib, len(pos_meas))
+
+    # --------------------------------------------------
+    # Output
+    # --------------------------------------------------
+    def _estimate(self, fusion_conf: float, surprise: float, contrib: Dict[str, float], used: int) -> FusedEstimate:
+        pos, speed, heading = cv_kinematics(self.x)
+
+        return FusedEstimate(
+            lat=float(np.clip(pos[0], -90.0, 90.0)),
+            lon=float(np.clip(pos[1], -180.0, 180.0)),
+            altitude_m=float(np.clip(pos[2], -1000.0, 50000.0)),
+            velocity_mps=float(min(speed, 2000.0)),
+            heading_deg=float(heading),
+            threat_index=0.0,
+            civ_density=0.0,
+            fusion_conf=float(fusion_conf),
+            surprise=float(surprise),
+            sensor_contrib=contrib,
+            used_meas_count=used,
+        )
@@ -0,0 +1,369 @@
+"""
+casper.fusion.tracks
+====================
+
+Multi-target tracking for Casper_Fusion.
+
+- TrackTable       : struct-of-arrays track store (CV state, covariance, counters)
+- gate_pairs()     : candidate (track, measurement) pairs inside a
+                     Mahalanobis gate on the predicted position, found
+                     through a SpatialGrid (casper.fusion.spatial)
+- assign_greedy()  : gated nearest-neighbour assignment, one report per
+                     track per sensor
+- MultiTrackFusion : per tick predict -> associate -> one batched
+                     information-form update across all tracks -> track
+                     confirmation / deletion
+
+Tracks use the same constant-velocity Kalman core as KalmanFusion
+(casper.fusion.strategies), in the same scaled units.
+
+No UI dependencies.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from casper.config import FusionConfig
+from casper.fusion.spatial import SpatialGrid
+from casper.fusion.strategies import (
+    POSITION_SCALE,
+    cv_kinematics,
+    cv_process_noise,
+    cv_transition,
+    information_update,
+    innovation_nis,
+    kalman_predict,
+    nis_surprise,
+    noise_inflation,
+)
+from casper.sensors.simulator import TARGET_SENSORS, TargetMeasurements
+
+
+_SCALE2 = np.outer(POSITION_SCALE, POSITION_SCALE)
+
+
+# ============================================================
+# TRACK STORE
+# ============================================================
+
+class TrackTable:
+    """
+    Growable struct-of-arrays track store. Rows [0, len) are live;
+    removal compacts rows while preserving order.
+    """
+
+    def __init__(self, capacity: int = 256):
+        cap = max(int(capacity), 1)
+        self.id = np.zeros(cap, dtype=np.int64)
+        self.x = np.zeros((cap, 6), dtype=np.float64)
+        self.P = np.zeros((cap, 6, 6), dtype=np.float64)
+        self.hits = np.zeros(cap, dtype=np.int32)
+        self.misses = np.zeros(cap, dtype=np.int32)
+        self.born_tick = np.zeros(cap, dtype=np.int64)
+        self.surprise = np.zeros(cap, dtype=np.float64)
+        self._size = 0
+        self._next_id = 0
+
+    _COLUMNS = ("id", "x", "P", "hits", "misses", "born_tick", "surprise")
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, needed: int) -> None:
+        cap = self.id.shape[0]
+        if needed <= cap:
+            return
+        new_cap = max(needed, cap * 2)
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((new_cap,) + old.shape[1:], dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def add(self, x: np.ndarray, P: np.ndarray, tick: int) -> np.ndarray:
+        """Append tentative tracks; returns their row indices."""
+        k = x.shape[0]
+        self._grow(self._size + k)
+        rows = np.arange(self._size, self._size + k)
+        self.id[rows] = np.arange(self._next_id, self._next_id + k)
+        self.x[rows] = x
+        self.P[rows] = P
+        self.hits[rows] = 1
+        self.misses[rows] = 0
+        self.born_tick[rows] = tick
+        self.surprise[rows] = 0.5
+        self._size += k
+        self._next_id += k
+        return rows
+
+    def remove(self, mask: np.ndarray) -> int:
+        """Drop live rows where mask is True; returns the number removed."""
+        keep = np.flatnonzero(~mask[:self._size])
+        removed = self._size - keep.size
+        if removed:
+            for name in self._COLUMNS:
+                col = getattr(self, name)
+                col[:keep.size] = col[keep]
+            self._size = keep.size
+        return removed
+
+    def clear(self) -> None:
+        self._size = 0
+        self._next_id = 0
+
+
+# ============================================================
+# ASSOCIATION
+# ============================================================
+
+def gate_half_widths(track_cov: np.ndarray, R: np.ndarray, gate_chi2: float) -> np.ndarray:
+    """
+    Per-track axis-aligned half-widths (T, 3) enclosing the Mahalanobis
+    gate for any of the measurement covariances R (M, 3, 3).
+    """
+    r_max = np.diagonal(R, axis1=1, axis2=2).max(axis=0) if R.shape[0] else np.zeros(3)
+    return np.sqrt(gate_chi2 * (np.diagonal(track_cov, axis1=1, axis2=2) + r_max))
+
+
+def gate_pairs(
+    track_pos: np.ndarray,
+    track_cov: np.ndarray,
+    z: np.ndarray,
+    R: np.ndarray,
+    gate_chi2: float,
+    grid: Optional[SpatialGrid] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Candidate (track, measurement, d2) triples with Mahalanobis distance
+    d2 = nu^T (P_t + R_m)^-1 nu <= gate_chi2.
+
+    Candidates come from a SpatialGrid over the track gate boxes (built
+    here unless the caller keeps one per tick), then a 3-axis box check,
+    so only nearby pairs reach the exact distance computation.
+    """
+    empty = np.zeros(0, dtype=np.int64)
+    if track_pos.shape[0] == 0 or z.shape[0] == 0:
+        return empty, empty, np.zeros(0)
+
+    half = gate_half_widths(track_cov, R, gate_chi2)
+    if grid is None:
+        grid = SpatialGrid.for_boxes(half).build(track_pos, half)
+
+    ti, mi = grid.query(z)
+    near = np.all(np.abs(z[mi] - track_pos[ti]) <= half[ti], axis=1)
+    return _mahalanobis_gate(ti[near], mi[near], track_pos, track_cov, z, R, gate_chi2)
+
+
+def _mahalanobis_gate(ti, mi, track_pos, track_cov, z, R, gate_chi2):
+    nu = z[mi] - track_pos[ti]
+    S = track_cov[ti] + R[mi]
+    d2 = np.einsum("ni,ni->n", nu, np.linalg.solve(S, nu[..., None])[..., 0])
+    keep = d2 <= gate_chi2
+    return ti[keep], mi[keep], d2[keep]
+
+
+def assign_greedy(ti: np.ndarray, mi: np.ndarray, d2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gated nearest-neighbour: take pairs in order of increasing distance,
+    each track and each measurement used at most once.
+    """
+    if ti.size == 0:
+        return ti, mi
+    order = np.lexsort((mi, ti, d2))
+    used_t, used_m = set(), set()
+    keep = []
+    for k in order.tolist():
+        t, m = int(ti[k]), int(mi[k])
+        if t in used_t or m in used_m:
+            continue
+        used_t.add(t)
+        used_m.add(m)
+        keep.append(k)
+    keep = np.asarray(keep, dtype=np.int64)
+    return ti[keep], mi[keep]
+
+
+# ============================================================
+# MULTI-TRACK FUSION
+# ============================================================
+
+@dataclass
+class TrackFrame:
+    """Per-tick summary of the multi-track fusion step."""
+    tick: int
+    tracks: int
+    confirmed: int
+    measurements: int
+    assigned: int
+    born: int
+    deleted: int
+    mean_surprise: float
+
+
+class MultiTrackFusion:
+    """
+    Batched constant-velocity tracking of many targets.
+
+    Each tick:
+    1. predict every track in one array operation
+    2. per sensor, associate its reports to tracks (gated nearest
+       neighbour); unassigned reports start tentative tracks
+    3. fold every assigned report into its track with a single batched
+       information-form update (all tracks, all sensors)
+    4. confirm tracks after `track_confirm_hits` updates, delete them
+       after more than `track_max_misses` consecutive misses
+    """
+
+    def __init__(self, config: FusionConfig):
+        self.config = config
+        dt = float(config.dt_seconds)
+        self.F = cv_transition(dt)
+        self.Q = cv_process_noise(
+            dt,
+            np.asarray(config.track_accel_std, dtype=float) / POSITION_SCALE,
+            np.zeros(3),
+        )
+        speed = float(config.track_init_speed_mps)
+        self._init_vel_var = (np.array([speed / 111_320.0, speed / 111_320.0, speed * 0.1]) / POSITION_SCALE) ** 2
+        self._type_weight = np.array(
+            [config.position_fusion_weight.get(t.value, 0.5) for t in TARGET_SENSORS], dtype=float
+        )
+        self.tracks = TrackTable()
+
+    def reset(self) -> None:
+        self.tracks.clear()
+
+    # --------------------------------------------------
+    # Measurement preparation
+    # --------------------------------------------------
+    def _prepare(self, meas: TargetMeasurements) -> Tuple[np.ndarray, np.ndarray]:
+        Z = meas.z / POSITION_SCALE
+        inflation = noise_inflation(meas.quality, meas.latency_ms, self._type_weight[meas.sensor])
+        R = meas.R / _SCALE2 * inflation[:, None, None]
+        return Z, R
+
+    def _spawn(self, Z: np.ndarray, R: np.ndarray, tick: int) -> np.ndarray:
+        k = Z.shape[0]
+        x = np.zeros((k, 6))
+        x[:, 0:3] = Z
+        P = np.zeros((k, 6, 6))
+        P[:, 0:3, 0:3] = R
+        P[:, 3:6, 3:6] = np.diag(self._init_vel_var)
+        return self.tracks.add(x, P, tick)
+
+    def _associate(
+        self,
+        rows: np.ndarray,
+        Z: np.ndarray,
+        R: np.ndarray,
+        grid: SpatialGrid,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Assign one sensor's reports (`rows`) to live tracks."""
+        tr = self.tracks
+        n = len(tr)
+        ti, mi, d2 = gate_pairs(
+            tr.x[:n, 0:3], tr.P[:n, 0:3, 0:3], Z[rows], R[rows], self.config.track_gate_chi2, grid=grid
+        )
+        ti, mi = assign_greedy(ti, mi, d2)
+        return ti, rows[mi]
+
+    # --------------------------------------------------
+    # Tick
+    # --------------------------------------------------
+    def step(self, meas: TargetMeasurements) -> TrackFrame:
+        tr = self.tracks
+        tick = meas.tick
+        n_prev = len(tr)
+
+        if n_prev:
+            tr.x[:n_prev], tr.P[:n_prev] = kalman_predict(tr.x[:n_prev], tr.P[:n_prev], self.F, self.Q)
+
+        Z, R = self._prepare(meas)
+        gate = self.config.track_gate_chi2
+
+        # Grid over the predicted gate boxes, sized for the widest R this tick
+        half = gate_half_widths(tr.P[:n_prev, 0:3, 0:3], R, gate)
+        grid = SpatialGrid.for_boxes(half).build(tr.x[:n_prev, 0:3], half)
+
+        # Association, sensor by sensor; leftovers seed tentative tracks
+        # that later sensors in the same tick can associate with.
+        pair_t, pair_m = [], []
+        born = 0
+        for code in range(len(TARGET_SENSORS)):
+            rows = np.flatnonzero(meas.sensor == code)
+            if rows.size == 0:
+                continue
+            ti, mi = self._associate(rows, Z, R, grid)
+            pair_t.append(ti)
+            pair_m.append(mi)
+
+            unassigned = np.setdiff1d(rows, mi, assume_unique=True)
+            if unassigned.size:
+                new_rows = self._spawn(Z[unassigned], R[unassigned], tick)
+                grid.insert(new_rows, Z[unassigned], gate_half_widths(R[unassigned], R, gate))
+                born += unassigned.size
+
+        n = len(tr)
+        ti = np.concatenate(pair_t) if pair_t else np.zeros(0, dtype=np.int64)
+        mi = np.concatenate(pair_m) if pair_m else np.zeros(0, dtype=np.int64)
+
+        # One batched information-form update across all tracks
+        updated = np.zeros(n, dtype=bool)
+        if ti.size:
+            R_inv = np.linalg.inv(R[mi])
+            info_matrix = np.zeros((n, 3, 3))
+            info_vector = np.zeros((n, 3))
+            np.add.at(info_matrix, ti, R_inv)
+            np.add.at(info_vector, ti, np.einsum("nij,nj->ni", R_inv, Z[mi]))
+
+            nis = innovation_nis(tr.x[ti], tr.P[ti], Z[mi], R[mi])
+            counts = np.bincount(ti, minlength=n)
+            nis_mean = np.bincount(ti, weights=nis, minlength=n)
+
+            upd = np.flatnonzero(counts)
+            tr.x[upd], tr.P[upd] = information_update(tr.x[upd], tr.P[upd], info_matrix[upd], info_vector[upd])
+            tr.surprise[upd] = nis_surprise(nis_mean[upd] / counts[upd] / 3.0)
+            updated[upd] = True
+
+        # Track management (tracks born this tick count as hit)
+        live = slice(0, n)
+        fresh = tr.born_tick[live] == tick
+        tr.hits[live] += updated & ~fresh
+        tr.misses[live] = np.where(updated | fresh, 0, tr.misses[live] + 1)
+        deleted = tr.remove(tr.misses[:n] > self.config.track_max_misses)
+
+        n = len(tr)
+        return TrackFrame(
+            tick=int(tick),
+            tracks=n,
+            confirmed=int((tr.hits[:n] >= self.config.track_confirm_hits).sum()),
+            measurements=len(meas),
+            assigned=int(ti.size),
+            born=born,
+            deleted=deleted,
+            mean_surprise=float(tr.surprise[:n].mean()) if n else 0.0,
+        )
+
+    # --------------------------------------------------
+    # Output
+    # --------------------------------------------------
+    def estimates(self, confirmed_only: bool = True) -> Dict[str, np.ndarray]:
+        """Columnar track estimates (lat, lon, altitude_m, velocity, heading, confidence)."""
+        tr = self.tracks
+        n = len(tr)
+        rows = np.arange(n)
+        if confirmed_only:
+            rows = rows[tr.hits[:n] >= self.config.track_confirm_hits]
+        pos, speed, heading = cv_kinematics(tr.x[rows])
+        return {
+            "track_id": tr.id[rows].copy(),
+            "lat": pos[:, 0],
+            "lon": pos[:, 1],
+            "altitude_m": pos[:, 2],
+            "velocity_mps": speed,
+            "heading_deg": heading,
+            "fusion_conf": 1.0 - tr.surprise[rows],
+            "surprise": tr.surprise[rows].copy(),
+        }
@@ -38,6 +38,12 @@ class ClarityRiskCalculator:
     def reset(self):
         self.clarity_ema = 0.9
 
+    def snapshot(self) -> Dict[str, float]:
+        return {"clarity_ema": self.clarity_ema}
+
+    def restore(self, snapshot: Dict[str, float]) -> None:
+        self.clarity_ema = float(snapshot["clarity_ema"])
+
     def compute(
         self,
         state: EngineState,
@@ -0,0 +1,260 @@
+"""
+casper.instrumentation
+======================
+
+Per-stage timing and counters for StepEngine.
+
+StepEngine calls begin_tick() / lap(stage) / count(name) / end_tick() on
+its instrumentation object. By default that object is NULL_INSTRUMENTATION,
+whose methods do nothing, so a disabled engine pays a handful of no-op
+calls per tick and never reads a clock.
+
+Instrumentation samples time.perf_counter_ns() at each lap and hands one
+TickSample per tick to its sinks:
+- HistogramSink      : in-memory log-bucketed histograms + counter totals
+- LogSink            : periodic one-line summaries through `logging`
+- PrometheusTextSink : periodic text-exposition file (node_exporter
+                       textfile collector format), replaced atomically
+
+No UI dependencies.
+"""
+
+import bisect
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger("CASPER.instrumentation")
+
+# Stages timed by StepEngine, in execution order.
+STEP_STAGES = ("truth", "sensors", "fusion", "audit", "governance", "telemetry")
+
+
+@dataclass
+class TickSample:
+    """Stage durations (ns) and counter increments for one tick."""
+    tick: int
+    stages_ns: Dict[str, int] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_ns(self) -> int:
+        return sum(self.stages_ns.values())
+
+
+# ============================================================
+# INSTRUMENTATION
+# ============================================================
+
+class NullInstrumentation:
+    """Disabled instrumentation: every hook is a no-op."""
+
+    enabled = False
+
+    def begin_tick(self, tick: int) -> None:
+        pass
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def end_tick(self) -> None:
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class Instrumentation(NullInstrumentation):
+    """
+    Collects stage timings and counters per tick and forwards them to sinks.
+    """
+
+    enabled = True
+
+    def __init__(self, sinks: Iterable["Sink"] = ()):
+        self.sinks: List[Sink] = list(sinks)
+        self._clock = time.perf_counter_ns
+        self._sample: Optional[TickSample] = None
+        self._last_ns = 0
+
+    def begin_tick(self, tick: int) -> None:
+        self._sample = TickSample(tick=tick)
+        self._last_ns = self._clock()
+
+    def lap(self, stage: str) -> None:
+        now = self._clock()
+        stages = self._sample.stages_ns
+        stages[stage] = stages.get(stage, 0) + now - self._last_ns
+        self._last_ns = now
+
+    def count(self, name: str, value: int = 1) -> None:
+        counters = self._sample.counters
+        counters[name] = counters.get(name, 0) + int(value)
+
+    def end_tick(self) -> None:
+        sample, self._sample = self._sample, None
+        for sink in self.sinks:
+            sink.record(sample)
+
+
+# ============================================================
+# SINKS
+# ============================================================
+
+class Sink:
+    """Receives one TickSample per tick."""
+
+    def record(self, sample: TickSample) -> None:
+        raise NotImplementedError
+
+
+def default_buckets_ns() -> List[int]:
+    """Upper bounds from 1 us to ~1 s, four buckets per doubling."""
+    return [int(1000 * 2 ** (k / 4)) for k in range(81)]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (values in ns)."""
+
+    def __init__(self, bounds_ns: Optional[Sequence[int]] = None):
+        self.bounds_ns = list(bounds_ns or default_buckets_ns())
+        self.counts = [0] * (len(self.bounds_ns) + 1)  # last = overflow
+        self.count = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    def add(self, value_ns: int) -> None:
+        self.counts[bisect.bisect_left(self.bounds_ns, value_ns)] += 1
+        self.count += 1
+        self.sum_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def percentile(self, q: float) -> float:
+        """Upper bucket bound holding the q-th percentile (ns)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return float(self.bounds_ns[i]) if i < len(self.bounds_ns) else float(self.max_ns)
+        return float(self.max_ns)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_us": self.sum_ns / self.count / 1e3 if self.count else 0.0,
+            "p50_us": self.percentile(50) / 1e3,
+            "p95_us": self.percentile(95) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+        }
+
+
+class HistogramSink(Sink):
+    """In-memory per-stage histograms (plus "total") and counter totals."""
+
+    def __init__(self, bounds_ns: Optional[Sequence[int]] = None):
+        self.bounds_ns = list(bounds_ns or default_buckets_ns())
+        self.reset()
+
+    def reset(self) -> None:
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.ticks = 0
+
+    def _hist(self, name: str) -> LatencyHistogram:
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = LatencyHistogram(self.bounds_ns)
+        return hist
+
+    def record(self, sample: TickSample) -> None:
+        self.ticks += 1
+        for stage, ns in sample.stages_ns.items():
+            self._hist(stage).add(ns)
+        self._hist("total").add(sample.total_ns)
+        for name, value in sample.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: hist.summary() for name, hist in self.histograms.items()}
+
+
+class LogSink(HistogramSink):
+    """Logs a stage summary every `every` ticks, then starts a new window."""
+
+    def __init__(self, every: int = 600, log: Optional[logging.Logger] = None, level: int = logging.INFO):
+        super().__init__()
+        self.every = max(1, int(every))
+        self.log = log or logger
+        self.level = level
+
+    def record(self, sample: TickSample) -> None:
+        super().record(sample)
+        if self.ticks >= self.every:
+            self.log.log(self.level, "tick %d: %s", sample.tick, self.format())
+            self.reset()
+
+    def format(self) -> str:
+        parts = [
+            f"{name} p50={s['p50_us']:.0f}us p99={s['p99_us']:.0f}us"
+            for name, s in self.summary().items()
+        ]
+        parts += [f"{name}={value}" for name, value in sorted(self.counters.items())]
+        return ", ".join(parts)
+
+
+class PrometheusTextSink(HistogramSink):
+    """
+    Cumulative histograms/counters written in Prometheus text format to
+    `path` every `every` ticks (tmp file + os.replace, so scrapers never
+    see a partial file).
+    """
+
+    def __init__(self, path: str, every: int = 100, prefix: str = "casper_step"):
+        super().__init__()
+        self.path = path
+        self.every = max(1, int(every))
+        self.prefix = prefix
+
+    def record(self, sample: TickSample) -> None:
+        super().record(sample)
+        if self.ticks % self.every == 0:
+            self.write()
+
+    def render(self) -> str:
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_stage_seconds StepEngine stage duration.",
+            f"# TYPE {p}_stage_seconds histogram",
+        ]
+        for stage, hist in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, c in zip(hist.bounds_ns, hist.counts):
+                cumulative += c
+                lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{bound / 1e9:.9g}"}} {cumulative}')
+            lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+            lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {hist.sum_ns / 1e9:.9g}')
+            lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {hist.count}')
+
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {p}_{name}_total counter")
+            lines.append(f"{p}_{name}_total {value}")
+
+        lines.append(f"# TYPE {p}_ticks_total counter")
+        lines.append(f"{p}_ticks_total {self.ticks}")
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, self.path)
@@ -10,11 +10,17 @@ These models define the system's data contracts:
 - telemetry records
 - enums for sensor and system state
 
+Pydantic models validate at trust boundaries (config load, adapters,
+export, or FusionConfig.strict_models). Inside the engine the same
+records travel as lightweight __slots__ dataclasses (MeasurementRecord,
+TelemetryRecord) with identical field names.
+
 No runtime logic. No Streamlit dependencies.
 """
 
+import dataclasses
 from enum import Enum
-from typing import Dict, Any
+from typing import Dict, Any, Type, Union
 
 import numpy as np
 from pydantic import BaseModel, Field, ConfigDict, field_validator
@@ -164,3 +170,60 @@ class Telemetry(BaseModel):
     # Fusion health
     fusion_conf: float = Field(ge=0.0, le=1.0)
     fusion_surprise: float = Field(ge=0.0, le=1.0)
+
+
+# ============================================================
+# FAST-PATH RECORDS (unvalidated, __slots__)
+# ============================================================
+
+def _record_type(model: Type[BaseModel], name: str) -> type:
+    """
+    Build a __slots__ dataclass mirroring `model`'s fields.
+
+    Instances expose the same attributes as the model, plus:
+    - to_model()   : validate into the pydantic model
+    - model_dump() : plain dict, like BaseModel.model_dump()
+    - from_model() : classmethod copying a model instance
+    """
+    fields = []
+    for field_name, info in model.model_fields.items():
+        if info.default_factory is not None:
+            spec = dataclasses.field(default_factory=info.default_factory)
+        elif not info.is_required():
+            spec = dataclasses.field(default=info.default)
+        else:
+            spec = dataclasses.field()
+        fields.append((field_name, info.annotation, spec))
+
+    names = tuple(model.model_fields)
+
+    def to_model(self):
+        return model(**{n: getattr(self, n) for n in names})
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {n: getattr(self, n) for n in names}
+
+    @classmethod
+    def from_model(cls, obj):
+        return cls(**{n: getattr(obj, n) for n in names})
+
+    return dataclasses.make_dataclass(
+        name,
+        fields,
+        namespace={
+            "__module__": __name__,
+            "__doc__": f"Unvalidated fast-path counterpart of {model.__name__}.",
+            "to_model": to_model,
+            "model_dump": model_dump,
+            "from_model": from_model,
+        },
+        kw_only=True,
+        slots=True,
+    )
+
+
+MeasurementRecord = _record_type(SensorMeasurement, "MeasurementRecord")
+TelemetryRecord = _record_type(Telemetry, "TelemetryRecord")
+
+# Either representation of a measurement; consumers only use attribute access.
+Measurement = Union[SensorMeasurement, MeasurementRecord]
@@ -0,0 +1,192 @@
+"""
+casper.pipeline
+===============
+
+Pipeline-parallel tick execution for Casper_Fusion.
+
+Nothing in tick t+1 depends on tick t's audit hash, so PipelinedStepEngine
+moves audit work off the stepping thread:
+
+    step thread    : truth -> sensors -> fusion -> governance -> telemetry
+                     enqueue (tick, utc, used measurements, fused)
+    audit thread   : build_audit_record (canonical JSON + SHA-256) chained
+                     to the previous record, append to state.audit_chain
+    export thread  : state.audit_log.append + exporter callbacks
+
+Each stage is a single worker fed by a bounded FIFO queue, so records are
+hashed, chained and exported in strict tick order, and a full queue
+blocks the stepping thread (backpressure) instead of growing memory.
+
+This is not a throughput win on CPython: canonical JSON and SHA-256 over
+small payloads hold the GIL, and `bench_pipeline --pipelined` measures
+the two engines within noise of each other (and the queue handoff can
+cost more than it saves). What it buys is keeping blocking audit log
+writes (fsync) and slow exporters off the stepping thread.
+
+state.audit_chain / audit_head trail the simulation by up to
+`queue_size` ticks; call flush() before reading them. Consumers of the
+chain either flush or refuse a lagging chain
+(EngineState.require_audit_current): JournalRecorder.step() and
+checkpoint.capture() flush, RunArchiveWriter / RunExporter write_tick()
+raise until the engine is flushed. Call flush() before
+EngineState.reset() too: reset() closes and detaches state.audit_log, so
+records still queued would miss the log. Audit hashes are identical to
+StepEngine's.
+
+The audit worker keeps a run total in audit_bytes_hashed; each step()
+reports what it hashed since the previous step to the instrumentation's
+"audit_bytes_hashed" counter, so per-tick counts trail by the queue depth
+and the final ticks appear in the total only after flush().
+
+A worker failure is sticky: step() checks for it before touching the
+state, and every later step(), flush() and close() raises it again. The
+chain then ends at or before the failing tick and the engine cannot be
+continued; resume from a checkpoint with a fresh engine.
+
+No UI dependencies.
+"""
+
+import queue
+import threading
+from typing import Callable, List, Optional, Sequence
+
+from casper.audit.chain import AuditRecord, build_audit_record
+from casper.config import FusionConfig
+from casper.instrumentation import NullInstrumentation
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+# Exporter callback: receives every audit record, in tick order.
+Exporter = Callable[[AuditRecord], None]
+
+_STOP = object()
+
+
+class PipelinedStepEngine(StepEngine):
+    """
+    StepEngine whose audit and export stages run on worker threads.
+    """
+
+    def __init__(
+        self,
+        config: FusionConfig,
+        instrumentation: Optional[NullInstrumentation] = None,
+        exporters: Sequence[Exporter] = (),
+        queue_size: int = 64,
+    ):
+        super().__init__(config, instrumentation)
+        self.exporters: List[Exporter] = list(exporters)
+        self._audit_q: "queue.Queue" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._export_q: "queue.Queue" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._error: Optional[BaseException] = None
+        self._threads: List[threading.Thread] = []
+        # Canonical bytes hashed by the audit worker (run total), and the
+        # part of it already reported to the instrumentation.
+        self.audit_bytes_hashed = 0
+        self._audit_bytes_reported = 0
+
+    # --------------------------------------------------
+    # Workers
+    # --------------------------------------------------
+    def _start(self) -> None:
+        if self._threads:
+            return
+        self._threads = [
+            threading.Thread(target=self._audit_worker, name="casper-audit", daemon=True),
+            threading.Thread(target=self._export_worker, name="casper-export", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _audit_worker(self) -> None:
+        while True:
+            item = self._audit_q.get()
+            try:
+                if item is _STOP:
+                    self._export_q.put(_STOP)
+                    return
+                if self._error is None:
+                    state, tick, utc, used_meas, fused = item
+                    audit = build_audit_record(
+                        tick=tick,
+                        utc=utc,
+                        used_measurements=used_meas,
+                        fused=fused,
+                        prev_sha256=state.audit_head,
+                    )
+                    state.audit_chain.append(audit)
+                    state.audit_head = audit.sha256
+                    self.audit_bytes_hashed += len(audit._canonical)
+                    self._export_q.put((state, audit))
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._audit_q.task_done()
+
+    def _export_worker(self) -> None:
+        while True:
+            item = self._export_q.get()
+            try:
+                if item is _STOP:
+                    return
+                if self._error is None:
+                    state, audit = item
+                    if state.audit_log is not None:
+                        state.audit_log.append(audit)
+                    for export in self.exporters:
+                        export(audit)
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._export_q.task_done()
+
+    def _raise_worker_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("audit/export pipeline failed") from self._error
+
+    # --------------------------------------------------
+    # StepEngine hooks
+    # --------------------------------------------------
+    def step(self, state: EngineState) -> EngineState:
+        # Before any state is mutated: a failed tick must not be half-applied.
+        self._raise_worker_error()
+        self._start()
+        return super().step(state)
+
+    def _emit_audit(self, state: EngineState, tick: int, utc: str, used_meas, fused) -> Optional[AuditRecord]:
+        self._audit_q.put((state, tick, utc, used_meas, fused))
+        return None
+
+    def _audit_bytes_hashed(self, audit: Optional[AuditRecord]) -> int:
+        # Only the audit worker writes the total; report what it has hashed
+        # since the last tick.
+        total = self.audit_bytes_hashed
+        delta, self._audit_bytes_reported = total - self._audit_bytes_reported, total
+        return delta
+
+    # --------------------------------------------------
+    # Control
+    # --------------------------------------------------
+    def flush(self) -> None:
+        """Wait until every enqueued tick is hashed, chained and exported."""
+        self._audit_q.join()
+        self._export_q.join()
+        self._raise_worker_error()
+
+    def close(self) -> None:
+        """Flush and stop the worker threads."""
+        if not self._threads:
+            self._raise_worker_error()
+            return
+        self._audit_q.put(_STOP)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        self._raise_worker_error()
+
+    def __enter__(self) -> "PipelinedStepEngine":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,221 @@
+"""
+casper.replay
+=============
+
+Deterministic headless replay for Casper_Fusion.
+
+- JournalRecorder captures an InputJournal while a run executes:
+  the seed/config, scenario changes per tick, and each tick's audit hash
+- ReplayEngine re-executes the journal via StepEngine (no UI) and diffs
+  the regenerated audit hashes against the recorded ones
+- ReplayEngine.seek() jumps to tick N headlessly
+
+Replay relies on the same determinism contract as StepEngine: every tick
+is seeded from (rng_seed, tick); scenario edits are the only inputs.
+Runs on a SimClock replay their timestamps exactly; runs on a wall clock
+are replayed with a RecordedClock built from the journal.
+"""
+
+import json
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+from casper.clock import Clock, RecordedClock, clock_from_dict
+from casper.config import FusionConfig
+from casper.presets import AOConfig
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+# Scenario fields a UI may change between ticks
+SCENARIO_FIELDS = (
+    "env_name",
+    "envelope_name",
+    "threshold_name",
+    "fusion_strategy_name",
+    "ao",
+)
+
+
+def _scenario_value(state: EngineState, name: str) -> Any:
+    value = getattr(state, name)
+    if name == "ao":
+        return value.model_dump() if value is not None else None
+    return value
+
+
+def _apply_scenario_value(state: EngineState, name: str, value: Any) -> None:
+    if name == "ao":
+        value = AOConfig(**value) if value is not None else None
+    setattr(state, name, value)
+
+
+# ============================================================
+# JOURNAL MODELS
+# ============================================================
+
+@dataclass
+class InputEvent:
+    """Scenario field change applied before executing tick `tick` + 1."""
+    tick: int
+    field: str
+    value: Any
+
+
+@dataclass
+class TickRecord:
+    """Recorded outcome of one executed tick."""
+    tick: int
+    utc: str
+    sha256: str
+
+
+@dataclass
+class InputJournal:
+    rng_seed: int
+    config: Dict[str, Any]
+    initial: Dict[str, Any]
+    clock: Dict[str, Any] = field(default_factory=dict)
+    events: List[InputEvent] = field(default_factory=list)
+    ticks: List[TickRecord] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InputJournal":
+        return cls(
+            rng_seed=int(data["rng_seed"]),
+            config=dict(data["config"]),
+            initial=dict(data["initial"]),
+            clock=dict(data.get("clock", {})),
+            events=[InputEvent(**e) for e in data.get("events", [])],
+            ticks=[TickRecord(**t) for t in data.get("ticks", [])],
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "InputJournal":
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+# ============================================================
+# RECORDING
+# ============================================================
+
+class JournalRecorder:
+    """
+    Records scenario inputs and audit hashes around StepEngine.step().
+
+    Call before_step() / after_step() around each step, or use step().
+    after_step() reads the tick's audit record, so with a
+    PipelinedStepEngine flush() the engine first (step() does).
+    """
+
+    def __init__(self, state: EngineState):
+        if state.tick != 0:
+            raise ValueError("JournalRecorder must start on a fresh run (tick 0)")
+        self._last = {name: _scenario_value(state, name) for name in SCENARIO_FIELDS}
+        self.journal = InputJournal(
+            rng_seed=int(state.rng_seed),
+            config=state.config.to_dict(),
+            initial=dict(self._last),
+            clock=state.clock.to_dict(),
+        )
+
+    def before_step(self, state: EngineState) -> None:
+        for name in SCENARIO_FIELDS:
+            value = _scenario_value(state, name)
+            if value != self._last[name]:
+                self.journal.events.append(InputEvent(tick=int(state.tick), field=name, value=value))
+                self._last[name] = value
+
+    def after_step(self, state: EngineState) -> None:
+        state.require_audit_current("JournalRecorder")
+        audit = state.audit_chain[-1]
+        self.journal.ticks.append(TickRecord(tick=int(audit.tick), utc=audit.utc, sha256=audit.sha256))
+
+    def step(self, engine: StepEngine, state: EngineState) -> EngineState:
+        self.before_step(state)
+        state = engine.step(state)
+        engine.flush()
+        self.after_step(state)
+        return state
+
+
+# ============================================================
+# REPLAY
+# ============================================================
+
+@dataclass
+class ReplayResult:
+    state: EngineState
+    ticks_replayed: int
+    mismatched_ticks: List[int] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatched_ticks
+
+    @property
+    def first_divergence(self) -> Optional[int]:
+        return self.mismatched_ticks[0] if self.mismatched_ticks else None
+
+
+class ReplayEngine:
+    """
+    Headless re-execution of an InputJournal.
+    """
+
+    def __init__(self, journal: InputJournal):
+        self.journal = journal
+        self.config = FusionConfig.from_dict(journal.config)
+
+    def _clock(self) -> Clock:
+        clock = clock_from_dict(self.journal.clock)
+        if clock is None:
+            clock = RecordedClock({t.tick: t.utc for t in self.journal.ticks})
+        return clock
+
+    def _fresh_state(self) -> EngineState:
+        state = EngineState(config=self.config, clock=self._clock())
+        state.rng_seed = self.journal.rng_seed
+        for name, value in self.journal.initial.items():
+            _apply_scenario_value(state, name, value)
+        return state
+
+    def seek(self, tick: int) -> EngineState:
+        """Run headlessly until the state has executed `tick` ticks."""
+        return self.run(until_tick=tick).state
+
+    def run(self, until_tick: Optional[int] = None) -> ReplayResult:
+        """
+        Replay the journal (or its first `until_tick` ticks) and diff the
+        regenerated audit hashes against the recorded ones.
+        """
+        last = self.journal.ticks[-1].tick if self.journal.ticks else 0
+        target = last if until_tick is None else int(until_tick)
+
+        events: Dict[int, List[InputEvent]] = {}
+        for ev in self.journal.events:
+            events.setdefault(ev.tick, []).append(ev)
+        expected = {t.tick: t.sha256 for t in self.journal.ticks}
+
+        state = self._fresh_state()
+        engine = StepEngine(self.config)
+        mismatched: List[int] = []
+
+        while state.tick < target:
+            for ev in events.get(state.tick, ()):
+                _apply_scenario_value(state, ev.field, ev.value)
+            engine.step(state)
+
+            sha = expected.get(state.tick)
+            if sha is not None and sha != state.audit_head:
+                mismatched.append(state.tick)
+
+        return ReplayResult(state=state, ticks_replayed=state.tick, mismatched_ticks=mismatched)
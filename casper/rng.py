@@ -0,0 +1,311 @@
+"""
+casper.rng
+==========
+
+Random streams for Casper_Fusion ticks.
+
+FusionConfig.rng_streams selects how a tick's draws are seeded:
+
+- "keyed" (default): every consumer draws from its own counter-based
+  Philox stream keyed by (run seed, stream name) with the tick in the
+  high counter words. Streams are independent, so adding, removing or
+  reordering a sensor leaves every other sensor's noise unchanged, and
+  streams can be generated in any order or concurrently. Neighbouring
+  seeds no longer share draws (seed s, tick t+1 vs seed s+1, tick t).
+- "sequential": one default_rng(rng_seed + tick) shared by every consumer
+  in a fixed order. This reproduces runs recorded before keyed streams.
+
+BatchStream draws one keyed stream for many seeds as array columns,
+bit-identical to keyed_generator; BatchStepEngine uses it in keyed mode.
+
+Stream names: "truth", "sensor/<first sensor id of a suite entry>",
+"targets" (multi-target mode).
+
+No UI dependencies.
+"""
+
+import functools
+import hashlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+RNG_STREAM_MODES = ("keyed", "sequential")
+
+_U64 = (1 << 64) - 1
+_EMPTY_BUFFER = np.zeros(4, dtype=np.uint64)
+
+
+def stream_id(name: str) -> int:
+    """Stable 64-bit id of a stream name (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _key(seed: int, name: str) -> np.ndarray:
+    return np.array([int(seed) & _U64, stream_id(name)], dtype=np.uint64)
+
+
+def _counter(tick: int) -> np.ndarray:
+    # Philox counters carry across words: each tick owns 2**128 blocks.
+    return np.array([0, 0, int(tick) & _U64, 0], dtype=np.uint64)
+
+
+def keyed_generator(seed: int, tick: int, name: str) -> np.random.Generator:
+    """Fresh generator positioned at the start of stream `name` for `tick`."""
+    return np.random.Generator(np.random.Philox(key=_key(seed, name), counter=_counter(tick)))
+
+
+class TickStreams:
+    """
+    The random streams of one tick.
+
+    Owned by an engine and re-keyed by begin() every tick; get(name)
+    returns the same generator for a name until the next begin(), so a
+    consumer calling it twice continues its stream. Generators are reused
+    across ticks (re-keying is far cheaper than constructing Philox).
+    """
+
+    def __init__(self, mode: str = "keyed"):
+        if mode not in RNG_STREAM_MODES:
+            raise ValueError(f"rng_streams must be one of {RNG_STREAM_MODES}, got {mode!r}")
+        self.mode = mode
+        self.seed = 0
+        self.tick = 0
+        self._shared: Optional[np.random.Generator] = None
+        self._generators: Dict[str, np.random.Generator] = {}
+        self._keys: Dict[str, np.ndarray] = {}
+        self._key_seed: Optional[int] = None
+        self._counter = _counter(0)
+        self._stamp: Dict[str, int] = {}
+        self._epoch = 0
+
+    @classmethod
+    def shared(cls, rng: np.random.Generator) -> "TickStreams":
+        """Every stream is `rng` (sequential semantics around an existing generator)."""
+        streams = cls("sequential")
+        streams._shared = rng
+        return streams
+
+    def begin(self, seed: int, tick: int) -> "TickStreams":
+        """Position every stream at the start of `tick` for run `seed`."""
+        self.seed = int(seed)
+        self.tick = int(tick)
+        self._epoch += 1
+        if self.mode == "sequential":
+            self._shared = np.random.default_rng(self.seed + self.tick)
+        else:
+            self._counter = _counter(self.tick)
+            if self.seed != self._key_seed:
+                self._keys.clear()
+                self._key_seed = self.seed
+        return self
+
+    def get(self, name: str) -> np.random.Generator:
+        if self._shared is not None:
+            return self._shared
+        if self._stamp.get(name) == self._epoch:
+            return self._generators[name]
+
+        key = self._keys.get(name)
+        if key is None:
+            key = self._keys[name] = _key(self.seed, name)
+        gen = self._generators.get(name)
+        if gen is None:
+            gen = self._generators[name] = np.random.Generator(np.random.Philox(key=key, counter=self._counter))
+        else:
+            # Re-keying in place is several times cheaper than a new Philox.
+            gen.bit_generator.state = {
+                "bit_generator": "Philox",
+                "state": {"counter": self._counter, "key": key},
+                "buffer": _EMPTY_BUFFER,
+                "buffer_pos": 4,
+                "has_uint32": 0,
+                "uinteger": 0,
+            }
+        self._stamp[name] = self._epoch
+        return gen
+
+
+# ============================================================
+# BATCHED KEYED STREAMS
+# ============================================================
+# numpy's Philox4x64-10 and the Generator transforms used by the engine
+# (random, uniform, normal), replayed column-wise over many seeds so one
+# stream can be drawn for every run of a batch in a few array operations.
+# Values are bit-identical to keyed_generator(seed, tick, name).
+
+_M32 = np.uint64(0xFFFFFFFF)
+_S32 = np.uint64(32)
+_PHILOX_M = (np.uint64(0xD2E7470EE14C6C93), np.uint64(0xCA5A826395121157))
+_PHILOX_W = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xBB67AE8584CAA73B))
+_PHILOX_ROUNDS = 10
+_DOUBLE_UNIT = 1.0 / 9007199254740992.0
+
+
+def _mulhi(a: np.uint64, b: np.ndarray) -> np.ndarray:
+    """High 64 bits of the 128-bit products a * b."""
+    a_lo, a_hi = a & _M32, a >> _S32
+    b_lo, b_hi = b & _M32, b >> _S32
+    lh, hl = a_lo * b_hi, a_hi * b_lo
+    mid = ((a_lo * b_lo) >> _S32) + (lh & _M32) + (hl & _M32)
+    return a_hi * b_hi + (lh >> _S32) + (hl >> _S32) + (mid >> _S32)
+
+
+def philox_raw(seeds: np.ndarray, name: str, tick: int, blocks: int) -> np.ndarray:
+    """
+    First 4 * `blocks` raw 64-bit outputs of stream `name` at `tick` for
+    every seed: (len(seeds), 4 * blocks) uint64, row i equal to
+    keyed_generator(seeds[i], tick, name).bit_generator.random_raw().
+    `seeds` must already be reduced to uint64.
+    """
+    n = len(seeds)
+    with np.errstate(over="ignore"):
+        # Philox pre-increments its counter: block b uses counter word 0 = b + 1.
+        c0 = np.repeat(np.arange(1, blocks + 1, dtype=np.uint64)[None, :], n, axis=0).ravel()
+        c1 = np.zeros_like(c0)
+        c2 = np.full_like(c0, int(tick) & _U64)
+        c3 = np.zeros_like(c0)
+        k0 = np.repeat(np.asarray(seeds, dtype=np.uint64), blocks)
+        k1 = np.uint64(stream_id(name))
+        for r in range(_PHILOX_ROUNDS):
+            if r:
+                k0 = k0 + _PHILOX_W[0]
+                k1 = k1 + _PHILOX_W[1]
+            lo0, lo1 = _PHILOX_M[0] * c0, _PHILOX_M[1] * c2
+            hi0, hi1 = _mulhi(_PHILOX_M[0], c0), _mulhi(_PHILOX_M[1], c2)
+            c0, c1, c2, c3 = hi1 ^ c1 ^ k0, lo1, hi0 ^ c3 ^ k1, lo0
+    return np.stack([c0, c1, c2, c3], axis=1).reshape(n, 4 * blocks)
+
+
+def _philox_state(key: np.ndarray, counter: np.ndarray, buffer: np.ndarray, buffer_pos: int) -> Dict:
+    return {
+        "bit_generator": "Philox",
+        "state": {"counter": counter, "key": key},
+        "buffer": buffer,
+        "buffer_pos": buffer_pos,
+        "has_uint32": 0,
+        "uinteger": 0,
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def ziggurat_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (ki, wi) of numpy's double ziggurat, read back from the installed numpy.
+
+    A Philox buffer word is returned verbatim by the next draw, so feeding
+    standard_normal() a word with layer `idx` and magnitude 1 returns
+    wi[idx] exactly, and bisecting the magnitude at which it stops
+    returning after a single word finds ki[idx]. Layers numpy never
+    accepts on the first word (ki == 0) keep wi == 0; they always take
+    the rejection path.
+    """
+    gen = np.random.Generator(np.random.Philox(key=np.zeros(2, dtype=np.uint64)))
+    zeros = np.zeros(4, dtype=np.uint64)
+
+    def first_word(idx: int, rabs: int) -> Tuple[bool, float]:
+        gen.bit_generator.state = _philox_state(
+            np.zeros(2, dtype=np.uint64), zeros, np.array([(rabs << 9) | idx, 0, 0, 0], dtype=np.uint64), 0
+        )
+        x = gen.standard_normal()
+        state = gen.bit_generator.state
+        # One word taken, and no fresh block (a rejection can wrap to position 1).
+        return state["buffer_pos"] == 1 and not state["state"]["counter"].any(), x
+
+    ki = np.zeros(256, dtype=np.uint64)
+    wi = np.zeros(256, dtype=float)
+    top = 1 << 52
+    for idx in range(256):
+        accepted, x = first_word(idx, 1)
+        if not accepted:
+            continue
+        wi[idx] = x
+        lo, hi = 1, top
+        if first_word(idx, top - 1)[0]:
+            ki[idx] = top
+            continue
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if first_word(idx, mid)[0]:
+                lo = mid
+            else:
+                hi = mid
+        ki[idx] = hi
+    return ki, wi
+
+
+class BatchStream:
+    """
+    One keyed stream at one tick for many seeds, drawn as columns.
+
+    Each draw takes `rows`, the indices of the runs making that call (the
+    branches of the scalar code), and advances only those rows, so row i
+    consumes exactly what keyed_generator(seeds[i], tick, name) would.
+    The ziggurat's rare rejection path is handed to numpy itself,
+    positioned at the row's offset. Rows that run past the `blocks`
+    precomputed Philox blocks are flagged in `overflow`; redo those with
+    the scalar generator.
+    """
+
+    def __init__(self, seeds: np.ndarray, name: str, tick: int, blocks: int = 3):
+        self.seeds = np.asarray(seeds, dtype=np.uint64)
+        self.name = name
+        self.tick = int(tick)
+        self.raw = philox_raw(self.seeds, name, tick, blocks)
+        self.pos = np.zeros(len(self.seeds), dtype=np.int64)
+        self.overflow = np.zeros(len(self.seeds), dtype=bool)
+        self._ki, self._wi = ziggurat_tables()
+        self._gen: Optional[np.random.Generator] = None
+
+    def _words(self, rows: np.ndarray) -> np.ndarray:
+        cap = self.raw.shape[1]
+        pos = self.pos[rows]
+        self.overflow[rows[pos >= cap]] = True
+        self.pos[rows] = pos + 1
+        return self.raw[rows, np.minimum(pos, cap - 1)]
+
+    def random(self, rows: np.ndarray) -> np.ndarray:
+        """Generator.random() per row."""
+        return (self._words(rows) >> np.uint64(11)).astype(float) * _DOUBLE_UNIT
+
+    def uniform(self, rows: np.ndarray, low: float, high: float) -> np.ndarray:
+        """Generator.uniform(low, high) per row."""
+        return low + (high - low) * self.random(rows)
+
+    def standard_normal(self, rows: np.ndarray) -> np.ndarray:
+        """Generator.standard_normal() per row."""
+        words = self._words(rows)
+        idx = (words & np.uint64(0xFF)).astype(np.intp)
+        r = words >> np.uint64(8)
+        rabs = (r >> np.uint64(1)) & np.uint64(0x000FFFFFFFFFFFFF)
+        x = rabs.astype(float) * self._wi[idx]
+        x = np.where((r & np.uint64(1)).astype(bool), -x, x)
+        for i in np.flatnonzero((rabs >= self._ki[idx]) & ~self.overflow[rows]):
+            x[i] = self._rejection(int(rows[i]))
+        return x
+
+    def normal(self, rows: np.ndarray, loc: float, scale: float) -> np.ndarray:
+        """Generator.normal(loc, scale) per row."""
+        return loc + scale * self.standard_normal(rows)
+
+    def normal_vector(self, rows: np.ndarray, loc: float, scale: np.ndarray) -> np.ndarray:
+        """Generator.normal(loc, scale) with a 1-D `scale`: (len(rows), len(scale))."""
+        return np.stack([loc + s * self.standard_normal(rows) for s in np.asarray(scale, dtype=float)], axis=1)
+
+    def _rejection(self, row: int) -> float:
+        # Rewind the row onto the word just taken and let numpy finish the draw.
+        at = int(self.pos[row]) - 1
+        block, within = divmod(at, 4)
+        if self._gen is None:
+            self._gen = np.random.Generator(np.random.Philox(key=np.zeros(2, dtype=np.uint64)))
+        self._gen.bit_generator.state = _philox_state(
+            _key(int(self.seeds[row]), self.name),
+            _counter(self.tick) + np.array([block + 1, 0, 0, 0], dtype=np.uint64),
+            self.raw[row, 4 * block:4 * block + 4].copy(),
+            within,
+        )
+        x = self._gen.standard_normal()
+        state = self._gen.bit_generator.state
+        self.pos[row] = (int(state["state"]["counter"][0]) - 1) * 4 + int(state["buffer_pos"])
+        return x
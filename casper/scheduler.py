@@ -0,0 +1,360 @@
+"""
+casper.scheduler
+================
+
+Real-time tick scheduling for Casper_Fusion.
+
+TickScheduler drives StepEngine.step on an asyncio event loop at a fixed
+cadence (FusionConfig.dt_seconds / speed), independent of any UI:
+- deadlines are absolute (start + k * period), so per-tick jitter does
+  not accumulate into drift
+- a tick that ends after the next deadline counts as a deadline miss;
+  the "skip" policy drops the missed slots, "catch_up" runs them back to
+  back (at most max_burst per wakeup)
+- lag (step start - deadline) is tracked in a LatencyHistogram
+
+After every tick the scheduler publishes an immutable TickFrame (latest
+telemetry, fused estimate, audit head, copies of the newest history rows)
+to a LatestValue channel. Publishing never blocks: readers see the most
+recent frame and skip any they were too slow for.
+
+Scenario edits from other threads go through apply(fn), which runs fn on
+the loop between ticks, so a tick never sees a half-applied change.
+
+run_in_thread() hosts the loop on a daemon thread for callers (like the
+Streamlit app) that have no event loop of their own.
+
+No UI dependencies.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from casper.buffers import SYSTEM_STATES
+from casper.instrumentation import LatencyHistogram
+from casper.models import FusedEstimate, TelemetryRecord
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+CATCH_UP_POLICIES = ("skip", "catch_up")
+
+
+# ============================================================
+# LATEST-VALUE CHANNEL
+# ============================================================
+
+class LatestValue:
+    """
+    Single-slot, overwrite-on-publish channel.
+
+    publish() never blocks. Readers either poll get() or wait for a version
+    newer than the one they last saw, synchronously (wait) or from any event
+    loop (wait_async). Safe across threads.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._version = 0
+        self._value: Any = None
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def publish(self, value: Any) -> int:
+        with self._cond:
+            self._version += 1
+            self._value = value
+            version = self._version
+            waiters, self._waiters = self._waiters, []
+            self._cond.notify_all()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, (version, value))
+        return version
+
+    def get(self) -> Tuple[int, Any]:
+        """(version, value) of the newest publication; (0, None) before the first."""
+        with self._cond:
+            return self._version, self._value
+
+    def wait(self, after: int = 0, timeout: Optional[float] = None) -> Tuple[int, Any]:
+        """Block until a version newer than `after` exists (or timeout)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._version > after, timeout=timeout)
+            return self._version, self._value
+
+    async def wait_async(self, after: int = 0) -> Tuple[int, Any]:
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self._version > after:
+                return self._version, self._value
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        return await future
+
+
+def _resolve(future: asyncio.Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+# ============================================================
+# FRAMES / STATS
+# ============================================================
+
+@dataclass(frozen=True)
+class TickFrame:
+    """What consumers see after a tick. Arrays are copies, never live buffer views."""
+    tick: int
+    telemetry: Optional[TelemetryRecord]
+    fused: Optional[FusedEstimate]
+    audit_head: str
+    audit_length: int
+    recent: Dict[str, np.ndarray] = field(default_factory=dict)
+    lag_s: float = 0.0
+
+    def recent_frame(self, n: Optional[int] = None):
+        """pandas DataFrame of the newest `n` recent rows, state as its label."""
+        import pandas as pd
+
+        data = {name: values[-n:] if n else values for name, values in self.recent.items()}
+        if "state" in data:
+            data["state"] = np.array([s.value for s in SYSTEM_STATES], dtype=object)[data["state"]]
+        return pd.DataFrame(data)
+
+
+def make_frame(state: EngineState, recent: int = 0, lag_s: float = 0.0) -> TickFrame:
+    window = state.history.window(recent) if recent else {}
+    return TickFrame(
+        tick=int(state.tick),
+        telemetry=state.history[-1] if state.history else None,
+        fused=state.fused,
+        audit_head=state.audit_head,
+        audit_length=len(state.audit_chain),
+        recent={name: values.copy() for name, values in window.items()},
+        lag_s=lag_s,
+    )
+
+
+@dataclass
+class SchedulerStats:
+    ticks: int = 0
+    deadline_misses: int = 0
+    skipped_slots: int = 0
+    last_lag_s: float = 0.0
+    max_lag_s: float = 0.0
+    lag: LatencyHistogram = field(default_factory=LatencyHistogram)
+    step: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "deadline_misses": self.deadline_misses,
+            "skipped_slots": self.skipped_slots,
+            "last_lag_ms": self.last_lag_s * 1e3,
+            "max_lag_ms": self.max_lag_s * 1e3,
+            "lag": self.lag.summary(),
+            "step": self.step.summary(),
+        }
+
+
+# ============================================================
+# SCHEDULER
+# ============================================================
+
+class TickScheduler:
+    """
+    Fixed-cadence asyncio driver for StepEngine.
+
+    step_fn defaults to engine.step; pass e.g.
+    `lambda s: recorder.step(engine, s)` to journal the run.
+    """
+
+    def __init__(
+        self,
+        engine: StepEngine,
+        state: EngineState,
+        speed: float = 1.0,
+        period_s: Optional[float] = None,
+        policy: str = "skip",
+        max_burst: int = 8,
+        recent: int = 100,
+        step_fn: Optional[Callable[[EngineState], EngineState]] = None,
+        channel: Optional[LatestValue] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if policy not in CATCH_UP_POLICIES:
+            raise ValueError(f"policy must be one of {CATCH_UP_POLICIES}, got {policy!r}")
+        self.engine = engine
+        self.state = state
+        self.policy = policy
+        self.max_burst = max(1, int(max_burst))
+        self.recent = int(recent)
+        self.step_fn = step_fn or engine.step
+        self.channel = channel or LatestValue()
+        self.stats = SchedulerStats()
+        self._clock = clock
+        self._period = float(period_s) if period_s is not None else state.config.dt_seconds / float(speed)
+
+        self._commands: Deque[Callable[[EngineState], Any]] = deque()
+        self._paused = False
+        self._stopped = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # --------------------------------------------------
+    # Control (thread-safe)
+    # --------------------------------------------------
+    @property
+    def period_s(self) -> float:
+        return self._period
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def set_speed(self, speed: float) -> None:
+        self.set_period(self.state.config.dt_seconds / float(speed))
+
+    def set_period(self, period_s: float) -> None:
+        self._period = float(period_s)
+        self._notify()
+
+    def apply(self, fn: Callable[[EngineState], Any]) -> None:
+        """Run fn(state) on the scheduler loop before the next tick."""
+        self._commands.append(fn)
+        self._notify()
+
+    def pause(self) -> None:
+        self._paused = True
+        self._notify()
+
+    def resume(self) -> None:
+        self._paused = False
+        self._notify()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._notify()
+
+    def _notify(self) -> None:
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    # --------------------------------------------------
+    # Loop
+    # --------------------------------------------------
+    def _drain_commands(self) -> None:
+        if not self._commands:
+            return
+        while self._commands:
+            self._commands.popleft()(self.state)
+        self.channel.publish(make_frame(self.state, self.recent))
+
+    async def _sleep_until(self, deadline: float) -> None:
+        """Sleep until `deadline`, waking early on control changes."""
+        delay = deadline - self._clock()
+        if delay <= 0:
+            return
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _tick(self, deadline: float) -> None:
+        started = self._clock()
+        lag = max(0.0, started - deadline)
+        self.state = self.step_fn(self.state)
+        elapsed = self._clock() - started
+
+        stats = self.stats
+        stats.ticks += 1
+        stats.last_lag_s = lag
+        stats.max_lag_s = max(stats.max_lag_s, lag)
+        stats.lag.add(int(lag * 1e9))
+        stats.step.add(int(elapsed * 1e9))
+        self.channel.publish(make_frame(self.state, self.recent, lag))
+
+    async def run(self, max_ticks: Optional[int] = None) -> SchedulerStats:
+        """
+        Drive ticks until stop() (or `max_ticks` ticks). A stop() issued
+        before the loop starts is honoured, so a caller stopping a thread
+        it has just launched cannot lose the request.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self.channel.publish(make_frame(self.state, self.recent))
+
+        deadline = self._clock()
+        ran = 0
+        try:
+            while not self._stopped and (max_ticks is None or ran < max_ticks):
+                self._drain_commands()
+                if self._paused:
+                    self._wake.clear()
+                    await self._wake.wait()
+                    deadline = self._clock()  # resume on a fresh schedule
+                    continue
+
+                await self._sleep_until(deadline)
+                if self._stopped:
+                    break
+                if self._clock() < deadline or self._paused or self._commands:
+                    continue  # woken early by a control change
+
+                self._drain_commands()
+                self._tick(deadline)
+                ran += 1
+                deadline = self._next_deadline(deadline)
+        finally:
+            self._loop = None
+            self._wake = None
+        return self.stats
+
+    def _next_deadline(self, deadline: float) -> float:
+        period = self._period
+        nxt = deadline + period
+        now = self._clock()
+        if now <= nxt:
+            return nxt
+
+        missed = int((now - nxt) // period) + 1
+        self.stats.deadline_misses += 1
+        if self.policy == "catch_up" and missed <= self.max_burst:
+            return nxt
+        # Drop the slots we cannot make; the next tick starts on the grid.
+        self.stats.skipped_slots += missed
+        return nxt + missed * period
+
+    # --------------------------------------------------
+    # Threaded hosting
+    # --------------------------------------------------
+    def run_in_thread(self, max_ticks: Optional[int] = None) -> threading.Thread:
+        """Run the scheduler on its own event loop in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self.run(max_ticks)),
+            name="casper-scheduler",
+            daemon=True,
+        )
+        self._thread.start()
+        return self._thread
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def latest(self) -> Optional[TickFrame]:
+        return self.channel.get()[1]
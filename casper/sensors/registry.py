@@ -0,0 +1,473 @@
+"""
+casper.sensors.registry
+=======================
+
+Declarative sensor suites for Casper_Fusion.
+
+A suite is a list of plain specs (FusionConfig.sensor_suite), one per
+sensor model:
+
+    {"type": "RADAR", "count": 40, "params": {"availability": 0.7}}
+
+- type    registered model name (SensorType value)
+- count   number of instances (default: len(ids), else 1)
+- ids     explicit sensor ids; otherwise "<prefix>_<n>", n from 1
+- prefix  id stem (default: the type name)
+- params  overrides of the model's defaults; each value is either shared
+          by every instance or given per instance (leading axis = count)
+
+Each spec becomes one SensorModel whose generate() draws the noise of all
+its instances with array calls and returns a columnar SensorBlock, so the
+cost of a tick grows with the number of sensor types, not sensors.
+
+With keyed streams (casper.rng) each suite entry draws from its own
+stream, "sensor/<first id>": entries are independent of each other, and
+the instances of one entry share that entry's stream. Declare sensors as
+separate entries when their noise must not depend on the entry's count.
+
+For count=1 every model makes exactly the generator calls the original
+per-sensor simulator made, in the same order: with "sequential" streams
+the default suite reproduces earlier runs bit for bit.
+
+New models register with @register_sensor_model.
+
+No UI dependencies.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Type
+
+import numpy as np
+
+from casper.models import Measurement, MeasurementRecord, SensorMeasurement, SensorType
+from casper.presets import EnvProfile
+
+
+_SPEC_KEYS = {"type", "count", "ids", "prefix", "params"}
+_DIAG = np.arange(3)
+
+
+# ============================================================
+# CONTEXT / BLOCKS
+# ============================================================
+
+@dataclass
+class SensorContext:
+    """Inputs shared by every model during one tick."""
+    tick: int
+    utc: str
+    truth: Dict[str, float]
+    env: EnvProfile
+    # Link state of the first LINK sensor (None until a LINK model has run)
+    comms_loss: Optional[float] = None
+    position: np.ndarray = field(init=False)  # truth lat, lon, altitude_m
+
+    def __post_init__(self):
+        self.position = np.array([self.truth["lat"], self.truth["lon"], self.truth["altitude_m"]], dtype=float)
+
+
+@dataclass
+class SensorBlock:
+    """
+    Columnar measurements of one sensor model for one tick (n rows).
+    """
+    tick: int
+    utc: str
+    sensor_type: SensorType
+    sensor_ids: List[str]
+    z: np.ndarray            # (n, 3)
+    R: np.ndarray            # (n, 3, 3)
+    quality: np.ndarray      # (n,)
+    latency_ms: np.ndarray   # (n,)
+    dropped: np.ndarray      # (n,) bool
+    meta: List[Dict[str, Any]]
+
+    def __len__(self) -> int:
+        return len(self.sensor_ids)
+
+    def records(self, strict: bool = False) -> List[Measurement]:
+        """One record per row (validated SensorMeasurement when strict)."""
+        cls = SensorMeasurement if strict else MeasurementRecord
+        return [
+            cls(
+                tick=self.tick,
+                utc_timestamp=self.utc,
+                sensor_id=sensor_id,
+                sensor_type=self.sensor_type,
+                z=z,
+                R=R,
+                quality=quality,
+                latency_ms=latency,
+                dropped=dropped,
+                meta=meta,
+            )
+            for sensor_id, z, R, quality, latency, dropped, meta in zip(
+                self.sensor_ids,
+                self.z.copy(),
+                self.R.copy(),
+                self.quality.tolist(),
+                self.latency_ms.tolist(),
+                self.dropped.tolist(),
+                self.meta,
+            )
+        ]
+
+
+# Small-array helpers. Both give the same values as np.clip /
+# rng.normal(0, scale) without their per-call overhead.
+
+def _clip(x, lo, hi):
+    return np.minimum(np.maximum(x, lo), hi)
+
+
+def _normal(rng: np.random.Generator, std: np.ndarray) -> np.ndarray:
+    """One N(0, std) draw per element of `std`, in C order."""
+    return rng.standard_normal(std.shape) * std
+
+
+def _diag(var: np.ndarray) -> np.ndarray:
+    """(n, 3) variances -> (n, 3, 3) diagonal covariances."""
+    R = np.zeros((var.shape[0], 3, 3), dtype=float)
+    R[:, _DIAG, _DIAG] = var
+    return R
+
+
+def _frozen(a: np.ndarray) -> np.ndarray:
+    a = np.array(a, dtype=a.dtype)
+    a.flags.writeable = False
+    return a
+
+
+# ============================================================
+# MODELS
+# ============================================================
+
+class SensorModel:
+    """
+    All instances of one sensor type.
+
+    Subclasses set sensor_type and defaults and implement generate().
+    Parameters are stored as read-only arrays of shape
+    (count, *default shape) in `p`; per-tick constants (covariances,
+    constant columns) are precomputed in __init__ and shared by blocks.
+    """
+
+    sensor_type: ClassVar[SensorType]
+    defaults: ClassVar[Dict[str, Any]] = {}
+
+    def __init__(self, ids: Sequence[str], params: Optional[Dict[str, Any]] = None):
+        params = dict(params or {})
+        unknown = sorted(set(params) - set(self.defaults))
+        if unknown:
+            raise ValueError(f"Unknown {self.sensor_type.value} parameters: {unknown}")
+
+        self.ids: List[str] = list(ids)
+        # Keyed random stream (casper.rng); stable while the first id is
+        # unchanged. Streams are per suite entry, not per sensor.
+        self.stream = f"sensor/{self.ids[0] if self.ids else self.sensor_type.value}"
+        self.params: Dict[str, Any] = {**self.defaults, **params}
+        n = len(self.ids)
+        self.p: Dict[str, np.ndarray] = {}
+        for name, value in self.params.items():
+            try:
+                values = np.broadcast_to(np.asarray(value, dtype=float), (n,) + np.shape(self.defaults[name]))
+            except ValueError:
+                raise ValueError(
+                    f"{self.sensor_type.value} parameter {name!r}: expected one value of shape "
+                    f"{np.shape(self.defaults[name])} or {n} of them"
+                ) from None
+            self.p[name] = _frozen(values)
+
+        self._rows = np.arange(n)
+        self._never = _frozen(np.zeros(n, dtype=bool))
+
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+    def generate(self, ctx: SensorContext, rng: np.random.Generator) -> SensorBlock:
+        raise NotImplementedError
+
+    def _latency(self, rng: np.random.Generator, spec: np.ndarray) -> np.ndarray:
+        """Clipped normal latency per row; spec rows are (mean, std, lo, hi)."""
+        return _clip(spec[:, 0] + _normal(rng, spec[:, 1]), spec[:, 2], spec[:, 3])
+
+    def _block(self, ctx: SensorContext, ids, z, R, quality, latency_ms, dropped, meta) -> SensorBlock:
+        return SensorBlock(
+            tick=ctx.tick,
+            utc=ctx.utc,
+            sensor_type=self.sensor_type,
+            sensor_ids=ids,
+            z=z,
+            R=R,
+            quality=quality,
+            latency_ms=latency_ms,
+            dropped=dropped,
+            meta=meta,
+        )
+
+
+SENSOR_MODELS: Dict[str, Type[SensorModel]] = {}
+
+
+def register_sensor_model(cls: Type[SensorModel]) -> Type[SensorModel]:
+    """Class decorator: make `cls` available to suite specs under its type name."""
+    SENSOR_MODELS[cls.sensor_type.value] = cls
+    return cls
+
+
+@register_sensor_model
+class LinkModel(SensorModel):
+    """Datalink latency + comms loss."""
+
+    sensor_type = SensorType.LINK
+    defaults = {
+        "loss_base": 0.02,
+        "loss_per_latency": 0.08,
+        "r_diag": (25.0, 0.05, 1.0),
+    }
+
+    def __init__(self, ids, params=None):
+        super().__init__(ids, params)
+        self._R = _frozen(_diag(self.p["r_diag"]))
+
+    def generate(self, ctx, rng):
+        env, p, n = ctx.env, self.p, self.count
+        latency = _clip(env.latency_base + rng.standard_normal(n) * env.latency_jitter, 40.0, 800.0)
+        comms_loss = (rng.random(n) < (p["loss_base"] + p["loss_per_latency"] * (latency / 600.0))).astype(float)
+        losses = comms_loss.tolist()
+        if ctx.comms_loss is None and n:
+            ctx.comms_loss = losses[0]
+
+        z = np.zeros((n, 3), dtype=float)
+        z[:, 0] = latency
+        z[:, 1] = comms_loss
+        return self._block(
+            ctx, self.ids, z, self._R,
+            quality=_clip(1.0 - latency / 900.0, 0.1, 1.0),
+            latency_ms=latency,
+            dropped=self._never,
+            meta=[{"comms_loss": c} for c in losses],
+        )
+
+
+@register_sensor_model
+class ImuModel(SensorModel):
+    """Gyro drift proxy."""
+
+    sensor_type = SensorType.IMU
+    defaults = {
+        "drift_base": 0.02,
+        "drift_std": 0.01,
+        "latency": (20.0, 8.0, 5.0, 60.0),
+    }
+
+    def __init__(self, ids, params=None):
+        super().__init__(ids, params)
+        self._R = _frozen(_diag(np.tile([0.0004, 1.0, 1.0], (self.count, 1))))
+
+    def generate(self, ctx, rng):
+        p = self.p
+        drift = _clip(p["drift_base"] + ctx.env.imu_drift_bias + np.abs(_normal(rng, p["drift_std"])), 0.005, 0.12)
+
+        z = np.zeros((self.count, 3), dtype=float)
+        z[:, 0] = drift
+        return self._block(
+            ctx, self.ids, z, self._R,
+            quality=_clip(1.0 - drift / 0.15, 0.2, 1.0),
+            latency_ms=self._latency(rng, p["latency"]),
+            dropped=self._never,
+            meta=[{"imu_drift_deg_s": d} for d in drift.tolist()],
+        )
+
+
+@register_sensor_model
+class BaroModel(SensorModel):
+    """Barometric altitude."""
+
+    sensor_type = SensorType.BARO
+    defaults = {
+        "std": 7.0,
+        "quality": 0.85,
+        "latency": (30.0, 10.0, 5.0, 80.0),
+    }
+
+    def __init__(self, ids, params=None):
+        super().__init__(ids, params)
+        var = np.ones((self.count, 3), dtype=float)
+        var[:, 0] = self.p["std"] ** 2
+        self._R = _frozen(_diag(var))
+
+    def generate(self, ctx, rng):
+        p = self.p
+        altitude = ctx.truth["altitude_m"] + _normal(rng, p["std"])
+
+        z = np.zeros((self.count, 3), dtype=float)
+        z[:, 0] = altitude
+        return self._block(
+            ctx, self.ids, z, self._R,
+            quality=p["quality"],
+            latency_ms=self._latency(rng, p["latency"]),
+            dropped=self._never,
+            meta=[{"altitude_m_baro": a} for a in altitude.tolist()],
+        )
+
+
+@register_sensor_model
+class GnssModel(SensorModel):
+    """Position fix with jamming drops and spoofing bias."""
+
+    sensor_type = SensorType.GNSS
+    defaults = {
+        "base_std": (0.00025, 0.00025, 3.5),
+        "jam_std": (0.0012, 0.0012, 15.0),
+        "spoof_std": (0.002, 0.002, 10.0),
+        "drop_base": 0.02,
+        "latency": (90.0, 25.0, 40.0, 220.0),
+        "drop_latency": (120.0, 35.0, 60.0, 300.0),
+    }
+
+    def __init__(self, ids, params=None):
+        super().__init__(ids, params)
+        self._latency_spec = _frozen(np.stack([self.p["latency"], self.p["drop_latency"]]))
+
+    def generate(self, ctx, rng):
+        p, n = self.p, self.count
+        jam = float(ctx.env.gnss_jam_factor)
+        std = p["base_std"] + p["jam_std"] * jam
+
+        drop = rng.random(n) < (p["drop_base"] + jam * 0.25)
+        keep = ~drop
+
+        z = np.empty((n, 3), dtype=float)
+        z[:] = ctx.position
+        fixes = z[keep] + _normal(rng, std[keep])
+        spoofed = rng.random(fixes.shape[0]) < jam * 0.15
+        if spoofed.any():
+            fixes[spoofed] += _normal(rng, p["spoof_std"][keep][spoofed])
+        z[keep] = fixes
+
+        drops = drop.tolist()
+        return self._block(
+            ctx, self.ids, z, _diag(std**2),
+            quality=keep * _clip(0.95 - jam * 0.6, 0.15, 0.95),
+            latency_ms=self._latency(rng, self._latency_spec[drop.astype(np.intp), self._rows]),
+            dropped=drop,
+            meta=[
+                {"dropped_reason": "synthetic_jam_drop", "jam_factor": jam} if d else {"jam_factor": jam}
+                for d in drops
+            ],
+        )
+
+
+@register_sensor_model
+class EoirModel(SensorModel):
+    """EO/IR position proxy, degraded by weather and comms loss."""
+
+    sensor_type = SensorType.EOIR
+    defaults = {
+        "base_std": (0.0006, 0.0006, 8.0),
+        "degrade_std": (0.0013, 0.0013, 20.0),
+        "drop_base": 0.03,
+        "latency": (140.0, 45.0, 60.0, 320.0),
+        "drop_latency": (180.0, 55.0, 80.0, 400.0),
+    }
+
+    def __init__(self, ids, params=None):
+        super().__init__(ids, params)
+        self._latency_spec = _frozen(np.stack([self.p["latency"], self.p["drop_latency"]]))
+
+    def generate(self, ctx, rng):
+        p, n = self.p, self.count
+        degrade = float(ctx.env.eoir_degrade)
+        comms_loss = ctx.comms_loss or 0.0
+        std = p["base_std"] + p["degrade_std"] * degrade
+
+        drop = rng.random(n) < (p["drop_base"] + degrade * 0.22 + comms_loss * 0.15)
+        keep = ~drop
+
+        z = np.empty((n, 3), dtype=float)
+        z[:] = ctx.position
+        z[keep] += _normal(rng, std[keep])
+        hot = _clip(ctx.truth.get("vision_hot_ratio", 0.10) + rng.standard_normal(int(keep.sum())) * 0.03, 0.0, 1.0)
+
+        hot_iter = iter(hot.tolist())
+        return self._block(
+            ctx, self.ids, z, _diag(std**2),
+            quality=keep * _clip(0.82 - degrade * 0.55 - comms_loss * 0.2, 0.1, 0.85),
+            latency_ms=self._latency(rng, self._latency_spec[drop.astype(np.intp), self._rows]),
+            dropped=drop,
+            meta=[
+                {"dropped_reason": "synthetic_eoir_drop"} if d else {"hot_ratio": next(hot_iter)}
+                for d in drop.tolist()
+            ],
+        )
+
+
+@register_sensor_model
+class RadarModel(SensorModel):
+    """Position proxy, intermittently available (absent, not dropped)."""
+
+    sensor_type = SensorType.RADAR
+    defaults = {
+        "std": (0.00045, 0.00045, 6.5),
+        "availability": 0.55,
+        "quality": 0.75,
+        "latency": (110.0, 35.0, 50.0, 280.0),
+    }
+
+    def __init__(self, ids, params=None):
+        super().__init__(ids, params)
+        self._R = _frozen(_diag(self.p["std"] ** 2))
+
+    def generate(self, ctx, rng):
+        p = self.p
+        rows = np.flatnonzero(rng.random(self.count) < p["availability"])
+
+        z = ctx.position + _normal(rng, p["std"][rows])
+        return self._block(
+            ctx, [self.ids[i] for i in rows.tolist()], z, self._R[rows],
+            quality=p["quality"][rows],
+            latency_ms=self._latency(rng, p["latency"][rows]),
+            dropped=self._never[:rows.size],
+            meta=[{} for _ in range(rows.size)],
+        )
+
+
+# ============================================================
+# SUITES
+# ============================================================
+
+def suite_ids(spec: Dict[str, Any]) -> List[str]:
+    """Sensor ids a spec expands to."""
+    ids = spec.get("ids")
+    count = spec.get("count", len(ids) if ids is not None else 1)
+    if ids is not None:
+        if len(ids) != count:
+            raise ValueError(f"Sensor spec {spec!r}: {len(ids)} ids for count={count}")
+        return [str(i) for i in ids]
+    if count < 0:
+        raise ValueError(f"Sensor spec {spec!r}: count must be >= 0")
+    prefix = spec.get("prefix", spec["type"])
+    return [f"{prefix}_{i + 1}" for i in range(count)]
+
+
+def build_suite(specs: Sequence[Dict[str, Any]]) -> List[SensorModel]:
+    """Instantiate one SensorModel per spec, in suite (= draw) order."""
+    models: List[SensorModel] = []
+    seen: Dict[str, int] = {}
+    for index, spec in enumerate(specs):
+        unknown = sorted(set(spec) - _SPEC_KEYS)
+        if unknown:
+            raise ValueError(f"Sensor spec {index}: unknown keys {unknown}")
+        cls = SENSOR_MODELS.get(spec.get("type"))
+        if cls is None:
+            raise ValueError(f"Sensor spec {index}: unknown type {spec.get('type')!r}; registered: {sorted(SENSOR_MODELS)}")
+
+        ids = suite_ids(spec)
+        for sensor_id in ids:
+            if sensor_id in seen:
+                raise ValueError(f"Sensor id {sensor_id!r} used by specs {seen[sensor_id]} and {index}")
+            seen[sensor_id] = index
+        models.append(cls(ids, spec.get("params")))
+    return models
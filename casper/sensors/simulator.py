@@ -4,7 +4,9 @@ casper.sensors.simulator
 
 Synthetic sensor simulator for Casper_Fusion.
 
-Generates SensorMeasurement records per tick:
+Generates measurements per tick from the sensor suite declared in
+FusionConfig.sensor_suite (see casper.sensors.registry). The default suite
+is one of each:
 - LINK (latency + comms loss)
 - IMU (drift proxy)
 - BARO (altitude)
@@ -12,224 +14,150 @@ Generates SensorMeasurement records per tick:
 - EOIR (position-ish proxy w/ degrade)
 - RADAR (position-ish proxy intermittent)
 
+simulate_blocks() returns one columnar SensorBlock per suite entry (what
+StepEngine consumes); simulate_all() returns one record per measurement
+(MeasurementRecord, or validated SensorMeasurement when
+FusionConfig.strict_models is set).
+
+simulate_targets() covers the multi-target mode: GNSS/EOIR/RADAR position
+reports for N targets at once, returned as columnar TargetMeasurements.
+
 This is recon-only synthetic telemetry.
 """
 
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, List, Union
 
 import numpy as np
 
 from casper.config import FusionConfig
-from casper.models import SensorMeasurement, SensorType
+from casper.models import Measurement, SensorType
 from casper.presets import EnvProfile
+from casper.rng import TickStreams
+from casper.sensors.registry import SensorBlock, SensorContext, SensorModel, build_suite
 from casper.state import EngineState
 
 
+# Position sensors reporting on every target in multi-target mode, in
+# emission order. Index into this tuple = TargetMeasurements.sensor code.
+TARGET_SENSORS = (SensorType.GNSS, SensorType.EOIR, SensorType.RADAR)
+
+
+@dataclass
+class TargetMeasurements:
+    """
+    Columnar position reports for one multi-target tick (M rows).
+
+    `target` is the ground-truth index that produced each row; trackers
+    must not use it (it exists for scoring association).
+    """
+    tick: int
+    sensor: np.ndarray       # (M,) int8, index into TARGET_SENSORS
+    target: np.ndarray       # (M,) int64
+    z: np.ndarray            # (M, 3) lat, lon, altitude_m
+    R: np.ndarray            # (M, 3, 3)
+    quality: np.ndarray      # (M,)
+    latency_ms: np.ndarray   # (M,)
+
+    def __len__(self) -> int:
+        return int(self.sensor.shape[0])
+
+
 class SensorSimulator:
+    """
+    Runs the configured sensor suite (FusionConfig.sensor_suite) and the
+    multi-target position sensors.
+    """
+
     def __init__(self, config: FusionConfig):
         self.config = config
+        self.suite: List[SensorModel] = build_suite(config.sensor_suite)
 
     # --------------------------------------------------
-    # Individual sensors
+    # Sensor suite
     # --------------------------------------------------
-    def simulate_link(
-        self,
-        state: EngineState,
-        env: EnvProfile,
-        rng: np.random.Generator,
-    ) -> SensorMeasurement:
-        link_latency = float(
-            np.clip(env.latency_base + rng.normal(0, env.latency_jitter), 40, 800)
-        )
-        comms_loss = 1.0 if rng.random() < (0.02 + 0.08 * (link_latency / 600.0)) else 0.0
-
-        return SensorMeasurement(
-            tick=state.tick + 1,
-            utc_timestamp=state.utc(),
-            sensor_id="LINK_1",
-            sensor_type=SensorType.LINK,
-            z=np.array([link_latency, comms_loss, 0.0], dtype=float),
-            R=np.diag([25.0, 0.05, 1.0]),
-            quality=float(np.clip(1.0 - link_latency / 900.0, 0.1, 1.0)),
-            latency_ms=link_latency,
-            dropped=False,
-            meta={"comms_loss": float(comms_loss)},
-        )
-
-    def simulate_imu(
-        self,
-        state: EngineState,
-        env: EnvProfile,
-        rng: np.random.Generator,
-    ) -> SensorMeasurement:
-        imu_drift = float(
-            np.clip(
-                0.02 + env.imu_drift_bias + abs(rng.normal(0, 0.01)),
-                0.005,
-                0.12,
-            )
-        )
-        return SensorMeasurement(
-            tick=state.tick + 1,
-            utc_timestamp=state.utc(),
-            sensor_id="IMU_1",
-            sensor_type=SensorType.IMU,
-            z=np.array([imu_drift, 0.0, 0.0], dtype=float),
-            R=np.diag([0.0004, 1.0, 1.0]),
-            quality=float(np.clip(1.0 - imu_drift / 0.15, 0.2, 1.0)),
-            latency_ms=float(np.clip(20 + rng.normal(0, 8), 5, 60)),
-            dropped=False,
-            meta={"imu_drift_deg_s": float(imu_drift)},
-        )
-
-    def simulate_baro(
-        self,
-        state: EngineState,
-        truth: Dict[str, float],
-        rng: np.random.Generator,
-    ) -> SensorMeasurement:
-        baro_noise = float(rng.normal(0, 7.0))
-        alt_baro = float(truth["altitude_m"] + baro_noise)
-        return SensorMeasurement(
-            tick=state.tick + 1,
-            utc_timestamp=state.utc(),
-            sensor_id="BARO_1",
-            sensor_type=SensorType.BARO,
-            z=np.array([alt_baro, 0.0, 0.0], dtype=float),
-            R=np.diag([49.0, 1.0, 1.0]),
-            quality=0.85,
-            latency_ms=float(np.clip(30 + rng.normal(0, 10), 5, 80)),
-            dropped=False,
-            meta={"altitude_m_baro": alt_baro},
-        )
-
-    def simulate_gnss(
+    def simulate_blocks(
         self,
         state: EngineState,
         truth: Dict[str, float],
         env: EnvProfile,
-        rng: np.random.Generator,
-    ) -> SensorMeasurement:
-        gnss_drop = rng.random() < (0.02 + env.gnss_jam_factor * 0.25)
-
-        base_std = np.array([0.00025, 0.00025, 3.5], dtype=float)
-        jam_std = np.array([0.0012, 0.0012, 15.0], dtype=float) * float(env.gnss_jam_factor)
-        std = base_std + jam_std
-
-        z_true = np.array([truth["lat"], truth["lon"], truth["altitude_m"]], dtype=float)
-
-        if gnss_drop:
-            return SensorMeasurement(
-                tick=state.tick + 1,
-                utc_timestamp=state.utc(),
-                sensor_id="GNSS_A",
-                sensor_type=SensorType.GNSS,
-                z=z_true,
-                R=np.diag(std**2),
-                quality=0.0,
-                latency_ms=float(np.clip(120 + rng.normal(0, 35), 60, 300)),
-                dropped=True,
-                meta={"dropped_reason": "synthetic_jam_drop", "jam_factor": float(env.gnss_jam_factor)},
-            )
-
-        noise = rng.normal(0, std)
-
-        spoof_bias = np.array([0.0, 0.0, 0.0], dtype=float)
-        if rng.random() < float(env.gnss_jam_factor) * 0.15:
-            spoof_bias = rng.normal(0, np.array([0.002, 0.002, 10.0], dtype=float))
-
-        z = z_true + noise + spoof_bias
-        R = np.diag(std**2)
-
-        quality = float(np.clip(0.95 - float(env.gnss_jam_factor) * 0.6, 0.15, 0.95))
+        rng: Union[np.random.Generator, TickStreams],
+    ) -> List[SensorBlock]:
+        """
+        Columnar measurements for tick + 1, one SensorBlock per suite entry.
+
+        `rng` is either the tick's TickStreams (each entry draws from its
+        own stream) or one generator shared by all entries in suite order.
+        In strict mode every row is validated as a SensorMeasurement.
+        """
+        streams = TickStreams.shared(rng) if isinstance(rng, np.random.Generator) else rng
+        ctx = SensorContext(tick=state.tick + 1, utc=state.utc(), truth=truth, env=env)
+        blocks = [model.generate(ctx, streams.get(model.stream)) for model in self.suite]
+        if self.config.strict_models:
+            for block in blocks:
+                block.records(strict=True)
+        return blocks
 
-        return SensorMeasurement(
-            tick=state.tick + 1,
-            utc_timestamp=state.utc(),
-            sensor_id="GNSS_A",
-            sensor_type=SensorType.GNSS,
-            z=z.astype(float),
-            R=R.astype(float),
-            quality=quality,
-            latency_ms=float(np.clip(90 + rng.normal(0, 25), 40, 220)),
-            dropped=False,
-            meta={"jam_factor": float(env.gnss_jam_factor)},
-        )
-
-    def simulate_eoir(
+    # --------------------------------------------------
+    # Multi-target position reports
+    # --------------------------------------------------
+    def simulate_targets(
         self,
-        state: EngineState,
-        truth: Dict[str, float],
+        tick: int,
+        positions: np.ndarray,
         env: EnvProfile,
         rng: np.random.Generator,
-        comms_loss: float,
-    ) -> SensorMeasurement:
-        eoir_drop = rng.random() < (0.03 + float(env.eoir_degrade) * 0.22 + comms_loss * 0.15)
-
-        base_std = np.array([0.0006, 0.0006, 8.0], dtype=float)
-        degrade_std = np.array([0.0013, 0.0013, 20.0], dtype=float) * float(env.eoir_degrade)
-        std = base_std + degrade_std
-
-        z_true = np.array([truth["lat"], truth["lon"], truth["altitude_m"]], dtype=float)
-
-        if eoir_drop:
-            return SensorMeasurement(
-                tick=state.tick + 1,
-                utc_timestamp=state.utc(),
-                sensor_id="EOIR_1",
-                sensor_type=SensorType.EOIR,
-                z=z_true,
-                R=np.diag(std**2),
-                quality=0.0,
-                latency_ms=float(np.clip(180 + rng.normal(0, 55), 80, 400)),
-                dropped=True,
-                meta={"dropped_reason": "synthetic_eoir_drop"},
-            )
+    ) -> TargetMeasurements:
+        """
+        GNSS/EOIR/RADAR reports for N targets (positions: (N, 3) lat, lon, alt).
+
+        Noise, drop and spoof models follow the single-target sensors above,
+        drawn as arrays per sensor rather than per measurement.
+        """
+        positions = np.asarray(positions, dtype=float)
+        n = positions.shape[0]
+        jam = float(env.gnss_jam_factor)
+        degrade = float(env.eoir_degrade)
+
+        models = (
+            # (detect prob, std, quality, latency mean, latency std, latency lo, hi)
+            (
+                1.0 - (0.02 + jam * 0.25),
+                np.array([0.00025, 0.00025, 3.5]) + np.array([0.0012, 0.0012, 15.0]) * jam,
+                float(np.clip(0.95 - jam * 0.6, 0.15, 0.95)),
+                (90.0, 25.0, 40.0, 220.0),
+            ),
+            (
+                1.0 - (0.03 + degrade * 0.22),
+                np.array([0.0006, 0.0006, 8.0]) + np.array([0.0013, 0.0013, 20.0]) * degrade,
+                float(np.clip(0.82 - degrade * 0.55, 0.1, 0.85)),
+                (140.0, 45.0, 60.0, 320.0),
+            ),
+            (
+                0.55,
+                np.array([0.00045, 0.00045, 6.5]),
+                0.75,
+                (110.0, 35.0, 50.0, 280.0),
+            ),
+        )
 
-        noise = rng.normal(0, std)
-        z = z_true + noise
-        R = np.diag(std**2)
+        cols = {k: [] for k in ("sensor", "target", "z", "R", "quality", "latency_ms")}
+        for code, (p_detect, std, quality, (lat_mu, lat_sd, lat_lo, lat_hi)) in enumerate(models):
+            idx = np.flatnonzero(rng.random(n) < p_detect)
+            z = positions[idx] + rng.normal(0.0, std, size=(idx.size, 3))
 
-        hot_ratio = float(np.clip(truth.get("vision_hot_ratio", 0.10) + rng.normal(0, 0.03), 0.0, 1.0))
-        quality = float(np.clip(0.82 - float(env.eoir_degrade) * 0.55 - comms_loss * 0.2, 0.1, 0.85))
+            if TARGET_SENSORS[code] is SensorType.GNSS:
+                spoofed = rng.random(idx.size) < jam * 0.15
+                z[spoofed] += rng.normal(0.0, [0.002, 0.002, 10.0], size=(int(spoofed.sum()), 3))
 
-        return SensorMeasurement(
-            tick=state.tick + 1,
-            utc_timestamp=state.utc(),
-            sensor_id="EOIR_1",
-            sensor_type=SensorType.EOIR,
-            z=z.astype(float),
-            R=R.astype(float),
-            quality=quality,
-            latency_ms=float(np.clip(140 + rng.normal(0, 45), 60, 320)),
-            dropped=False,
-            meta={"hot_ratio": hot_ratio},
-        )
+            cols["sensor"].append(np.full(idx.size, code, dtype=np.int8))
+            cols["target"].append(idx)
+            cols["z"].append(z)
+            cols["R"].append(np.broadcast_to(np.diag(std**2), (idx.size, 3, 3)))
+            cols["quality"].append(np.full(idx.size, quality))
+            cols["latency_ms"].append(np.clip(lat_mu + rng.normal(0.0, lat_sd, idx.size), lat_lo, lat_hi))
 
-    def simulate_radar(
-        self,
-        state: EngineState,
-        truth: Dict[str, float],
-        rng: np.random.Generator,
-    ) -> SensorMeasurement:
-        radar_std = np.array([0.00045, 0.00045, 6.5], dtype=float)
-        noise = rng.normal(0, radar_std)
-        z_true = np.array([truth["lat"], truth["lon"], truth["altitude_m"]], dtype=float)
-        z = z_true + noise
-        R = np.diag(radar_std**2)
-
-        return SensorMeasurement(
-            tick=state.tick + 1,
-            utc_timestamp=state.utc(),
-            sensor_id="RADAR_1",
-            sensor_type=SensorType.RADAR,
-            z=z.astype(float),
-            R=R.astype(float),
-            quality=0.75,
-            latency_ms=float(np.clip(110 + rng.normal(0, 35), 50, 280)),
-            dropped=False,
-            meta={},
-        )
+        return TargetMeasurements(tick=int(tick), **{k: np.concatenate(v) for k, v in cols.items()})
 
     # --------------------------------------------------
     # Main entry: simulate all sensors for one tick
@@ -239,21 +167,10 @@ class SensorSimulator:
         state: EngineState,
         truth: Dict[str, float],
         env: EnvProfile,
-        rng: np.random.Generator,
-    ) -> List[SensorMeasurement]:
-        measurements: List[SensorMeasurement] = []
-
-        link = self.simulate_link(state, env, rng)
-        measurements.append(link)
-        comms_loss = float(link.meta.get("comms_loss", 0.0))
-
-        measurements.append(self.simulate_imu(state, env, rng))
-        measurements.append(self.simulate_baro(state, truth, rng))
-        measurements.append(self.simulate_gnss(state, truth, env, rng))
-        measurements.append(self.simulate_eoir(state, truth, env, rng, comms_loss))
-
-        # RADAR intermittently available
-        if rng.random() < 0.55:
-            measurements.append(self.simulate_radar(state, truth, rng))
-
-        return measurements
+        rng: Union[np.random.Generator, TickStreams],
+    ) -> List[Measurement]:
+        """simulate_blocks() as one record per measurement (suite order)."""
+        streams = TickStreams.shared(rng) if isinstance(rng, np.random.Generator) else rng
+        ctx = SensorContext(tick=state.tick + 1, utc=state.utc(), truth=truth, env=env)
+        strict = self.config.strict_models
+        return [m for model in self.suite for m in model.generate(ctx, streams.get(model.stream)).records(strict)]
@@ -9,24 +9,25 @@ This module defines EngineState:
 - scenario selection
 - history buffers
 - fusion outputs
-- audit chain
+- audit chain (in-memory tail + optional on-disk log)
 
 No business logic. No UI dependencies.
 """
 
 import time
-from datetime import datetime
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Deque
 
 import numpy as np
 from collections import deque
 
+from casper.buffers import MeasurementBuffer, TelemetryBuffer
+from casper.clock import Clock, SimClock
 from casper.config import FusionConfig
 from casper.presets import AOConfig
-from casper.audit.chain import AuditRecord
+from casper.audit.chain import AuditRecord, GENESIS_SHA256
+from casper.audit.log import AuditLogWriter
 from casper.fusion.engine import FusedEstimate
-from casper.models import Telemetry, SensorMeasurement
 
 
 @dataclass
@@ -53,6 +54,10 @@ class EngineState:
     mission_stage_index: int = 0
     mission_stage_tick: int = 0
 
+    # Timestamp source, sampled once per tick into tick_utc
+    clock: Clock = field(default_factory=SimClock)
+    tick_utc: str = ""
+
     # --------------------------------------------------
     # Identity / determinism
     # --------------------------------------------------
@@ -73,12 +78,18 @@ class EngineState:
     clarity_ema: float = 0.9
 
     # --------------------------------------------------
-    # History buffers (deque)
+    # History buffers (bounded)
     # --------------------------------------------------
-    history: Deque[Telemetry] = field(default_factory=deque)
-    meas_history: Deque[SensorMeasurement] = field(default_factory=deque)
+    history: TelemetryBuffer = field(default_factory=lambda: TelemetryBuffer(0))
+    meas_history: MeasurementBuffer = field(default_factory=lambda: MeasurementBuffer(0))
     audit_chain: Deque[AuditRecord] = field(default_factory=deque)
 
+    # --------------------------------------------------
+    # Audit chain head / durable log
+    # --------------------------------------------------
+    audit_head: str = GENESIS_SHA256
+    audit_log: Optional[AuditLogWriter] = None
+
     # --------------------------------------------------
     # Fusion outputs
     # --------------------------------------------------
@@ -96,32 +107,66 @@ class EngineState:
     fusion_strategy_name: str = "weighted"
 
     def __post_init__(self):
-        """Initialize bounded deques after creation."""
-        self.history = deque(self.history, maxlen=self.config.max_telemetry_history)
-        self.meas_history = deque(self.meas_history, maxlen=self.config.max_measurement_history)
+        """Initialize bounded buffers after creation."""
+        self.history = TelemetryBuffer(self.config.max_telemetry_history, self.history)
+        self.meas_history = MeasurementBuffer(self.config.max_measurement_history, self.meas_history)
         self.audit_chain = deque(self.audit_chain, maxlen=self.config.max_audit_history)
 
     # --------------------------------------------------
     # Helpers
     # --------------------------------------------------
+    def begin_tick(self) -> str:
+        """
+        Sample the clock for the tick about to execute (tick + 1).
+        All consumers within the tick share this timestamp.
+        """
+        self.tick_utc = self.clock.timestamp(
+            self.tick + 1,
+            self.mission_time_s + self.config.dt_seconds,
+        )
+        return self.tick_utc
+
     def utc(self) -> str:
-        """Current UTC timestamp (ISO8601)."""
-        return datetime.utcnow().isoformat() + "Z"
+        """Timestamp of the current tick (ISO8601)."""
+        return self.tick_utc or self.clock.timestamp(self.tick, self.mission_time_s)
+
+    def require_audit_current(self, consumer: str) -> None:
+        """
+        Raise if the audit chain does not end at the current tick, i.e. a
+        PipelinedStepEngine still has records queued (flush() it first).
+        """
+        if self.tick == 0:
+            return
+        last = self.audit_chain[-1].tick if self.audit_chain else None
+        if last != self.tick:
+            raise RuntimeError(
+                f"{consumer}: audit chain ends at tick {last}, state is at tick {self.tick}; "
+                "flush() the engine before reading audit records"
+            )
 
     def reset(self, new_seed: Optional[int] = None):
         """
         Reset state for a new run.
         Keeps configuration, clears runtime buffers.
+
+        An attached audit_log holds the old run's chain: it is closed and
+        detached (audit_log = None). Attach a new AuditLogWriter, in another
+        directory, to log the new run.
         """
         self.tick = 0
         self.mission_time_s = 0.0
         self.mission_stage_index = 0
         self.mission_stage_tick = 0
+        self.tick_utc = ""
         self.clarity_ema = 0.9
 
         self.history.clear()
         self.meas_history.clear()
         self.audit_chain.clear()
+        self.audit_head = GENESIS_SHA256
+        if self.audit_log is not None:
+            self.audit_log.close()
+            self.audit_log = None
         self.last_seen_tick.clear()
 
         self.fused = None
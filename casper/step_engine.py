@@ -15,34 +15,88 @@ Responsibilities:
 """
 
 import math
+from typing import Any, Dict, List, Optional
+
 import numpy as np
 
 from casper.config import FusionConfig
 from casper.state import EngineState
-from casper.models import Telemetry
+from casper.models import SensorType, Telemetry, TelemetryRecord
 from casper.presets import ENVELOPES, ENVIRONMENTS
+from casper.sensors.registry import SensorBlock
 from casper.sensors.simulator import SensorSimulator
 from casper.fusion.engine import FusionEngine
 from casper.governance.clarity_risk import ClarityRiskCalculator
-from casper.audit.chain import build_audit_record
+from casper.audit.chain import AuditRecord, build_audit_record
+from casper.instrumentation import NULL_INSTRUMENTATION, NullInstrumentation
+from casper.rng import TickStreams
+
+
+def _lead(blocks: List[SensorBlock], sensor_type: SensorType) -> Optional[SensorBlock]:
+    """First non-empty block of a type; its row 0 feeds the single-valued telemetry fields."""
+    return next((b for b in blocks if b.sensor_type is sensor_type and len(b)), None)
 
 
 class StepEngine:
-    def __init__(self, config: FusionConfig):
+    """
+    Executes one tick at a time against an EngineState.
+
+    Holds per-run components (fusion engine, clarity EMA) across ticks;
+    they are reset whenever a state at tick 0 is stepped.
+
+    Pass a casper.instrumentation.Instrumentation to time each stage
+    (truth, sensors, fusion, audit, governance, telemetry) and count
+    measurements generated / dropped / gated and audit bytes hashed.
+    """
+
+    def __init__(self, config: FusionConfig, instrumentation: Optional[NullInstrumentation] = None):
         self.config = config
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
         self.sensor_sim = SensorSimulator(config)
         self.clarity_calc = ClarityRiskCalculator(config)
+        self.fusion = FusionEngine(config)
+        self.streams = TickStreams(config.rng_streams)
+        self._fusion_request = self.fusion.strategy_name
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-run component state (clarity EMA, fusion filters)."""
+        return {
+            "clarity": self.clarity_calc.snapshot(),
+            "fusion": self.fusion.snapshot(),
+            "fusion_request": self._fusion_request,
+        }
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """Continue a run from snapshot() (the state must be restored alongside)."""
+        self.clarity_calc.restore(snapshot["clarity"])
+        self.fusion.restore(snapshot["fusion"])
+        self._fusion_request = snapshot["fusion_request"]
+
+    def flush(self) -> None:
+        """
+        Wait for deferred per-tick work. Audit records are chained inside
+        step() here, so there is none; PipelinedStepEngine overrides this.
+        """
+
+    def _sync_fusion_strategy(self, state: EngineState) -> None:
+        if state.fusion_strategy_name != self._fusion_request:
+            self.fusion.set_strategy(state.fusion_strategy_name)
+            self._fusion_request = state.fusion_strategy_name
+        if state.ao is not self.fusion.area and state.ao != self.fusion.area:
+            self.fusion.set_area(state.ao)
 
     # --------------------------------------------------
     # Truth generation
     # --------------------------------------------------
     def _generate_truth(self, state: EngineState, env, rng) -> dict:
-        last = state.history[-1] if state.history else None
+        # Previous values by column; building the full last record is not needed.
+        history = state.history
+        last = history.last if history else None
         envelope = ENVELOPES[state.envelope_name]
 
         mach = float(
             np.clip(
-                (last.mach if last else 0.0) + rng.uniform(0.01, 0.05),
+                (last("mach") if last else 0.0) + rng.uniform(0.01, 0.05),
                 0.0,
                 envelope.max_mach,
             )
@@ -50,7 +104,7 @@ class StepEngine:
 
         alt = float(
             np.clip(
-                (last.altitude_m if last else 0.0) + rng.uniform(50.0, 150.0),
+                (last("altitude_m") if last else 0.0) + rng.uniform(50.0, 150.0),
                 0.0,
                 18000.0,
             )
@@ -73,7 +127,7 @@ class StepEngine:
 
         threat = float(
             np.clip(
-                (last.threat_index if last else 40.0) + rng.uniform(-5.0, 5.0),
+                (last("threat_index") if last else 40.0) + rng.uniform(-5.0, 5.0),
                 0.0,
                 100.0,
             )
@@ -81,7 +135,7 @@ class StepEngine:
 
         civ = float(
             np.clip(
-                (last.civ_density if last else 0.3) + rng.uniform(-0.05, 0.05),
+                (last("civ_density") if last else 0.3) + rng.uniform(-0.05, 0.05),
                 0.0,
                 1.0,
             )
@@ -102,37 +156,71 @@ class StepEngine:
             "vision_hot_ratio": float(np.clip(0.10 + rng.normal(0, 0.03), 0.0, 1.0)),
         }
 
+    # --------------------------------------------------
+    # Audit
+    # --------------------------------------------------
+    def _emit_audit(self, state: EngineState, tick: int, utc: str, used_meas, fused) -> Optional[AuditRecord]:
+        """
+        Build, chain and log the tick's audit record. Returns the record,
+        or None when it is produced asynchronously (PipelinedStepEngine).
+        """
+        audit = build_audit_record(
+            tick=tick,
+            utc=utc,
+            used_measurements=used_meas,
+            fused=fused,
+            prev_sha256=state.audit_head,
+        )
+        state.audit_chain.append(audit)
+        state.audit_head = audit.sha256
+        if state.audit_log is not None:
+            state.audit_log.append(audit)
+        return audit
+
+    def _audit_bytes_hashed(self, audit: Optional[AuditRecord]) -> int:
+        """Canonical bytes hashed for the instrumentation counter this tick."""
+        return len(audit._canonical) if audit is not None else 0
+
     # --------------------------------------------------
     # Main step
     # --------------------------------------------------
     def step(self, state: EngineState) -> EngineState:
+        inst = self.instrumentation
+        inst.begin_tick(state.tick + 1)
+
         env = ENVIRONMENTS[state.env_name]
-        rng = np.random.default_rng(state.rng_seed + state.tick + 1)
+        streams = self.streams.begin(state.rng_seed, state.tick + 1)
+        utc = state.begin_tick()
+
+        if state.tick == 0:
+            self.clarity_calc.reset()
+            self.fusion.reset()
+        self._sync_fusion_strategy(state)
 
         # Truth
-        truth = self._generate_truth(state, env, rng)
+        truth = self._generate_truth(state, env, streams.get("truth"))
+        inst.lap("truth")
 
         # Sensors
-        measurements = self.sensor_sim.simulate_all(state, truth, env, rng)
-        for m in measurements:
-            state.meas_history.append(m)
-            state.last_seen_tick[m.sensor_id] = m.tick
+        blocks = self.sensor_sim.simulate_blocks(state, truth, env, streams)
+        for b in blocks:
+            state.meas_history.append_columns(
+                b.tick, b.utc, b.sensor_ids, b.sensor_type, b.z, b.R, b.quality, b.latency_ms, b.dropped, b.meta
+            )
+            state.last_seen_tick.update(dict.fromkeys(b.sensor_ids, b.tick))
+        link = _lead(blocks, SensorType.LINK)
+        imu = _lead(blocks, SensorType.IMU)
+        eoir = _lead(blocks, SensorType.EOIR)
+        inst.lap("sensors")
 
         # Fusion
-        fusion_engine = FusionEngine(self.config, state.fusion_strategy_name)
-        fused = fusion_engine.fuse(state.meas_history, state.tick + 1)
+        fused, used_meas = self.fusion.fuse_selected(state.meas_history, state.tick + 1)
         state.fused = fused
-
-        used_meas = fusion_engine.select_measurements(state.meas_history, state.tick + 1)
+        inst.lap("fusion")
 
         # Audit
-        audit = build_audit_record(
-            tick=state.tick + 1,
-            utc=state.utc(),
-            used_measurements=used_meas,
-            fused=fused,
-        )
-        state.audit_chain.append(audit)
+        audit = self._emit_audit(state, state.tick + 1, utc, used_meas, fused)
+        inst.lap("audit")
 
         # Governance
         clarity, risk, pred, sys_state, pressure = self.clarity_calc.compute(
@@ -144,11 +232,13 @@ class StepEngine:
             },
             fused=fused,
         )
+        inst.lap("governance")
 
         # Telemetry
-        tel = Telemetry(
+        tel_cls = Telemetry if self.config.strict_models else TelemetryRecord
+        tel = tel_cls(
             tick=state.tick + 1,
-            utc_timestamp=state.utc(),
+            utc_timestamp=utc,
             mission_time_s=state.mission_time_s + self.config.dt_seconds,
             mission_stage_code="STAGE",
             mission_stage_label="Recon",
@@ -161,15 +251,15 @@ class StepEngine:
             q_kpa=truth["q_kpa"],
             thermal_index=truth["thermal_index"],
             g_load=truth["g_load"],
-            link_latency_ms=float(next((m.z[0] for m in measurements if m.sensor_id == "LINK_1"), 0.0)),
-            imu_drift_deg_s=float(next((m.meta.get("imu_drift_deg_s", 0.0) for m in measurements if m.sensor_id == "IMU_1"), 0.0)),
+            link_latency_ms=float(link.z[0, 0]) if link else 0.0,
+            imu_drift_deg_s=float(imu.z[0, 0]) if imu else 0.0,
 
             lat=fused.lat,
             lon=fused.lon,
             threat_index=truth["threat_index"],
             civ_density=truth["civ_density"],
             nav_drift=truth["nav_drift"],
-            comms_loss=float(next((m.meta.get("comms_loss", 0.0) for m in measurements if m.sensor_id == "LINK_1"), 0.0)),
+            comms_loss=float(link.z[0, 1]) if link else 0.0,
             vision_hot_ratio=truth["vision_hot_ratio"],
 
             clarity=clarity,
@@ -180,8 +270,8 @@ class StepEngine:
 
             cc_combined=clarity / 100.0,
             cc_nav_conf=fused.fusion_conf,
-            cc_comms_conf=float(next((m.quality for m in measurements if m.sensor_id == "LINK_1"), 1.0)),
-            cc_vision_conf=float(next((m.quality for m in measurements if m.sensor_id == "EOIR_1"), 0.0)),
+            cc_comms_conf=float(link.quality[0]) if link else 1.0,
+            cc_vision_conf=float(eoir.quality[0]) if eoir else 0.0,
             cc_clarity_factor=clarity / 100.0,
             cc_threat_factor=max(0.2, 1.0 - truth["threat_index"] / 150.0),
 
@@ -192,5 +282,13 @@ class StepEngine:
         state.tick = tel.tick
         state.mission_time_s = tel.mission_time_s
         state.history.append(tel)
+        inst.lap("telemetry")
+
+        if inst.enabled:
+            inst.count("measurements_generated", sum(len(b) for b in blocks))
+            inst.count("measurements_dropped", sum(int(b.dropped.sum()) for b in blocks))
+            inst.count("measurements_gated", len(used_meas))
+            inst.count("audit_bytes_hashed", self._audit_bytes_hashed(audit))
+        inst.end_tick()
 
         return state
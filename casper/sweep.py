@@ -0,0 +1,259 @@
+"""
+casper.sweep
+============
+
+Process-pool scenario sweeps for Casper_Fusion.
+
+Runs the cross product of ENVIRONMENTS x ENVELOPES x AO_PRESETS over many
+seeds. Each (scenario, seed) run executes StepEngine headlessly inside a
+worker process; only a compact RunSummary travels back to the parent,
+streamed as runs finish.
+
+Usage:
+    python -m casper.sweep --seeds 0:1000 --ticks 600 --workers 64 --out sweep.jsonl
+
+No UI dependencies.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from casper.config import FusionConfig
+from casper.models import SystemState
+from casper.presets import AO_PRESETS, ENVELOPES, ENVIRONMENTS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+# ============================================================
+# JOB / RESULT MODELS
+# ============================================================
+
+@dataclass(frozen=True)
+class Scenario:
+    env_name: str
+    envelope_name: str
+    ao_name: str
+
+
+@dataclass(frozen=True)
+class SweepJob:
+    """One unit of work: a scenario and the seeds to run under it."""
+    scenario: Scenario
+    seeds: Tuple[int, ...]
+    ticks: int
+    config: FusionConfig
+
+
+@dataclass
+class RunSummary:
+    """
+    Per-run summary statistics.
+
+    Distributions are summarized as mean/std/min/p05/p50/p95/max.
+    time_in_state is in simulated seconds.
+    """
+    env_name: str
+    envelope_name: str
+    ao_name: str
+    seed: int
+    ticks: int
+    clarity: Dict[str, float] = field(default_factory=dict)
+    risk: Dict[str, float] = field(default_factory=dict)
+    time_in_state: Dict[str, float] = field(default_factory=dict)
+    final_state: str = ""
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def all_scenarios(
+    env_names: Optional[Iterable[str]] = None,
+    envelope_names: Optional[Iterable[str]] = None,
+    ao_names: Optional[Iterable[str]] = None,
+) -> List[Scenario]:
+    """Cross product of preset names (defaults to every preset)."""
+    envs = list(env_names) if env_names is not None else list(ENVIRONMENTS)
+    envelopes = list(envelope_names) if envelope_names is not None else list(ENVELOPES)
+    aos = list(ao_names) if ao_names is not None else list(AO_PRESETS)
+
+    for name in envs:
+        if name not in ENVIRONMENTS:
+            raise KeyError(f"Unknown environment: {name}")
+    for name in envelopes:
+        if name not in ENVELOPES:
+            raise KeyError(f"Unknown envelope: {name}")
+    for name in aos:
+        if name not in AO_PRESETS:
+            raise KeyError(f"Unknown AO preset: {name}")
+
+    return [Scenario(e, v, a) for e, v, a in itertools.product(envs, envelopes, aos)]
+
+
+# ============================================================
+# WORKER
+# ============================================================
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    p05, p50, p95 = np.percentile(values, [5, 50, 95])
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "p05": float(p05),
+        "p50": float(p50),
+        "p95": float(p95),
+        "max": float(values.max()),
+    }
+
+
+def run_scenario(scenario: Scenario, seed: int, ticks: int, config: FusionConfig) -> RunSummary:
+    """
+    Execute one seeded run with StepEngine and summarize it.
+    """
+    state = EngineState(config=config)
+    state.rng_seed = int(seed)
+    state.run_id = int(seed)
+    state.ao = AO_PRESETS[scenario.ao_name]
+    state.env_name = scenario.env_name
+    state.envelope_name = scenario.envelope_name
+
+    engine = StepEngine(config)
+    clarity = np.empty(ticks, dtype=float)
+    risk = np.empty(ticks, dtype=float)
+    state_ticks = {s.value: 0 for s in SystemState}
+
+    for i in range(ticks):
+        engine.step(state)
+        tel = state.history[-1]
+        clarity[i] = tel.clarity
+        risk[i] = tel.risk
+        state_ticks[tel.state.value] += 1
+
+    return RunSummary(
+        env_name=scenario.env_name,
+        envelope_name=scenario.envelope_name,
+        ao_name=scenario.ao_name,
+        seed=int(seed),
+        ticks=ticks,
+        clarity=_distribution(clarity) if ticks else {},
+        risk=_distribution(risk) if ticks else {},
+        time_in_state={k: v * config.dt_seconds for k, v in state_ticks.items()},
+        final_state=state.history[-1].state.value if ticks else "",
+    )
+
+
+def _run_job(job: SweepJob) -> List[RunSummary]:
+    return [run_scenario(job.scenario, seed, job.ticks, job.config) for seed in job.seeds]
+
+
+# ============================================================
+# SWEEP DRIVER
+# ============================================================
+
+def iter_jobs(
+    scenarios: Sequence[Scenario],
+    seeds: Sequence[int],
+    ticks: int,
+    config: FusionConfig,
+    seeds_per_job: int = 1,
+) -> Iterator[SweepJob]:
+    seeds = list(seeds)
+    step = max(1, int(seeds_per_job))
+    for scenario in scenarios:
+        for i in range(0, len(seeds), step):
+            yield SweepJob(scenario, tuple(seeds[i:i + step]), ticks, config)
+
+
+def iter_sweep(
+    scenarios: Sequence[Scenario],
+    seeds: Sequence[int],
+    ticks: int = 600,
+    config: Optional[FusionConfig] = None,
+    max_workers: Optional[int] = None,
+    seeds_per_job: int = 1,
+) -> Iterator[RunSummary]:
+    """
+    Fan (scenario, seed) runs out over a ProcessPoolExecutor and yield
+    RunSummary objects in completion order.
+
+    At most 4 jobs per worker are in flight, so memory in the parent stays
+    bounded regardless of sweep size.
+    """
+    config = config or FusionConfig()
+    workers = max_workers or os.cpu_count() or 1
+    jobs = iter_jobs(scenarios, seeds, ticks, config, seeds_per_job)
+    max_in_flight = 4 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for job in itertools.islice(jobs, max_in_flight):
+            pending.add(pool.submit(_run_job, job))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield from fut.result()
+            for job in itertools.islice(jobs, len(done)):
+                pending.add(pool.submit(_run_job, job))
+
+
+def run_sweep(*args, **kwargs) -> List[RunSummary]:
+    """Collect iter_sweep() into a list."""
+    return list(iter_sweep(*args, **kwargs))
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def _parse_seeds(spec: str) -> List[int]:
+    """'0:100' -> range, '1,5,9' -> list."""
+    if ":" in spec:
+        start, stop = spec.split(":", 1)
+        return list(range(int(start), int(stop)))
+    return [int(s) for s in spec.split(",") if s.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Casper_Fusion scenario sweep")
+    parser.add_argument("--seeds", default="0:10", help="'start:stop' or comma-separated list")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seeds-per-job", type=int, default=1)
+    parser.add_argument("--env", action="append", help="Environment name (repeatable)")
+    parser.add_argument("--envelope", action="append", help="Envelope name (repeatable)")
+    parser.add_argument("--ao", action="append", help="AO preset name (repeatable)")
+    parser.add_argument("--out", default="-", help="JSON Lines output path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    scenarios = all_scenarios(args.env, args.envelope, args.ao)
+    seeds = _parse_seeds(args.seeds)
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w")
+    try:
+        for summary in iter_sweep(
+            scenarios,
+            seeds,
+            ticks=args.ticks,
+            max_workers=args.workers,
+            seeds_per_job=args.seeds_per_job,
+        ):
+            out.write(json.dumps(summary.to_dict(), sort_keys=True) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,528 @@
+"""
+casper.visualization.batch
+==========================
+
+Offline IR rendering of recorded runs (debriefs).
+
+render_run() renders one IR frame per recorded tick and writes them to a
+FrameArchive. Frames are pixel-identical to the console's:
+- view="pyramid" (default): TerrainPyramid.render_ir at a zoom level,
+  following the aircraft, as app.py draws it. The tiles the run's views
+  overlap are generated once across the pool; workers then open the same
+  tile directory and share the memory-mapped tiles through the page cache
+- view="fixed": TerrainGenerator.render_ir on the fixed-size terrain,
+  copied once into shared memory; workers attach to it read-only
+
+In both views ticks are rendered in chunks of consecutive frames; each
+worker delta-encodes its chunk (frame minus previous frame, mod 256) and
+zlib-compresses it, so only compressed bytes return to the parent. The
+parent writes chunks in frame order, with a bounded number in flight.
+
+IR frames are gray, so one channel is stored; readers return RGB.
+
+Layout:
+    <directory>/frames.json    header (frame shape, count, chunking, AO)
+    <directory>/frames.bin     compressed chunks, back to back
+    <directory>/index.bin      one CHUNK_DTYPE record per chunk
+    <directory>/ticks.bin      tick of each frame (int64)
+
+Usage:
+    python -m casper.visualization.batch RUN_DIR --out frames/ --ao "Black Sea (synthetic)" --level 4
+    python -m casper.visualization.batch RUN_DIR --out frames/ --view fixed --size 80
+    python -m casper.visualization.batch RUN_DIR --out frames/ --gif debrief.gif --gif-every 10
+
+RUN_DIR is a casper.archive.memmap run archive or a casper.archive.arrow
+export. Animated GIF output requires the optional Pillow package.
+
+No UI dependencies.
+"""
+
+import argparse
+import itertools
+import json
+import mmap
+import os
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from casper.buffers import TelemetryBuffer
+from casper.presets import AO_PRESETS, AOConfig
+from casper.visualization.terrain import DEFAULT_WATERMARK, TerrainGenerator
+from casper.visualization.tiles import DEFAULT_TILE_DIR, MAX_LEVEL, VIEW_SIZE, TerrainPyramid
+
+
+FRAME_ARCHIVE_VERSION = 1
+HEADER_FILE = "frames.json"
+
+CHUNK_DTYPE = np.dtype([
+    ("first", np.int64),    # index of the chunk's first frame
+    ("count", np.int64),
+    ("offset", np.int64),   # byte range in frames.bin
+    ("length", np.int64),
+])
+
+DEFAULT_CHUNK = 256
+RENDER_VIEWS = ("pyramid", "fixed")
+
+
+# ============================================================
+# INPUTS
+# ============================================================
+
+@dataclass(frozen=True)
+class FramePoses:
+    """Per-frame render inputs, one row per recorded tick."""
+    tick: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+    threat_index: np.ndarray
+    fusion_conf: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.tick.shape[0])
+
+    def slice(self, start: int, stop: int) -> "FramePoses":
+        return FramePoses(*(np.ascontiguousarray(getattr(self, n)[start:stop]) for n in _POSE_FIELDS))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any]) -> "FramePoses":
+        return cls(
+            tick=np.asarray(columns["tick"], dtype=np.int64),
+            **{n: np.asarray(columns[n], dtype=np.float64) for n in _POSE_FIELDS[1:]},
+        )
+
+    @classmethod
+    def from_history(cls, history: TelemetryBuffer) -> "FramePoses":
+        return cls.from_columns(history.window())
+
+    @classmethod
+    def from_run(cls, directory: str) -> "FramePoses":
+        """Telemetry of a memmap run archive or an Arrow/Parquet export."""
+        if (Path(directory) / "archive.json").exists():
+            from casper.archive.memmap import RunArchive
+
+            with RunArchive(directory) as archive:
+                return cls.from_columns({n: np.array(archive.column(n)) for n in _POSE_FIELDS})
+
+        from casper.archive.arrow import load_table
+
+        table = load_table(directory, "telemetry", columns=list(_POSE_FIELDS))
+        return cls.from_columns({n: table.column(n).to_numpy() for n in _POSE_FIELDS})
+
+
+_POSE_FIELDS = ("tick", "lat", "lon", "threat_index", "fusion_conf")
+
+
+# ============================================================
+# CHUNK CODEC
+# ============================================================
+
+def encode_chunk(gray: np.ndarray, level: int = 6) -> bytes:
+    """(n, H, W) uint8 frames -> zlib(first frame, then frame-to-frame deltas)."""
+    delta = np.empty_like(gray)
+    delta[0] = gray[0]
+    np.subtract(gray[1:], gray[:-1], out=delta[1:])  # wraps mod 256
+    return zlib.compress(delta.tobytes(), level)
+
+
+def decode_chunk(payload: bytes, count: int, height: int, width: int) -> np.ndarray:
+    delta = np.frombuffer(zlib.decompress(payload), dtype=np.uint8).reshape(count, height, width)
+    return np.cumsum(delta, axis=0, dtype=np.uint8)
+
+
+# ============================================================
+# WORKER
+# ============================================================
+
+# Per-process render state, set by a _setup_* initializer (in-process too).
+_WORKER: Dict[str, Any] = {}
+
+
+def _setup_pyramid(
+    ao: AOConfig,
+    tile_dir: str,
+    seed: int,
+    level: int,
+    view_size: Tuple[int, int],
+    watermark: str,
+    compression: int,
+) -> None:
+    pyramid = TerrainPyramid(ao, tile_dir, seed=seed)
+    width, height = view_size
+
+    def render(lat: float, lon: float, threat: float, conf: float) -> np.ndarray:
+        return pyramid.render_gray_at(lat, lon, threat, conf, level, None, width, height, watermark)
+
+    _WORKER.update(pyramid=pyramid, level=level, shape=(height, width), render=render, compression=compression)
+
+
+def _setup_fixed(terrain: np.ndarray, ao: AOConfig, watermark: str, compression: int) -> None:
+    generator = TerrainGenerator()
+
+    def render(lat: float, lon: float, threat: float, conf: float) -> np.ndarray:
+        return generator.render_ir_at(terrain, ao, lat, lon, threat, conf, watermark)[..., 0]
+
+    _WORKER.update(shape=terrain.shape, render=render, compression=compression)
+
+
+def _setup_fixed_shared(shm_name: str, shape: Tuple[int, int], dtype: str, ao: AOConfig, watermark: str, compression: int) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    terrain = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    terrain.flags.writeable = False  # read-only => IR render state is cached
+    _WORKER["shm"] = shm  # keep the mapping alive
+    _setup_fixed(terrain, ao, watermark, compression)
+
+
+def _ensure_tiles(tiles: Sequence[Tuple[int, int]]) -> int:
+    pyramid, level = _WORKER["pyramid"], _WORKER["level"]
+    for tx, ty in tiles:
+        pyramid.tile(level, tx, ty)
+    return len(tiles)
+
+
+def _render_chunk(first: int, poses: FramePoses) -> Tuple[int, int, bytes]:
+    render = _WORKER["render"]
+    gray = np.empty((len(poses),) + tuple(_WORKER["shape"]), dtype=np.uint8)
+    for i, (lat, lon, threat, conf) in enumerate(zip(
+        poses.lat.tolist(), poses.lon.tolist(), poses.threat_index.tolist(), poses.fusion_conf.tolist()
+    )):
+        gray[i] = render(lat, lon, threat, conf)
+    return first, len(poses), encode_chunk(gray, _WORKER["compression"])
+
+
+# ============================================================
+# ARCHIVE
+# ============================================================
+
+class FrameArchiveWriter:
+    """Appends compressed chunks in frame order; the header is written on close()."""
+
+    def __init__(self, directory: str, height: int, width: int, meta: Optional[Dict[str, Any]] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.height, self.width = int(height), int(width)
+        self.meta = dict(meta or {})
+        self.frames = 0
+        self.chunks = 0
+        self.bytes_written = 0
+        self._files = {
+            name: open(self.directory / name, "wb")
+            for name in ("frames.bin", "index.bin", "ticks.bin")
+        }
+
+    def write_chunk(self, ticks: np.ndarray, payload: bytes) -> None:
+        count = int(ticks.shape[0])
+        record = np.array([(self.frames, count, self.bytes_written, len(payload))], dtype=CHUNK_DTYPE)
+        self._files["frames.bin"].write(payload)
+        self._files["index.bin"].write(record.tobytes())
+        self._files["ticks.bin"].write(np.ascontiguousarray(ticks, dtype=np.int64).tobytes())
+        self.frames += count
+        self.chunks += 1
+        self.bytes_written += len(payload)
+
+    def header(self) -> Dict[str, Any]:
+        return {
+            "version": FRAME_ARCHIVE_VERSION,
+            "frames": self.frames,
+            "chunks": self.chunks,
+            "height": self.height,
+            "width": self.width,
+            "encoding": "zlib-delta-gray8",
+            **self.meta,
+        }
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        tmp = self.directory / f"{HEADER_FILE}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.header(), f, indent=2, sort_keys=True)
+        os.replace(tmp, self.directory / HEADER_FILE)
+
+    def __enter__(self) -> "FrameArchiveWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _map(path: Path, dtype: np.dtype, rows: int) -> np.ndarray:
+    if rows == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+
+class FrameArchive:
+    """
+    Read-only view of a frame archive. Frames are addressed by position
+    (0 .. len - 1); `ticks` maps positions to run ticks. The most recently
+    decoded chunk is kept.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        with open(self.directory / HEADER_FILE, "r") as f:
+            self.header: Dict[str, Any] = json.load(f)
+        if self.header.get("version") != FRAME_ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported frame archive version {self.header.get('version')!r}")
+
+        self.height = int(self.header["height"])
+        self.width = int(self.header["width"])
+        self.index = _map(self.directory / "index.bin", CHUNK_DTYPE, int(self.header["chunks"]))
+        self.ticks = _map(self.directory / "ticks.bin", np.dtype(np.int64), int(self.header["frames"]))
+        self._file = open(self.directory / "frames.bin", "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._chunk: Tuple[int, Optional[np.ndarray]] = (-1, None)
+
+    def __len__(self) -> int:
+        return int(self.ticks.shape[0])
+
+    def _decoded(self, c: int) -> np.ndarray:
+        if self._chunk[0] != c:
+            first, count, offset, length = (int(v) for v in self.index[c])
+            self._chunk = (c, decode_chunk(self._data[offset:offset + length], count, self.height, self.width))
+        return self._chunk[1]
+
+    def gray(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """(n, H, W) uint8 gray frames [start, stop)."""
+        stop = len(self) if stop is None else min(int(stop), len(self))
+        start = max(int(start), 0)
+        out = np.empty((max(stop - start, 0), self.height, self.width), dtype=np.uint8)
+        if start >= stop:
+            return out
+        firsts = self.index["first"]
+        for c in range(int(np.searchsorted(firsts, start, side="right")) - 1, len(firsts)):
+            first = int(firsts[c])
+            if first >= stop:
+                break
+            chunk = self._decoded(c)
+            a, b = max(start, first), min(stop, first + chunk.shape[0])
+            out[a - start:b - start] = chunk[a - first:b - first]
+        return out
+
+    def frames(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """(n, H, W, 3) uint8 RGB frames [start, stop)."""
+        gray = self.gray(start, stop)
+        return np.stack((gray,) * 3, axis=-1)
+
+    def frame(self, i: int) -> np.ndarray:
+        if not 0 <= i < len(self):
+            raise IndexError(f"frame {i} out of range")
+        return self.frames(i, i + 1)[0]
+
+    def iter_gray(self, every: int = 1) -> Iterator[np.ndarray]:
+        """Every `every`-th gray frame, decoding one chunk at a time."""
+        every = max(1, int(every))
+        for c in range(len(self.index)):
+            first = int(self.index["first"][c])
+            chunk = self._decoded(c)
+            yield from chunk[(-first) % every::every]
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+        self._chunk = (-1, None)
+
+    def __enter__(self) -> "FrameArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+
+def render_run(
+    poses: FramePoses,
+    directory: str,
+    ao: AOConfig,
+    view: str = "pyramid",
+    level: int = MAX_LEVEL,
+    tile_dir: str = DEFAULT_TILE_DIR,
+    view_size: Tuple[int, int] = (VIEW_SIZE, VIEW_SIZE),
+    seed: int = 42,
+    size: Tuple[int, int] = (80, 80),
+    watermark: str = DEFAULT_WATERMARK,
+    chunk: int = DEFAULT_CHUNK,
+    max_workers: Optional[int] = None,
+    compression: int = 1,
+) -> Dict[str, Any]:
+    """
+    Render every pose to a FrameArchive in `directory`.
+
+    view="pyramid" (default) renders the console's IR view:
+    TerrainPyramid.render_ir at zoom `level`, `view_size` (width, height),
+    following the aircraft. Tiles live in `tile_dir` (the console's by
+    default); the tiles the run needs are generated across the pool first,
+    then every worker pages them in from the same files.
+
+    view="fixed" renders TerrainGenerator.render_ir on a `size`
+    (width, height) terrain held in shared memory.
+
+    max_workers=0 renders in-process. Returns a summary (frames, chunks,
+    bytes, seconds, frames_per_s).
+    """
+    if view not in RENDER_VIEWS:
+        raise ValueError(f"view must be one of {RENDER_VIEWS}, got {view!r}")
+    started = time.perf_counter()
+    chunk = max(1, int(chunk))
+    workers = (os.cpu_count() or 1) if max_workers is None else max(0, int(max_workers))
+    meta: Dict[str, Any] = {"ao": ao.model_dump(), "seed": int(seed), "watermark": watermark, "view": view}
+
+    shm = None
+    if view == "pyramid":
+        level = min(max(int(level), 0), MAX_LEVEL)
+        width, height = int(view_size[0]), int(view_size[1])
+        meta["level"] = level
+        setup = _setup_pyramid
+        initargs: Tuple = (ao, tile_dir, int(seed), level, (width, height), watermark, compression)
+        tiles = TerrainPyramid(ao, tile_dir, seed=seed).tiles_for_views(level, poses.lat, poses.lon, width, height)
+    else:
+        width, height = int(size[0]), int(size[1])
+        terrain = TerrainGenerator(seed).generate(width, height)
+        tiles = []
+        if workers == 0:
+            setup, initargs = _setup_fixed, (terrain, ao, watermark, compression)
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=max(terrain.nbytes, 1))
+            np.ndarray(terrain.shape, dtype=terrain.dtype, buffer=shm.buf)[...] = terrain
+            setup = _setup_fixed_shared
+            initargs = (shm.name, terrain.shape, terrain.dtype.str, ao, watermark, compression)
+
+    spans = [(i, min(i + chunk, len(poses))) for i in range(0, len(poses), chunk)]
+    try:
+        with FrameArchiveWriter(directory, height, width, meta) as writer:
+            if workers == 0:
+                setup(*initargs)
+                try:
+                    for a, b in spans:
+                        writer.write_chunk(poses.tick[a:b], _render_chunk(a, poses.slice(a, b))[2])
+                finally:
+                    _WORKER.clear()  # in-process setup must not leak into later runs
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=setup, initargs=initargs) as pool:
+                    # Missing tiles first, spread over the pool (each is built once).
+                    if tiles:
+                        list(pool.map(_ensure_tiles, [tiles[i::workers] for i in range(workers)]))
+
+                    # In submission order, at most 4 chunks per worker in flight.
+                    pending: Deque = deque()
+                    todo = iter(spans)
+                    for a, b in itertools.islice(todo, 4 * workers):
+                        pending.append(pool.submit(_render_chunk, a, poses.slice(a, b)))
+                    while pending:
+                        first, count, payload = pending.popleft().result()
+                        writer.write_chunk(poses.tick[first:first + count], payload)
+                        for a, b in itertools.islice(todo, 1):
+                            pending.append(pool.submit(_render_chunk, a, poses.slice(a, b)))
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    seconds = time.perf_counter() - started
+    return {
+        "frames": writer.frames,
+        "chunks": writer.chunks,
+        "bytes": writer.bytes_written,
+        "raw_bytes": writer.frames * height * width,
+        "tiles": len(tiles),
+        "seconds": seconds,
+        "frames_per_s": writer.frames / seconds if seconds > 0 else 0.0,
+    }
+
+
+# ============================================================
+# ANIMATED EXPORT
+# ============================================================
+
+def _pil_image():
+    try:
+        from PIL import Image
+    except ImportError as exc:
+        raise ImportError("Pillow is required for animated image export (pip install Pillow)") from exc
+    return Image
+
+
+def write_gif(archive: FrameArchive, path: str, fps: float = 10.0, every: int = 1, scale: int = 1) -> int:
+    """Animated GIF of every `every`-th frame, upscaled by `scale`. Returns frames written."""
+    Image = _pil_image()
+    scale = max(1, int(scale))
+    images = []
+    for gray in archive.iter_gray(every):
+        if scale > 1:
+            gray = np.repeat(np.repeat(gray, scale, axis=0), scale, axis=1)
+        images.append(Image.fromarray(gray))
+    if images:
+        images[0].save(
+            path,
+            save_all=True,
+            append_images=images[1:],
+            duration=int(round(1000.0 / fps)),
+            loop=0,
+        )
+    return len(images)
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Casper_Fusion offline IR frame renderer")
+    parser.add_argument("run", help="Run archive (casper.archive.memmap) or Arrow/Parquet export directory")
+    parser.add_argument("--out", required=True, help="Frame archive directory")
+    parser.add_argument("--ao", default=next(iter(AO_PRESETS)), help="AO preset name the run was recorded in")
+    parser.add_argument("--view", choices=RENDER_VIEWS, default="pyramid", help="Console tiled view or fixed terrain")
+    parser.add_argument("--level", type=int, default=MAX_LEVEL, help="Pyramid zoom level (console 'IR zoom')")
+    parser.add_argument("--tile-dir", default=DEFAULT_TILE_DIR, help="Pyramid tile directory")
+    parser.add_argument("--view-size", type=int, default=VIEW_SIZE, help="Pyramid view width and height (px)")
+    parser.add_argument("--seed", type=int, default=42, help="Terrain seed")
+    parser.add_argument("--size", type=int, default=80, help="Fixed terrain width and height (px)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Frames per compressed chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--compression", type=int, default=1, help="zlib level 0-9 (1 is fastest; deltas already compress well)")
+    parser.add_argument("--gif", default=None, help="Also write an animated GIF (needs Pillow)")
+    parser.add_argument("--gif-every", type=int, default=1, help="GIF frame stride")
+    parser.add_argument("--gif-fps", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    if args.ao not in AO_PRESETS:
+        raise KeyError(f"Unknown AO preset: {args.ao}")
+
+    summary = render_run(
+        FramePoses.from_run(args.run),
+        args.out,
+        AO_PRESETS[args.ao],
+        view=args.view,
+        level=args.level,
+        tile_dir=args.tile_dir,
+        view_size=(args.view_size, args.view_size),
+        seed=args.seed,
+        size=(args.size, args.size),
+        chunk=args.chunk,
+        max_workers=args.workers,
+        compression=args.compression,
+    )
+    if args.gif:
+        with FrameArchive(args.out) as archive:
+            summary["gif_frames"] = write_gif(archive, args.gif, fps=args.gif_fps, every=args.gif_every)
+    print(json.dumps(summary, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,9 +8,19 @@ Synthetic terrain generation + IR rendering.
 - IR rendering overlays fused position + threat
 - Image is dimmed when fusion confidence is low
 - Always watermarked: synthetic / non-operational
+
+Terrains are cached by (seed, width, height) in an LRU and returned
+read-only. For each cached terrain the renderer keeps its normalization
+statistics and a few dimmed, watermarked base frames (dimming quantized to
+DIM_LEVELS steps); a frame is a copy of the base with only the overlay
+region (aircraft marker + threat disc) recomputed.
+
+No UI dependencies.
 """
 
-from typing import Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Tuple
 
 import numpy as np
 
@@ -18,28 +28,147 @@ from casper.models import Telemetry
 from casper.presets import AOConfig
 
 
+TERRAIN_CACHE_SIZE = 8
+IR_BASE_CACHE_SIZE = 4      # terrains with render state kept
+IR_FRAME_CACHE_SIZE = 8     # dimmed base frames kept per terrain
+DIM_LEVELS = 64
+
+DEFAULT_WATERMARK = "SYNTHETIC — NOT OPERATIONAL"
+
+
+# ============================================================
+# TERRAIN
+# ============================================================
+
+def generate_terrain(seed: int, width: int = 80, height: int = 80) -> np.ndarray:
+    """Build a terrain from a fresh RandomState(seed) (no caching)."""
+    rng = np.random.RandomState(seed)
+    base = rng.normal(0, 1, (height, width))
+
+    # Grid-like structure (line i of rows and columns, every 8 px)
+    lines = np.arange(0, width, 8)
+    base[lines[lines < height], :] += 1.5
+    base[:, lines] += 1.5
+
+    # Hills, added in draw order on their bounding boxes
+    for _ in range(5):
+        cx = rng.randint(10, width - 10)
+        cy = rng.randint(10, height - 10)
+        radius = rng.randint(5, 15)
+        y0, y1 = max(cy - radius, 0), min(cy + radius + 1, height)
+        x0, x1 = max(cx - radius, 0), min(cx + radius + 1, width)
+        yy, xx = np.ogrid[y0:y1, x0:x1]
+        mask = (xx - cx) ** 2 + (yy - cy) ** 2 <= radius ** 2
+        base[y0:y1, x0:x1][mask] += rng.uniform(0.5, 2.0)
+
+    return base
+
+
+@lru_cache(maxsize=TERRAIN_CACHE_SIZE)
+def cached_terrain(seed: int, width: int = 80, height: int = 80) -> np.ndarray:
+    """generate_terrain() memoized; the shared array is read-only."""
+    terrain = generate_terrain(seed, width, height)
+    terrain.flags.writeable = False
+    return terrain
+
+
+# ============================================================
+# IR RENDERING
+# ============================================================
+
+@lru_cache(maxsize=16)
+def watermark_mask(height: int, width: int, watermark: str) -> np.ndarray:
+    """Pixels stamped by `watermark` in the bottom-right corner (read-only)."""
+    mask = np.zeros((height, width), dtype=bool)
+    py = height - 4
+    for i in range(len(watermark)):
+        px = width - len(watermark) * 2 + i * 2
+        if 0 <= px < width:
+            mask[py:py + 2, px:px + 2] = True
+    mask.flags.writeable = False
+    return mask
+
+
+def dim_factor(fusion_conf: float) -> float:
+    """Epistemic dimming (lower confidence => darker), quantized to DIM_LEVELS."""
+    fusion_conf = min(max(float(fusion_conf), 0.0), 1.0)
+    return round((1.0 - 0.45 * (1.0 - fusion_conf)) * DIM_LEVELS) / DIM_LEVELS
+
+
+class IRBase:
+    """
+    Render state of one terrain: 5th/95th percentile normalization and
+    dimmed, watermarked base frames.
+    """
+
+    def __init__(self, terrain: np.ndarray):
+        self.terrain = terrain
+        self.height, self.width = terrain.shape
+        vmin, vmax = np.percentile(terrain, [5, 95])
+        self.vmin = float(vmin)
+        self.span = float(vmax - vmin) + 1e-9
+        self.levels = self.to_levels(terrain)
+        self._frames: "OrderedDict[Tuple[float, str], np.ndarray]" = OrderedDict()
+
+    def watermark_mask(self, watermark: str) -> np.ndarray:
+        return watermark_mask(self.height, self.width, watermark)
+
+    def to_levels(self, values: np.ndarray) -> np.ndarray:
+        """Terrain values -> undimmed gray levels in [0, 255] (float32)."""
+        return (np.clip((values - self.vmin) / self.span, 0, 1) * 255).astype(np.float32)
+
+    def shade(self, levels: np.ndarray, dim: float) -> np.ndarray:
+        return (levels * np.float32(dim)).astype(np.uint8)
+
+    def frame(self, dim: float, watermark: str) -> np.ndarray:
+        """Dimmed base RGB frame with watermark (shared, read-only)."""
+        key = (dim, watermark)
+        rgb = self._frames.get(key)
+        if rgb is not None:
+            self._frames.move_to_end(key)
+            return rgb
+
+        gray = self.shade(self.levels, dim)
+        gray[self.watermark_mask(watermark)] = 200
+        rgb = np.stack((gray,) * 3, axis=-1)
+        rgb.flags.writeable = False
+        self._frames[key] = rgb
+        if len(self._frames) > IR_FRAME_CACHE_SIZE:
+            self._frames.popitem(last=False)
+        return rgb
+
+
+_ir_bases: "OrderedDict[int, IRBase]" = OrderedDict()
+
+
+def ir_base(terrain: np.ndarray) -> IRBase:
+    """
+    Render state for `terrain`. Cached for read-only arrays (such as
+    cached_terrain() results); a writable array may change under us and
+    gets fresh state on every call.
+    """
+    if terrain.flags.writeable:
+        return IRBase(terrain)
+
+    key = id(terrain)
+    base = _ir_bases.get(key)
+    if base is not None and base.terrain is terrain:
+        _ir_bases.move_to_end(key)
+        return base
+
+    base = _ir_bases[key] = IRBase(terrain)
+    if len(_ir_bases) > IR_BASE_CACHE_SIZE:
+        _ir_bases.popitem(last=False)
+    return base
+
+
 class TerrainGenerator:
     def __init__(self, seed: int = 42):
-        self.rng = np.random.RandomState(seed)
+        self.seed = int(seed)
 
     def generate(self, width: int = 80, height: int = 80) -> np.ndarray:
-        base = self.rng.normal(0, 1, (height, width))
-
-        # Add grid-like structure
-        for i in range(0, width, 8):
-            base[i:i + 1, :] += 1.5
-            base[:, i:i + 1] += 1.5
-
-        # Add hills
-        for _ in range(5):
-            cx = self.rng.randint(10, width - 10)
-            cy = self.rng.randint(10, height - 10)
-            radius = self.rng.randint(5, 15)
-            yy, xx = np.ogrid[:height, :width]
-            mask = (xx - cx) ** 2 + (yy - cy) ** 2 <= radius ** 2
-            base[mask] += self.rng.uniform(0.5, 2.0)
-
-        return base
+        """The (cached, read-only) terrain for this seed and size."""
+        return cached_terrain(self.seed, int(width), int(height))
 
     def render_ir(
         self,
@@ -47,43 +176,50 @@ class TerrainGenerator:
         tel: Telemetry,
         ao: AOConfig,
         fusion_conf: float,
-        watermark: str = "SYNTHETIC — NOT OPERATIONAL",
+        watermark: str = DEFAULT_WATERMARK,
+    ) -> np.ndarray:
+        return self.render_ir_at(terrain, ao, tel.lat, tel.lon, tel.threat_index, fusion_conf, watermark)
+
+    def render_ir_at(
+        self,
+        terrain: np.ndarray,
+        ao: AOConfig,
+        lat: float,
+        lon: float,
+        threat_index: float,
+        fusion_conf: float,
+        watermark: str = DEFAULT_WATERMARK,
     ) -> np.ndarray:
-        img = terrain.copy()
-        height, width = img.shape
+        """render_ir() from plain values (no Telemetry object needed)."""
+        base = ir_base(terrain)
+        height, width = base.height, base.width
 
         # Lat/Lon -> pixel
-        x = int(width / 2 + (tel.lon - ao.base_lon) * 600)
-        y = int(height / 2 - (tel.lat - ao.base_lat) * 600)
-        x = int(np.clip(x, 2, width - 3))
-        y = int(np.clip(y, 2, height - 3))
+        x = int(width / 2 + (lon - ao.base_lon) * 600)
+        y = int(height / 2 - (lat - ao.base_lat) * 600)
+        x = min(max(x, 2), width - 3)
+        y = min(max(y, 2), height - 3)
+
+        dim = dim_factor(fusion_conf)
+
+        rgb = base.frame(dim, watermark).copy()
+
+        # Overlays, recomputed only inside the threat disc's bounding box
+        r = 6 + int(threat_index * 0.12)
+        y0, y1 = max(y - r, 0), min(y + r + 1, height)
+        x0, x1 = max(x - r, 0), min(x + r + 1, width)
+        img = np.array(terrain[y0:y1, x0:x1], dtype=float)
 
         # Aircraft position
-        img[y - 1:y + 2, x - 1:x + 2] += 4.0
+        img[y - 1 - y0:y + 2 - y0, x - 1 - x0:x + 2 - x0] += 4.0
 
         # Threat "heat"
-        r = 6 + int(tel.threat_index * 0.12)
-        yy, xx = np.ogrid[:height, :width]
+        yy, xx = np.ogrid[y0:y1, x0:x1]
         threat_mask = (xx - x) ** 2 + (yy - y) ** 2 <= r * r
-        img[threat_mask] += (tel.threat_index / 100.0) * 2.0
-
-        # Normalize
-        vmin, vmax = np.percentile(img, 5), np.percentile(img, 95)
-        img_norm = np.clip((img - vmin) / (vmax - vmin + 1e-9), 0, 1)
-
-        # Epistemic dimming (lower confidence => darker)
-        fusion_conf = float(np.clip(fusion_conf, 0.0, 1.0))
-        img_norm *= (1.0 - 0.45 * (1.0 - fusion_conf))
-
-        # RGB
-        rgb = np.stack([img_norm] * 3, axis=-1)
-        rgb = (rgb * 255).astype(np.uint8)
-
-        # Watermark
-        for i, _ in enumerate(watermark):
-            px = width - len(watermark) * 2 + i * 2
-            py = height - 4
-            if 0 <= px < width:
-                rgb[py:py + 2, px:px + 2] = 200
+        img[threat_mask] += (threat_index / 100.0) * 2.0
+
+        gray = base.shade(base.to_levels(img), dim)
+        gray[base.watermark_mask(watermark)[y0:y1, x0:x1]] = 200
+        rgb[y0:y1, x0:x1] = gray[..., None]
 
         return rgb
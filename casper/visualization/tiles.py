@@ -0,0 +1,377 @@
+"""
+casper.visualization.tiles
+==========================
+
+Tiled, multi-resolution terrain for wide-area IR views.
+
+TerrainPyramid covers a square around an AO with levels 0..max_level;
+level L is 2**L x 2**L tiles of tile_size px, so each level doubles the
+resolution of the one above it.
+
+- Terrain is a field over the pyramid's square (octaves of hashed value
+  noise plus a 1 px graticule), evaluated at each pixel centre. A tile
+  depends only on (seed, AO, level, tx, ty): tiles can be built in any
+  order, and a coarse level is the band-limited version of a fine one
+  (octaves shorter than 2 px at a level are left out).
+- Tiles are generated on first access, saved as .npy files under
+  `directory` and read back memory-mapped, so a view pages in only the
+  tiles it overlaps. Open tiles are kept in an LRU.
+- render_ir() maps lat/lon through the level's degrees-per-pixel (no
+  fixed scale), so the same code pans and zooms over any AO.
+
+Longitude and latitude share one degrees-per-pixel scale (plate carree).
+
+No UI dependencies.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from casper.models import Telemetry
+from casper.presets import AOConfig
+from casper.rng import stream_id
+from casper.visualization.terrain import DEFAULT_WATERMARK, dim_factor, watermark_mask
+
+
+TILE_SIZE = 256
+MAX_LEVEL = 6
+VIEW_SIZE = 256             # console IR view, px per side
+DEFAULT_TILE_DIR = os.path.join(tempfile.gettempdir(), "casper_terrain")
+OPEN_TILE_CACHE_SIZE = 64   # memory-mapped tiles kept open
+
+BASE_CELLS = 4              # lattice cells across the pyramid, octave 0
+PERSISTENCE = 0.55          # amplitude ratio between octaves
+GRID_LINES = 32             # graticule lines across the pyramid
+GRID_GAIN = 1.5
+MIN_HALF_EXTENT_DEG = 0.01
+
+_FORMAT_VERSION = 1
+
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+_S30, _S27, _S31, _S11 = np.uint64(30), np.uint64(27), np.uint64(31), np.uint64(11)
+
+
+# ============================================================
+# FIELD
+# ============================================================
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (uint64 arithmetic wraps)."""
+    x = (x ^ (x >> _S30)) * _M1
+    x = (x ^ (x >> _S27)) * _M2
+    return x ^ (x >> _S31)
+
+
+def _lattice(key: int, i0: int, i1: int, j0: int, j1: int) -> np.ndarray:
+    """Values in [-1, 1) at lattice points [j0, j1] x [i0, i1] (rows, cols)."""
+    jj = np.arange(j0, j1 + 1, dtype=np.int64).astype(np.uint64)
+    ii = np.arange(i0, i1 + 1, dtype=np.int64).astype(np.uint64)
+    h = _mix(_mix(np.uint64(key) ^ jj)[:, None] ^ ii[None, :])
+    return (h >> _S11).astype(np.float64) * (2.0 / (1 << 53)) - 1.0
+
+
+def _axis(coords: np.ndarray, cells: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Lattice cell index and smoothstep weight of each coordinate."""
+    scaled = coords * cells
+    cell = np.floor(scaled).astype(np.int64)
+    t = scaled - cell
+    return cell, t * t * (3.0 - 2.0 * t)
+
+
+def _value_noise(key: int, cells: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Smooth value noise on a (len(v), len(u)) grid of unit-square coordinates."""
+    ci, sx = _axis(u, cells)
+    cj, sy = _axis(v, cells)
+    i0, j0 = int(ci[0]), int(cj[0])
+    grid = _lattice(key, i0, int(ci[-1]) + 1, j0, int(cj[-1]) + 1)
+
+    # Separable interpolation: along x for every lattice row, then along y
+    ci -= i0
+    cj -= j0
+    rows = grid[:, ci] * (1.0 - sx) + grid[:, ci + 1] * sx
+    return rows[cj] * (1.0 - sy)[:, None] + rows[cj + 1] * sy[:, None]
+
+
+def _grid_lines(edges: np.ndarray) -> np.ndarray:
+    """1.0 for pixels (given by their GRID_LINES-scaled edges) crossed by a graticule line."""
+    lines = np.floor(edges)
+    return (lines[1:] != lines[:-1]).astype(np.float64)
+
+
+# ============================================================
+# PYRAMID
+# ============================================================
+
+class TerrainPyramid:
+    """
+    Lazily generated, disk-backed terrain tiles for one (seed, AO).
+
+    Several pyramids can share `directory`; each writes under a
+    subdirectory named after a fingerprint of its parameters.
+    """
+
+    def __init__(
+        self,
+        ao: AOConfig,
+        directory: str,
+        seed: int = 42,
+        tile_size: int = TILE_SIZE,
+        max_level: int = MAX_LEVEL,
+        margin: float = 0.5,
+        open_tiles: int = OPEN_TILE_CACHE_SIZE,
+    ):
+        if tile_size < 8 or max_level < 0:
+            raise ValueError("tile_size must be >= 8 and max_level >= 0")
+        self.ao = ao
+        self.seed = int(seed)
+        self.tile_size = int(tile_size)
+        self.max_level = int(max_level)
+        self.open_tiles = max(1, int(open_tiles))
+
+        half = max(ao.lat_delta, ao.lon_delta, MIN_HALF_EXTENT_DEG) * (1.0 + float(margin))
+        self.extent_deg = 2.0 * half
+        self.lat_top = ao.base_lat + half
+        self.lon_left = ao.base_lon - half
+
+        # Octave k has BASE_CELLS * 2**k cells across; the finest is >= 2 px at max_level.
+        self.octaves = 1
+        while BASE_CELLS << self.octaves <= self.size_px(self.max_level) // 2:
+            self.octaves += 1
+        names = np.array([stream_id(f"terrain/{k}") for k in range(self.octaves)], dtype=np.uint64)
+        self._keys = [int(key) for key in _mix(names ^ np.uint64(self.seed & ((1 << 64) - 1)))]
+
+        meta = {
+            "version": _FORMAT_VERSION,
+            "seed": self.seed,
+            "lat_top": self.lat_top,
+            "lon_left": self.lon_left,
+            "extent_deg": self.extent_deg,
+            "tile_size": self.tile_size,
+            "octaves": self.octaves,
+        }
+        digest = hashlib.blake2b(json.dumps(meta, sort_keys=True).encode(), digest_size=8).hexdigest()
+        self.directory = os.path.join(directory, digest)
+
+        self.vmin, self.span = self._normalization()
+        self._tiles: "OrderedDict[Tuple[int, int, int], np.ndarray]" = OrderedDict()
+        self.stats: Dict[str, int] = {"generated": 0, "paged_in": 0, "hits": 0}
+
+    # --------------------------------------------------
+    # Geometry
+    # --------------------------------------------------
+    def tiles_per_side(self, level: int) -> int:
+        return 1 << int(level)
+
+    def size_px(self, level: int) -> int:
+        return self.tile_size << int(level)
+
+    def deg_per_px(self, level: int) -> float:
+        return self.extent_deg / self.size_px(level)
+
+    def level_for(self, deg_per_px: float) -> int:
+        """Coarsest level at least as fine as `deg_per_px` (clamped to max_level)."""
+        level = 0
+        while level < self.max_level and self.deg_per_px(level) > deg_per_px:
+            level += 1
+        return level
+
+    def to_pixel(self, level: int, lat: float, lon: float) -> Tuple[float, float]:
+        """(x, y) in level pixels; pixel (i, j) covers [i, i + 1) x [j, j + 1)."""
+        scale = 1.0 / self.deg_per_px(level)
+        return (lon - self.lon_left) * scale, (self.lat_top - lat) * scale
+
+    def to_latlon(self, level: int, x: float, y: float) -> Tuple[float, float]:
+        dpp = self.deg_per_px(level)
+        return self.lat_top - y * dpp, self.lon_left + x * dpp
+
+    # --------------------------------------------------
+    # Generation
+    # --------------------------------------------------
+    def evaluate(self, level: int, x0: int, y0: int, width: int, height: int) -> np.ndarray:
+        """Terrain of level pixels [y0, y0 + height) x [x0, x0 + width) (float32, no caching)."""
+        size = float(self.size_px(level))
+        u = (np.arange(x0, x0 + width) + 0.5) / size
+        v = (np.arange(y0, y0 + height) + 0.5) / size
+
+        out = np.zeros((height, width))
+        amp = 1.0
+        for k in range(self.octaves):
+            cells = BASE_CELLS << k
+            if cells > size // 2:
+                break  # band limit: shorter than 2 px at this level
+            out += amp * _value_noise(self._keys[k], cells, u, v)
+            amp *= PERSISTENCE
+
+        scale = GRID_LINES / size
+        cols = _grid_lines(np.arange(x0, x0 + width + 1) * scale)
+        rows = _grid_lines(np.arange(y0, y0 + height + 1) * scale)
+        out += GRID_GAIN * cols[None, :]
+        out += GRID_GAIN * rows[:, None]
+        return out.astype(np.float32)
+
+    def _normalization(self) -> Tuple[float, float]:
+        # 5th/95th percentiles of a level-0 sample (in memory, not a tile)
+        sample = self.evaluate(0, 0, 0, self.tile_size, self.tile_size)
+        vmin, vmax = np.percentile(sample, [5, 95])
+        return float(vmin), float(vmax - vmin) + 1e-9
+
+    # --------------------------------------------------
+    # Tiles
+    # --------------------------------------------------
+    def tile_path(self, level: int, tx: int, ty: int) -> str:
+        return os.path.join(self.directory, str(level), f"{ty}_{tx}.npy")
+
+    def tile(self, level: int, tx: int, ty: int) -> np.ndarray:
+        """Tile (level, tx, ty) as a read-only memory-mapped array."""
+        n = self.tiles_per_side(level)
+        if not (0 <= level <= self.max_level and 0 <= tx < n and 0 <= ty < n):
+            raise IndexError(f"no tile ({level}, {tx}, {ty})")
+
+        key = (int(level), int(tx), int(ty))
+        arr = self._tiles.get(key)
+        if arr is not None:
+            self._tiles.move_to_end(key)
+            self.stats["hits"] += 1
+            return arr
+
+        path = self.tile_path(*key)
+        if not os.path.exists(path):
+            t = self.tile_size
+            data = self.evaluate(level, tx * t, ty * t, t, t)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Unique temp file per writer (sessions may share a process and
+            # a directory); the atomic replace means readers never see a
+            # partial tile, and concurrent writers produce identical data.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    np.save(fh, data)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+            self.stats["generated"] += 1
+
+        arr = self._tiles[key] = np.load(path, mmap_mode="r")
+        self.stats["paged_in"] += 1
+        if len(self._tiles) > self.open_tiles:
+            self._tiles.popitem(last=False)
+        return arr
+
+    def window(self, level: int, x0: int, y0: int, width: int, height: int) -> np.ndarray:
+        """
+        Level pixels [y0, y0 + height) x [x0, x0 + width), assembled from the
+        tiles they overlap; outside the pyramid is filled with vmin.
+        """
+        out = np.full((height, width), self.vmin, dtype=np.float32)
+        t = self.tile_size
+        n = self.tiles_per_side(level)
+        for ty in range(max(y0 // t, 0), min((y0 + height - 1) // t, n - 1) + 1):
+            for tx in range(max(x0 // t, 0), min((x0 + width - 1) // t, n - 1) + 1):
+                # Overlap in level pixels, then in tile and output coordinates
+                ya, yb = max(y0, ty * t), min(y0 + height, (ty + 1) * t)
+                xa, xb = max(x0, tx * t), min(x0 + width, (tx + 1) * t)
+                out[ya - y0:yb - y0, xa - x0:xb - x0] = self.tile(level, tx, ty)[
+                    ya - ty * t:yb - ty * t, xa - tx * t:xb - tx * t
+                ]
+        return out
+
+    def clear_open(self) -> None:
+        """Close every open tile (files stay on disk)."""
+        self._tiles.clear()
+
+    # --------------------------------------------------
+    # IR rendering
+    # --------------------------------------------------
+    def view_origin(self, level: int, lat: float, lon: float, width: int, height: int) -> Tuple[int, int]:
+        """Level pixel (x0, y0) of the top-left corner of a view centred on (lat, lon)."""
+        cx, cy = self.to_pixel(level, lat, lon)
+        return int(np.floor(cx)) - width // 2, int(np.floor(cy)) - height // 2
+
+    def tiles_for_views(
+        self,
+        level: int,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        width: int = VIEW_SIZE,
+        height: int = VIEW_SIZE,
+    ) -> List[Tuple[int, int]]:
+        """Distinct (tx, ty) overlapped by views centred on each (lat, lon)."""
+        t, n = self.tile_size, self.tiles_per_side(level)
+        scale = 1.0 / self.deg_per_px(level)
+        x0 = np.floor((np.asarray(lons, dtype=float) - self.lon_left) * scale).astype(np.int64) - width // 2
+        y0 = np.floor((self.lat_top - np.asarray(lats, dtype=float)) * scale).astype(np.int64) - height // 2
+        tiles = set()
+        for tx0, tx1, ty0, ty1 in zip(
+            (np.maximum(x0 // t, 0)).tolist(),
+            (np.minimum((x0 + width - 1) // t, n - 1)).tolist(),
+            (np.maximum(y0 // t, 0)).tolist(),
+            (np.minimum((y0 + height - 1) // t, n - 1)).tolist(),
+        ):
+            tiles.update((tx, ty) for tx in range(tx0, tx1 + 1) for ty in range(ty0, ty1 + 1))
+        return sorted(tiles)
+
+    def render_ir(
+        self,
+        tel: Telemetry,
+        fusion_conf: float,
+        level: int,
+        center: Optional[Tuple[float, float]] = None,
+        width: int = VIEW_SIZE,
+        height: int = VIEW_SIZE,
+        watermark: str = DEFAULT_WATERMARK,
+    ) -> np.ndarray:
+        """
+        IR view of `width` x `height` level pixels centred on `center`
+        (lat, lon), or on the aircraft when None.
+        """
+        gray = self.render_gray_at(
+            tel.lat, tel.lon, tel.threat_index, fusion_conf, level, center, width, height, watermark
+        )
+        return np.stack((gray,) * 3, axis=-1)
+
+    def render_gray_at(
+        self,
+        lat: float,
+        lon: float,
+        threat_index: float,
+        fusion_conf: float,
+        level: int,
+        center: Optional[Tuple[float, float]] = None,
+        width: int = VIEW_SIZE,
+        height: int = VIEW_SIZE,
+        watermark: str = DEFAULT_WATERMARK,
+    ) -> np.ndarray:
+        """render_ir() from plain values, as one gray channel (H, W) uint8."""
+        level = min(max(int(level), 0), self.max_level)
+        if center is None:
+            center = (lat, lon)
+        x0, y0 = self.view_origin(level, center[0], center[1], width, height)
+        img = self.window(level, x0, y0, width, height)
+
+        # Overlays in view pixels (sizes fixed on screen at every level)
+        ax, ay = self.to_pixel(level, lat, lon)
+        x = int(np.floor(ax)) - x0
+        y = int(np.floor(ay)) - y0
+        r = 6 + int(threat_index * 0.12)
+        ya, yb = max(y - r, 0), min(y + r + 1, height)
+        xa, xb = max(x - r, 0), min(x + r + 1, width)
+        if ya < yb and xa < xb:
+            img[max(y - 1, 0):max(y + 2, 0), max(x - 1, 0):max(x + 2, 0)] += 4.0
+            yy, xx = np.ogrid[ya:yb, xa:xb]
+            threat_mask = (xx - x) ** 2 + (yy - y) ** 2 <= r * r
+            img[ya:yb, xa:xb][threat_mask] += (threat_index / 100.0) * 2.0
+
+        levels = (img - np.float32(self.vmin)) * np.float32(255.0 / self.span)
+        levels = np.minimum(np.maximum(levels, 0), 255)
+        gray = (levels * np.float32(dim_factor(fusion_conf))).astype(np.uint8)
+        gray[watermark_mask(height, width, watermark)] = 200
+        return gray
@@ -0,0 +1,62 @@
+"""
+A crash can tear the final line of an audit log; the log must stay usable.
+"""
+
+from casper.audit.log import AuditLogWriter, CHECKPOINT_FILE, iter_log, segment_paths
+from casper.audit.verify import verify_log
+from casper.config import FusionConfig
+from casper.presets import AO_PRESETS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+def _run(directory, ticks, state=None, engine=None, **writer_kwargs):
+    if state is None:
+        state = EngineState(config=FusionConfig())
+        state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+        engine = StepEngine(state.config)
+    state.audit_log = AuditLogWriter(str(directory), fsync="never", **writer_kwargs)
+    for _ in range(ticks):
+        engine.step(state)
+    return state, engine
+
+
+def test_torn_segment_line_is_reported_and_truncated(tmp_path):
+    state, engine = _run(tmp_path, 10, checkpoint_block=4)
+    state.audit_log.flush()  # crash: no close()
+    segment = segment_paths(str(tmp_path))[-1]
+    with open(segment, "ab") as f:
+        f.write(b'{"tick": 11, "utc": "2026-')
+
+    report = verify_log(str(tmp_path), max_workers=1)
+    assert not report.ok
+    assert report.records == 10
+    assert report.unchecked_records == 2 + 1  # uncheckpointed tail + torn line
+    assert any("torn final line" in e for e in report.errors)
+
+    # Reopen: the torn line is cut off and the chain continues.
+    state.audit_log = None
+    writer = AuditLogWriter(str(tmp_path), fsync="never", checkpoint_block=4)
+    assert writer.head == state.audit_head and writer.last_tick == 10
+    state.audit_log = writer
+    for _ in range(5):
+        engine.step(state)
+    writer.close()
+
+    report = verify_log(str(tmp_path), max_workers=1)
+    assert report.ok, report.errors
+    assert [r.tick for r in iter_log(str(tmp_path))] == list(range(1, 16))
+
+
+def test_torn_checkpoint_line(tmp_path):
+    state, _ = _run(tmp_path, 8, checkpoint_block=4)
+    state.audit_log.flush()
+    with open(tmp_path / CHECKPOINT_FILE, "a") as f:
+        f.write('{"block": 2, "segm')
+
+    report = verify_log(str(tmp_path), max_workers=1)
+    assert report.blocks == 2 and report.records == 8
+    assert any(CHECKPOINT_FILE in e for e in report.errors)
+
+    AuditLogWriter(str(tmp_path), fsync="never", checkpoint_block=4).close()
+    assert verify_log(str(tmp_path), max_workers=1).ok
@@ -0,0 +1,59 @@
+"""
+Debrief frames must equal what the console renders for the same tick.
+"""
+
+import numpy as np
+import pytest
+
+from casper.config import FusionConfig
+from casper.presets import AO_PRESETS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+from casper.visualization import batch
+from casper.visualization.batch import FrameArchive, FramePoses, render_run
+from casper.visualization.terrain import TerrainGenerator
+from casper.visualization.tiles import TerrainPyramid
+
+
+AO = AO_PRESETS["Black Sea (synthetic)"]
+
+
+@pytest.fixture(scope="module")
+def history():
+    state = EngineState(config=FusionConfig())
+    state.ao = AO
+    engine = StepEngine(state.config)
+    for _ in range(40):
+        engine.step(state)
+    return state.history
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_pyramid_frames_match_console(tmp_path, history, workers):
+    tiles = str(tmp_path / "tiles")
+    summary = render_run(
+        FramePoses.from_history(history), str(tmp_path / "frames"), AO,
+        level=3, tile_dir=tiles, chunk=16, max_workers=workers,
+    )
+    assert summary["frames"] == len(history)
+    assert batch._WORKER == {}
+
+    pyramid = TerrainPyramid(AO, tiles)
+    with FrameArchive(str(tmp_path / "frames")) as archive:
+        for i in (0, 17, len(history) - 1):
+            tel = history[i]
+            assert archive.ticks[i] == tel.tick
+            assert np.array_equal(archive.frame(i), pyramid.render_ir(tel, tel.fusion_conf, level=3))
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_fixed_frames_match_render_ir(tmp_path, history, workers):
+    summary = render_run(FramePoses.from_history(history), str(tmp_path), AO, view="fixed", chunk=16, max_workers=workers)
+    assert summary["tiles"] == 0
+    assert batch._WORKER == {}
+    generator = TerrainGenerator()
+    terrain = generator.generate()
+    with FrameArchive(str(tmp_path)) as archive:
+        for i in (0, 20, len(history) - 1):
+            tel = history[i]
+            assert np.array_equal(archive.frame(i), generator.render_ir(terrain, tel, AO, tel.fusion_conf))
@@ -0,0 +1,39 @@
+"""
+A checkpoint taken mid-run must resume onto the same audit chain.
+"""
+
+from casper.archive.checkpoint import load_checkpoint, save_checkpoint
+from casper.config import FusionConfig
+from casper.pipeline import PipelinedStepEngine
+from casper.presets import AO_PRESETS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+def _state(config: FusionConfig) -> EngineState:
+    state = EngineState(config=config)
+    state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+    state.rng_seed = 5
+    return state
+
+
+def test_pipelined_checkpoint_resumes_the_same_chain(tmp_path):
+    config = FusionConfig()
+    ref = _state(config)
+    engine = StepEngine(config)
+    for _ in range(30):
+        engine.step(ref)
+
+    state = _state(config)
+    path = str(tmp_path / "checkpoint.npz")
+    with PipelinedStepEngine(config, queue_size=32) as pipelined:
+        for _ in range(20):
+            pipelined.step(state)
+        save_checkpoint(state, pipelined, path)  # records may still be queued
+
+    resumed, resumed_engine = load_checkpoint(path)
+    assert resumed.audit_head == resumed.audit_chain[-1].sha256
+    assert resumed.audit_chain[-1].tick == 20
+    for _ in range(10):
+        resumed_engine.step(resumed)
+    assert resumed.audit_head == ref.audit_head
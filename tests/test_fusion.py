@@ -0,0 +1,57 @@
+"""
+Fusion confidence must fall when the sensors degrade, for every strategy.
+"""
+
+import numpy as np
+import pytest
+
+from casper.config import FusionConfig
+from casper.fusion.engine import FusionEngine
+from casper.presets import AO_PRESETS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+def _mean_conf(strategy: str, env_name: str, ao_name: str, ticks: int = 150) -> float:
+    state = EngineState(config=FusionConfig())
+    state.ao = AO_PRESETS[ao_name]
+    state.env_name = env_name
+    state.fusion_strategy_name = strategy
+    state.rng_seed = 3
+    engine = StepEngine(state.config)
+    for _ in range(ticks):
+        engine.step(state)
+    return float(np.mean([rec.fusion_conf for rec in state.history]))
+
+
+@pytest.mark.parametrize("ao_name", ["Kharkiv (synthetic)", "Black Sea (synthetic)"])
+@pytest.mark.parametrize("strategy", ["weighted", "kalman"])
+def test_confidence_drops_when_gnss_degrades(strategy, ao_name):
+    clear = _mean_conf(strategy, "Clear Skies / Clean Link", ao_name)
+    degraded = _mean_conf(strategy, "GNSS Degraded / Spoof Risk", ao_name)
+    assert degraded < clear - 0.15
+
+
+def test_switching_back_to_kalman_starts_a_fresh_filter():
+    fusion = FusionEngine(FusionConfig(), "kalman")
+    kalman = fusion.strategy
+    kalman.x, kalman.P = np.ones(6), np.eye(6)
+    fusion.set_strategy("weighted")
+    fusion.set_strategy("kalman")
+    assert kalman.x is None
+
+
+def test_area_change_mid_run_resets_the_filter():
+    state = EngineState(config=FusionConfig())
+    state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+    state.fusion_strategy_name = "kalman"
+    engine = StepEngine(state.config)
+    for _ in range(20):
+        engine.step(state)
+
+    state.ao = AO_PRESETS["Test Range (synthetic)"]
+    engine.step(state)
+    fused = state.fused
+    # A filter carried over from Kharkiv would see a huge innovation.
+    assert fused.surprise < 1.0
+    assert abs(fused.lat - state.ao.base_lat) <= state.ao.lat_delta + 0.01
@@ -0,0 +1,112 @@
+"""
+PipelinedStepEngine worker failures must not half-apply a tick.
+"""
+
+import pytest
+
+from casper.archive.memmap import RunArchiveWriter
+from casper.config import FusionConfig
+from casper.instrumentation import Instrumentation, Sink
+from casper.pipeline import PipelinedStepEngine
+from casper.presets import AO_PRESETS
+from casper.replay import JournalRecorder
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+def _state(config: FusionConfig) -> EngineState:
+    state = EngineState(config=config)
+    state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+    state.rng_seed = 9
+    return state
+
+
+def test_hashes_match_step_engine():
+    config = FusionConfig()
+    ref = _state(config)
+    engine = StepEngine(config)
+    for _ in range(20):
+        engine.step(ref)
+
+    state = _state(config)
+    with PipelinedStepEngine(config) as pipelined:
+        for _ in range(20):
+            pipelined.step(state)
+        pipelined.flush()
+    assert [a.sha256 for a in state.audit_chain] == [a.sha256 for a in ref.audit_chain]
+
+
+def test_worker_error_is_sticky_and_leaves_state_untouched():
+    calls = []
+
+    def exporter(record):
+        calls.append(record.tick)
+        if record.tick == 5:
+            raise OSError("disk full")
+
+    config = FusionConfig()
+    state = _state(config)
+    engine = PipelinedStepEngine(config, exporters=[exporter], queue_size=1)
+    for _ in range(5):
+        engine.step(state)
+    with pytest.raises(RuntimeError):
+        engine.flush()
+
+    tick, rows = state.tick, len(state.meas_history)
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            engine.step(state)
+    assert (state.tick, len(state.meas_history)) == (tick, rows)
+    with pytest.raises(RuntimeError):
+        engine.close()
+
+
+def test_journal_recorder_records_pipelined_hashes():
+    config = FusionConfig()
+    ref = _state(config)
+    ref_recorder = JournalRecorder(ref)
+    engine = StepEngine(config)
+    for _ in range(10):
+        ref_recorder.step(engine, ref)
+
+    state = _state(config)
+    recorder = JournalRecorder(state)
+    with PipelinedStepEngine(config) as pipelined:
+        for _ in range(10):
+            recorder.step(pipelined, state)
+    assert [t.sha256 for t in recorder.journal.ticks] == [t.sha256 for t in ref_recorder.journal.ticks]
+
+
+def test_archive_writer_refuses_a_lagging_chain(tmp_path):
+    config = FusionConfig()
+    state = _state(config)
+    engine = StepEngine(config)
+    engine.step(state)
+    state.audit_chain.pop()  # as if the audit worker had not caught up
+    with RunArchiveWriter(str(tmp_path)) as writer:
+        with pytest.raises(RuntimeError, match="flush"):
+            writer.write_tick(state)
+
+
+def test_audit_bytes_are_counted_by_the_audit_worker():
+    class Samples(Sink):
+        def __init__(self):
+            self.total = 0
+
+        def record(self, sample):
+            self.total += sample.counters.get("audit_bytes_hashed", 0)
+
+    config = FusionConfig()
+    ref_sink, sink = Samples(), Samples()
+    ref = _state(config)
+    engine = StepEngine(config, Instrumentation([ref_sink]))
+    for _ in range(20):
+        engine.step(ref)
+
+    state = _state(config)
+    with PipelinedStepEngine(config, Instrumentation([sink])) as pipelined:
+        for _ in range(20):
+            pipelined.step(state)
+        pipelined.flush()
+        assert pipelined.audit_bytes_hashed == ref_sink.total
+        assert 0 < sink.total <= ref_sink.total
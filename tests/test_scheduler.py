@@ -0,0 +1,58 @@
+"""
+TickScheduler threads must stop on request, whenever stop() arrives.
+"""
+
+import gc
+import weakref
+
+from casper.config import FusionConfig
+from casper.presets import AO_PRESETS
+from casper.scheduler import TickScheduler
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+def _scheduler() -> TickScheduler:
+    config = FusionConfig()
+    state = EngineState(config=config)
+    state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+    return TickScheduler(StepEngine(config), state, speed=4)
+
+
+def test_stop_while_paused_ends_thread():
+    scheduler = _scheduler()
+    scheduler.pause()
+    thread = scheduler.run_in_thread()
+    scheduler.stop()
+    scheduler.join(timeout=5.0)
+    assert not thread.is_alive()
+
+
+def test_stop_before_loop_starts_is_not_lost():
+    for _ in range(20):
+        scheduler = _scheduler()
+        scheduler.pause()
+        thread = scheduler.run_in_thread()
+        scheduler.stop()  # usually lands before run() has its loop
+        scheduler.join(timeout=5.0)
+        assert not thread.is_alive()
+
+
+def test_finalizer_on_session_handle_stops_thread():
+    # The pattern app.py uses: only the session refers to the handle.
+    class Handle:
+        pass
+
+    def _stop(scheduler):
+        scheduler.stop()
+        scheduler.join(timeout=5.0)
+
+    scheduler = _scheduler()
+    scheduler.pause()
+    thread = scheduler.run_in_thread()
+    session = {"handle": Handle()}
+    weakref.finalize(session["handle"], _stop, scheduler)
+
+    session.clear()
+    gc.collect()
+    assert not thread.is_alive()
@@ -0,0 +1,30 @@
+"""
+EngineState.reset() starts a new run, including a fresh audit chain.
+"""
+
+from casper.audit.chain import GENESIS_SHA256
+from casper.audit.log import AuditLogWriter, iter_log
+from casper.config import FusionConfig
+from casper.presets import AO_PRESETS
+from casper.state import EngineState
+from casper.step_engine import StepEngine
+
+
+def test_reset_detaches_audit_log(tmp_path):
+    config = FusionConfig()
+    state = EngineState(config=config)
+    state.ao = AO_PRESETS["Kharkiv (synthetic)"]
+    state.audit_log = AuditLogWriter(str(tmp_path / "run1"), fsync="never")
+    engine = StepEngine(config)
+    for _ in range(3):
+        engine.step(state)
+
+    state.reset()
+    assert state.audit_log is None
+    assert state.audit_head == GENESIS_SHA256
+    assert len(list(iter_log(str(tmp_path / "run1")))) == 3
+
+    state.audit_log = AuditLogWriter(str(tmp_path / "run2"), fsync="never")
+    engine.step(state)
+    state.audit_log.close()
+    assert [r.tick for r in iter_log(str(tmp_path / "run2"))] == [1]
@@ -0,0 +1,42 @@
+"""
+TerrainPyramid tiles are deterministic and safe to build concurrently.
+"""
+
+import threading
+
+import numpy as np
+
+from casper.presets import AO_PRESETS
+from casper.visualization.tiles import TerrainPyramid
+
+
+AO = AO_PRESETS["Black Sea (synthetic)"]
+
+
+def test_tiles_match_direct_evaluation(tmp_path):
+    pyramid = TerrainPyramid(AO, str(tmp_path), tile_size=64, max_level=3)
+    window = pyramid.window(3, 50, 70, 100, 90)
+    assert np.array_equal(window, pyramid.evaluate(3, 50, 70, 100, 90))
+
+
+def test_sessions_sharing_a_directory(tmp_path):
+    pyramids = [TerrainPyramid(AO, str(tmp_path), tile_size=64, max_level=3) for _ in range(8)]
+    errors = []
+
+    def build(pyramid):
+        try:
+            for tx in range(4):
+                pyramid.tile(2, tx, 1)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=build, args=(p,)) for p in pyramids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    expected = pyramids[0].evaluate(2, 0, 64, 256, 64)
+    assert np.array_equal(pyramids[-1].window(2, 0, 64, 256, 64), expected)
+    assert not list((tmp_path / pyramids[0].directory.split("/")[-1] / "2").glob("*.tmp"))